@@ -0,0 +1,333 @@
+"""
+규칙 기반 과제 공지 파서 (LLM 앞단 fast path).
+
+마감일(절대/상대 날짜 + 시각), 제목, 글머리표 요구사항을 정규식으로 뽑고 항목별 신뢰도를 매긴다.
+전체 신뢰도(항목 중 최저값)가 RULE_PARSE_MIN_CONFIDENCE 이상이면 Gemini를 부르지 않고 그대로 저장,
+애매하면 LLM으로 넘긴다. 정확도/LLM 호출 감소율: benchmarks/eval_announcement_rules.py
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 패턴 하나의 기본 신뢰도(M/D 0.8)보다 높게: 요일 표시 등 추가 근거가 있어야 fast path
+RULE_PARSE_MIN_CONFIDENCE = float(os.getenv("RULE_PARSE_MIN_CONFIDENCE", "0.85"))
+# 공지 시각(ts)을 해석할 시간대. 저장되는 deadline은 이 시간대의 naive datetime
+RULE_PARSE_TIMEZONE = ZoneInfo(os.getenv("RULE_PARSE_TIMEZONE", "Asia/Seoul"))
+
+# 시각이 없으면 그날 끝까지
+_DEFAULT_TIME = time(23, 59)
+
+_WEEKDAYS_KO = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+_WEEKDAYS_EN = {
+    "mon": 0, "monday": 0, "tue": 1, "tues": 1, "tuesday": 1, "wed": 2, "wednesday": 2,
+    "thu": 3, "thur": 3, "thurs": 3, "thursday": 3, "fri": 4, "friday": 4,
+    "sat": 5, "saturday": 5, "sun": 6, "sunday": 6,
+}
+_MONTHS_EN = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH_EN = r"(?<![A-Za-z])(?P<mon>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+_WEEKDAY_EN = r"(?P<wd>mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)"
+# 날짜 뒤의 요일 표시: (금), (Fri), 금요일
+_WEEKDAY_MARK = r"(?:\s*\(?\s*(?P<mark>[월화수목금토일])(?:요일)?\s*\)?|\s*\(\s*(?P<mark_en>[A-Za-z]{3,9})\s*\))?"
+
+# 마감을 가리키는 표현: 날짜 바로 뒤(까지, 마감) 또는 앞(due, deadline, 마감:)
+_CUE_AFTER = re.compile(r"^\s*(?:[\d:시분\s오전후밤자정정오()월화수목금토일요]{0,20})?(?:까지|마감|내|이내|전까지)")
+_CUE_BEFORE = re.compile(
+    r"(?:마감|기한|due|deadline|until|by|~)(?:일|은|는|일은)?\s*[:：]?\s*(?:(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*,?\s*)?$",
+    re.IGNORECASE,
+)
+
+# (정규식, 종류, 기본 신뢰도)
+_DATE_PATTERNS = [
+    (re.compile(r"(?P<y>\d{4})\s*[-./]\s*(?P<m>\d{1,2})\s*[-./]\s*(?P<d>\d{1,2})\.?" + _WEEKDAY_MARK), "ymd", 0.9),
+    (re.compile(r"(?:(?P<y>\d{4})\s*년\s*)?(?P<m>\d{1,2})\s*월\s*(?P<d>\d{1,2})\s*일" + _WEEKDAY_MARK), "ymd", 0.9),
+    (re.compile(r"(?<![\d/])(?P<m>\d{1,2})\s*/\s*(?P<d>\d{1,2})(?![\d/])" + _WEEKDAY_MARK), "md_slash", 0.8),
+    (re.compile(r"(?<![\d.])(?P<m>\d{1,2})\.(?P<d>\d{1,2})\.?(?![\d.])" + _WEEKDAY_MARK), "md_slash", 0.6),
+    (re.compile(_MONTH_EN + r"\s+(?P<d>\d{1,2})(?!\d)(?:st|nd|rd|th)?(?:,?\s*(?P<y>\d{4}))?", re.IGNORECASE), "ymd", 0.9),
+    (re.compile(r"(?P<d>\d{1,2})(?:st|nd|rd|th)?\s+" + _MONTH_EN + r"(?:,?\s*(?P<y>\d{4}))?", re.IGNORECASE), "ymd", 0.9),
+    (re.compile(r"(?P<rel>오늘|금일|내일|명일|모레|tomorrow|today|tonight)", re.IGNORECASE), "relative_day", 0.85),
+    (re.compile(r"(?P<week>이번\s*주|금주|다음\s*주|차주|다다음\s*주)\s*(?P<wdk>[월화수목금토일])요일"), "week_weekday", 0.85),
+    (re.compile(r"(?P<week>this|next)\s+" + _WEEKDAY_EN, re.IGNORECASE), "week_weekday", 0.85),
+    (re.compile(r"(?P<n>\d{1,2}|일|한|두|세)\s*(?P<unit>일|주일?|주)\s*(?:후|뒤|이내|안에|내)"), "offset", 0.8),
+    (re.compile(r"(?<![이음차])(?<!다음\s)(?<!이번\s)(?P<wdk>[월화수목금토일])요일\s*(?:까지|마감)"), "weekday", 0.8),
+]
+
+_TIME_PATTERNS = [
+    re.compile(r"(?P<h>\d{1,2}):(?P<mi>\d{2})\s*(?P<ampm>am|pm|a\.m\.|p\.m\.)?", re.IGNORECASE),
+    re.compile(r"(?P<ko>오전|오후|밤|저녁|새벽|아침|낮)?\s*(?P<h>\d{1,2})\s*시(?:\s*(?P<mi>\d{1,2})\s*분|\s*(?P<half>반))?"),
+    re.compile(r"(?P<h>\d{1,2})\s*(?P<ampm>am|pm)", re.IGNORECASE),
+    re.compile(r"(?P<word>자정|midnight|정오|noon)", re.IGNORECASE),
+]
+
+# 날짜와 시각 사이에 올 수 있는 것
+_TIME_GAP_AFTER = re.compile(r"^[\s,]*(?:at|@|에)?\s*$", re.IGNORECASE)
+_TIME_GAP_BEFORE = re.compile(r"^[\s,]*(?:on)?\s*$", re.IGNORECASE)
+
+# "3.18 마감"이 번호 목록으로 잡히지 않도록 번호 뒤에는 공백 필수
+_BULLET = re.compile(r"^\s*(?:(?:[-•*·▶▷►✔✓✅☐□◦‣⁃➤→]|\(\d{1,2}\)|[①-⑳])\s*|\d{1,2}[.)]\s+)(?P<item>\S.*)$")
+_TITLE_PREFIX = re.compile(r"^[\s\W_]*?(?:\[(?:공지|안내|notice|과제|알림)\]|<(?:공지|안내)>|\((?:공지|안내)\)|(?:공지|notice)\s*[:：)])\s*", re.IGNORECASE)
+_TITLE_STRIP = re.compile(r"^[\s\W_]+|[\s*_~]+$")
+_TITLE_KEYWORDS = re.compile(r"과제|assignment|homework|hw\s*\d|프로젝트|project|보고서|report|실습|lab|퀴즈|quiz|레포트|발표", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"[.!?。](?:\s|$)")
+_DEADLINE_WORDS = re.compile(r"마감|기한|까지|due|deadline", re.IGNORECASE)
+
+
+@dataclass
+class DeadlineCandidate:
+    value: datetime
+    confidence: float
+    cued: bool
+    start: int
+    end: int
+
+
+@dataclass
+class RuleParse:
+    title: str | None
+    deadline: datetime | None
+    requirements: list[str]
+    content: str
+    title_confidence: float
+    deadline_confidence: float
+    requirements_confidence: float
+    candidates: list[DeadlineCandidate] = field(default_factory=list)
+
+    @property
+    def confidence(self) -> float:
+        return min(self.title_confidence, self.deadline_confidence, self.requirements_confidence)
+
+    def as_parsed(self) -> dict:
+        """llm.parse_announcement와 같은 형태 (save_announcement에 그대로 전달)"""
+        return {
+            "title": self.title,
+            "content": self.content,
+            "deadline": self.deadline.isoformat(timespec="minutes") if self.deadline else None,
+            "topic": None,
+            "requirements": self.requirements,
+        }
+
+
+def posted_at_from_ts(ts: str | float) -> datetime:
+    """Slack ts → RULE_PARSE_TIMEZONE 기준 naive datetime"""
+    return datetime.fromtimestamp(float(ts), RULE_PARSE_TIMEZONE).replace(tzinfo=None)
+
+
+def _infer_year(month: int, day: int, posted: date) -> date | None:
+    """연도가 없는 날짜: 공지 시점보다 한참 전이면 내년으로 (12월 공지의 1월 마감)"""
+    try:
+        candidate = date(posted.year, month, day)
+    except ValueError:
+        return None
+    if candidate < posted - timedelta(days=60):
+        try:
+            candidate = date(posted.year + 1, month, day)
+        except ValueError:
+            return None
+    return candidate
+
+
+def _next_weekday(start: date, weekday: int) -> date:
+    return start + timedelta(days=(weekday - start.weekday()) % 7)
+
+
+def _resolve_date(match: re.Match, kind: str, posted: datetime) -> date | None:
+    groups = match.groupdict()
+    today = posted.date()
+    if kind in ("ymd", "md_slash"):
+        month = int(groups["m"]) if groups.get("m") else _MONTHS_EN[groups["mon"].lower()[:3]]
+        day = int(groups["d"])
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            return None
+        if groups.get("y"):
+            try:
+                return date(int(groups["y"]), month, day)
+            except ValueError:
+                return None
+        return _infer_year(month, day, today)
+    if kind == "relative_day":
+        rel = groups["rel"].lower()
+        offset = {"오늘": 0, "금일": 0, "today": 0, "tonight": 0, "내일": 1, "명일": 1, "tomorrow": 1, "모레": 2}[rel]
+        return today + timedelta(days=offset)
+    if kind == "week_weekday":
+        week = re.sub(r"\s", "", groups["week"].lower())
+        weekday = _WEEKDAYS_KO[groups["wdk"]] if groups.get("wdk") else _WEEKDAYS_EN[groups["wd"].lower()]
+        monday = today - timedelta(days=today.weekday())
+        weeks = {"이번주": 0, "금주": 0, "this": 0, "다음주": 1, "차주": 1, "next": 1, "다다음주": 2}[week]
+        resolved = monday + timedelta(weeks=weeks, days=weekday)
+        # "this Friday"를 금요일 이후에 쓴 경우 등 → 지난 날짜면 애매
+        return resolved if resolved >= today else None
+    if kind == "offset":
+        n = {"일": 1, "한": 1, "두": 2, "세": 3}.get(groups["n"]) or int(groups["n"])
+        days = n * 7 if groups["unit"].startswith("주") else n
+        return today + timedelta(days=days)
+    if kind == "weekday":
+        return _next_weekday(today, _WEEKDAYS_KO[groups["wdk"]])
+    return None
+
+
+def _parse_time(match: re.Match) -> time | None:
+    groups = match.groupdict()
+    if groups.get("word"):
+        return _DEFAULT_TIME if groups["word"].lower() in ("자정", "midnight") else time(12, 0)
+
+    hour = int(groups["h"])
+    minute = 30 if groups.get("half") else int(groups.get("mi") or 0)
+    ampm = (groups.get("ampm") or "").lower().replace(".", "")
+    ko = groups.get("ko")
+    if ampm == "pm" or ko in ("오후", "밤", "저녁") or (ko == "낮" and hour < 6):
+        if hour < 12:
+            hour += 12
+    elif (ampm == "am" or ko in ("오전", "새벽", "아침")) and hour == 12:
+        hour = 0
+    if hour == 24 and minute == 0:
+        # 24:00 → 그날 끝
+        return _DEFAULT_TIME
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None
+    return time(hour, minute)
+
+
+def _find_time(text: str, start: int, end: int) -> tuple[time | None, int]:
+    """
+    날짜에 붙은 시각. (시각, 날짜+시각 끝 위치)
+    "3/15 23:59", "March 16, 11:59 PM", "5pm tomorrow"처럼 사이에 공백/쉼표/at 정도만 있을 때만
+    (뒤에 오는 다른 날짜의 시각을 가져오지 않도록)
+    """
+    after = text[end:end + 25]
+    for pattern in _TIME_PATTERNS:
+        match = pattern.search(after)
+        if match and _TIME_GAP_AFTER.match(after[:match.start()]):
+            at = _parse_time(match)
+            if at is not None:
+                return at, end + match.end()
+
+    before = text[max(0, start - 15):start]
+    for pattern in _TIME_PATTERNS:
+        for match in pattern.finditer(before):
+            if _TIME_GAP_BEFORE.match(before[match.end():]):
+                at = _parse_time(match)
+                if at is not None:
+                    return at, end
+    return None, end
+
+
+def _weekday_mark(match: re.Match) -> int | None:
+    groups = match.groupdict()
+    if groups.get("mark"):
+        return _WEEKDAYS_KO[groups["mark"]]
+    if groups.get("mark_en"):
+        return _WEEKDAYS_EN.get(groups["mark_en"].lower())
+    return None
+
+
+def extract_deadlines(text: str, posted: datetime) -> list[DeadlineCandidate]:
+    candidates: list[DeadlineCandidate] = []
+    taken: list[tuple[int, int]] = []
+    for pattern, kind, base in _DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            # 앞의 패턴(더 구체적인 형식)이 이미 잡은 구간은 건너뜀
+            if any(match.start() < e and s < match.end() for s, e in taken):
+                continue
+            resolved = _resolve_date(match, kind, posted)
+            if resolved is None:
+                continue
+            taken.append((match.start(), match.end()))
+
+            confidence = base
+            mark = _weekday_mark(match)
+            if mark is not None:
+                # 요일 표시가 맞으면 날짜 해석이 확실, 틀리면 오타 가능성 → LLM
+                confidence = min(1.0, confidence + 0.1) if mark == resolved.weekday() else 0.3
+
+            at, end = _find_time(text, match.start(), match.end())
+            value = datetime.combine(resolved, at or _DEFAULT_TIME)
+
+            # "3일 후", "금요일까지"는 패턴 자체가 마감 표현
+            cued = kind in ("offset", "weekday") or bool(
+                _CUE_AFTER.match(text[end:end + 30]) or _CUE_BEFORE.search(text[max(0, match.start() - 20):match.start()])
+            )
+            if kind == "weekday" and resolved == posted.date():
+                # 금요일에 올린 "금요일까지" → 오늘인지 다음 주인지 모름
+                confidence = min(confidence, 0.5)
+            if not cued:
+                confidence -= 0.15
+            if value < posted - timedelta(hours=1):
+                # 이미 지난 마감 → 다른 날짜(공지일, 수업일)를 잘못 골랐을 수 있음
+                confidence = min(confidence, 0.4)
+            candidates.append(DeadlineCandidate(value, round(confidence, 2), cued, match.start(), end))
+    return sorted(candidates, key=lambda c: c.start)
+
+
+def _pick_deadline(candidates: list[DeadlineCandidate]) -> tuple[datetime | None, float]:
+    if not candidates:
+        return None, 0.0
+    cued = [c for c in candidates if c.cued]
+    pool = cued or candidates
+    if len({c.value for c in candidates}) > 1:
+        # 날짜가 여러 개(연장/변경 "3/15 → 3/22", 1차/2차 마감, 날짜 범위, 수업일 언급 등)
+        # → 마감 표현 유무와 관계없이 어느 쪽이 마감인지 규칙으로는 알 수 없음 → LLM
+        latest = max(pool, key=lambda c: c.value)
+        return latest.value, min(0.5, latest.confidence)
+    best = max(pool, key=lambda c: c.confidence)
+    return best.value, best.confidence
+
+
+def extract_title(text: str) -> tuple[str | None, float]:
+    for line in text.splitlines():
+        line = _TITLE_PREFIX.sub("", line.strip())
+        line = _TITLE_STRIP.sub("", line)
+        if not line:
+            continue
+        if _BULLET.match(line):
+            return None, 0.3
+        confidence = 0.9 if _TITLE_KEYWORDS.search(line) else 0.6
+        if len(line) > 60:
+            # 한 줄짜리 긴 공지 → 제목은 LLM이 요약
+            return line[:60], 0.4
+        return line, confidence
+    return None, 0.0
+
+
+def extract_requirements(text: str) -> tuple[list[str], float]:
+    lines = [line for line in text.splitlines() if line.strip()]
+    items = []
+    for line in lines[1:]:
+        match = _BULLET.match(line)
+        if not match:
+            continue
+        item = match.group("item").strip()
+        # "마감: 3/15 23:59" 같은 항목은 요구사항이 아님
+        if _DEADLINE_WORDS.search(item) and any(p.search(item) for p, _, _ in _DATE_PATTERNS):
+            continue
+        items.append(item)
+    if items:
+        return items, 0.9
+    # 글머리표 없이 한두 줄짜리 안내문이면 요구사항 없음, 여러 문장이면 문장 속에 있을 수 있음 → LLM
+    body = " ".join(lines[1:])
+    if len(lines) <= 3 and len(body) < 120 and len(_SENTENCE_END.findall(body)) <= 1:
+        return [], 0.85
+    return [], 0.4
+
+
+def extract(text: str, posted: datetime) -> RuleParse:
+    title, title_confidence = extract_title(text)
+    candidates = extract_deadlines(text, posted)
+    deadline, deadline_confidence = _pick_deadline(candidates)
+    requirements, requirements_confidence = extract_requirements(text)
+    return RuleParse(
+        title=title,
+        deadline=deadline,
+        requirements=requirements,
+        content=text,
+        title_confidence=title_confidence,
+        deadline_confidence=deadline_confidence,
+        requirements_confidence=requirements_confidence,
+        candidates=candidates,
+    )
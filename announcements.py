@@ -0,0 +1,114 @@
+"""
+교수님 공지 → 과제 저장 (실시간 webhook / backfill 공용).
+키워드 분류 → 규칙 파서 → (신뢰도가 낮으면) LLM → 마감일 기본값 → processor.save_announcement
+- handle_announcement: 실시간, 한 건씩 parse_announcement
+- handle_announcements: 백필, 규칙으로 안 잡힌 공지를 parse_announcements_batch 한 번으로
+"""
+from datetime import datetime, timedelta
+import llm
+import announcement_rules
+from keywords import classify
+from processor import save_announcement
+from metrics import stage_seconds, events_total, announcement_parse_total
+from log import get_logger
+
+log = get_logger("announcements")
+
+# 공지에 마감일이 없으면 게시일 + 7일
+DEFAULT_DEADLINE_DAYS = 7
+
+
+def is_assignment(event: dict) -> bool:
+    """키워드 분류. 과제 공지가 아니면 결과를 기록하고 False"""
+    with stage_seconds.time(stage="keyword"):
+        match = classify(event.get("text"), event.get("channel"))
+    if match.route == "borderline":
+        # 애매한 메시지는 LLM 비용을 쓰지 않고 기록만 (키워드 가중치 조정용)
+        events_total.inc(outcome="borderline")
+        log.info("borderline keyword score", ts=event.get("ts"), score=match.score, keywords=match.keywords)
+        return False
+    if match.route != "assignment":
+        events_total.inc(outcome="skipped_no_keyword")
+        log.debug("skipped: no assignment keyword", ts=event.get("ts"))
+        return False
+    return True
+
+
+def _rule_parse(event: dict) -> tuple[dict | None, float]:
+    """마감일·제목·요구사항이 규칙으로 확실히 잡히면 (parsed, 신뢰도), 아니면 (None, 신뢰도)"""
+    with stage_seconds.time(stage="rule_parse"):
+        rule = announcement_rules.extract(event.get("text"), announcement_rules.posted_at_from_ts(event.get("ts")))
+    if rule.confidence >= announcement_rules.RULE_PARSE_MIN_CONFIDENCE:
+        return rule.as_parsed(), rule.confidence
+    return None, rule.confidence
+
+
+async def _save(event: dict, parsed: dict, method: str, confidence: float):
+    announcement_parse_total.inc(method=method)
+    if not parsed.get('deadline'):
+        base_date = datetime.fromtimestamp(float(event.get("ts")))
+        parsed['deadline'] = (base_date + timedelta(days=DEFAULT_DEADLINE_DAYS)).strftime('%Y-%m-%d')
+
+    log.info(
+        "announcement parsed", ts=event.get("ts"), method=method, confidence=round(confidence, 2),
+        title=parsed.get('title'), deadline=parsed.get('deadline'), requirements=len(parsed.get('requirements') or []),
+    )
+    with stage_seconds.time(stage="save"):
+        await save_announcement(event, parsed)
+    events_total.inc(outcome="parsed")
+
+
+async def handle_announcement(event: dict):
+    """교수님 루트 메시지 한 건 (실시간 경로)"""
+    if not is_assignment(event):
+        return
+    try:
+        parsed, confidence = _rule_parse(event)
+        method = "rules"
+        if parsed is None:
+            with stage_seconds.time(stage="llm_parse"):
+                parsed = await llm.parse_announcement(event.get("text"))
+            method = "llm"
+        await _save(event, parsed, method, confidence)
+    except Exception as e:
+        events_total.inc(outcome="failed")
+        log.error("announcement failed", ts=event.get("ts"), error=str(e))
+
+
+async def handle_announcements(events: list[dict]):
+    """교수님 루트 메시지 여러 건 (백필). 규칙으로 안 잡힌 공지는 LLM 배치 호출 한 번으로 파싱"""
+    ready: list[tuple[dict, dict, str, float]] = []
+    pending: list[tuple[dict, float]] = []
+    for event in events:
+        if not is_assignment(event):
+            continue
+        try:
+            parsed, confidence = _rule_parse(event)
+        except Exception as e:
+            events_total.inc(outcome="failed")
+            log.error("announcement failed", ts=event.get("ts"), error=str(e))
+            continue
+        if parsed is None:
+            pending.append((event, confidence))
+        else:
+            ready.append((event, parsed, "rules", confidence))
+
+    if pending:
+        with stage_seconds.time(stage="llm_parse"):
+            parsed_by_ts = await llm.parse_announcements_batch(
+                [{"ts": event["ts"], "text": event["text"]} for event, _ in pending]
+            )
+        for event, confidence in pending:
+            parsed = parsed_by_ts.get(event["ts"])
+            if parsed is None:
+                # 배치 + 개별 재시도 모두 실패 (llm 쪽에서 로그를 남김)
+                events_total.inc(outcome="failed")
+                continue
+            ready.append((event, parsed, "llm", confidence))
+
+    for event, parsed, method, confidence in ready:
+        try:
+            await _save(event, parsed, method, confidence)
+        except Exception as e:
+            events_total.inc(outcome="failed")
+            log.error("announcement failed", ts=event.get("ts"), error=str(e))
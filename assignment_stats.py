@@ -0,0 +1,74 @@
+"""
+과제별 제출 통계 (assignment_stats, migrations/0008).
+
+평소에는 submission/student/assignment 트리거가 증감분만 반영하므로 조회는 PK 한 번.
+트리거가 없던 시절의 데이터나 직접 수정한 데이터 때문에 어긋나면 처음부터 다시 계산:
+
+    python assignment_stats.py --check                    # 어긋난 과제만 출력 (변경 없음)
+    python assignment_stats.py --rebuild                  # 전체 재계산
+    python assignment_stats.py --rebuild --assignment ID  # 과제 하나
+"""
+import uuid
+import asyncio
+import argparse
+from sqlalchemy import text
+from db import engine
+from log import get_logger
+
+log = get_logger("assignment_stats")
+
+_COUNTS = ("roster_size", "submitted", "late", "verified", "met")
+_SELECT_STATS_SQL = text(f"SELECT assignment_id, {', '.join(_COUNTS)} FROM assignment_stats")
+_REFRESH_SQL = text("SELECT assignment_stats_refresh(CAST(:ids AS uuid[]))")
+
+
+async def rebuild(assignment_ids: list[uuid.UUID] | None = None) -> int:
+    """통계 재계산, 갱신한 과제 수 반환"""
+    async with engine.begin() as conn:
+        # 재계산 중 들어온 제출이 트리거로 더해진 뒤 옛 집계로 덮어써지지 않도록 쓰기를 잠시 막음
+        await conn.execute(text("LOCK TABLE assignment, submission, student IN SHARE MODE"))
+        refreshed = await conn.scalar(_REFRESH_SQL, {"ids": assignment_ids})
+    log.info("assignment stats rebuilt", assignments=refreshed)
+    return refreshed
+
+
+async def check() -> dict[uuid.UUID, dict]:
+    """저장된 통계와 재계산 결과가 다른 과제 {assignment_id: {컬럼: (저장값, 실제값)}}. 재계산은 롤백"""
+    async with engine.connect() as conn:
+        async with conn.begin() as transaction:
+            stored = {row.assignment_id: row for row in await conn.execute(_SELECT_STATS_SQL)}
+            await conn.execute(_REFRESH_SQL, {"ids": None})
+            actual = {row.assignment_id: row for row in await conn.execute(_SELECT_STATS_SQL)}
+            await transaction.rollback()
+
+    drift = {}
+    for assignment_id, row in actual.items():
+        old = stored.get(assignment_id)
+        diff = {
+            column: (getattr(old, column) if old else None, getattr(row, column))
+            for column in _COUNTS
+            if old is None or getattr(old, column) != getattr(row, column)
+        }
+        if diff:
+            drift[assignment_id] = diff
+    return drift
+
+
+async def main(args):
+    if args.rebuild:
+        await rebuild(args.assignment)
+    else:
+        drift = await check()
+        for assignment_id, diff in drift.items():
+            print(assignment_id, " ".join(f"{column}={old}->{new}" for column, (old, new) in diff.items()))
+        log.info("assignment stats checked", drifted=len(drift))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="과제별 제출 통계 점검/재계산")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--check", action="store_true", help="어긋난 과제만 출력")
+    mode.add_argument("--rebuild", action="store_true", help="처음부터 다시 계산")
+    parser.add_argument("--assignment", type=uuid.UUID, action="append", help="재계산할 과제 (여러 번 지정 가능, 없으면 전체)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,272 @@
+"""
+채널 히스토리 백필 / 저장된 이벤트 재처리.
+
+서비스가 내려가 있던 동안의 메시지나 학기 중에 추가된 채널은 실시간 이벤트로 들어오지 않으므로
+conversations.history / conversations.replies를 cursor 페이지 단위로 읽어 실시간과 같은 경로로 넣는다.
+- 교수님 루트 메시지 → announcements.handle_announcements (키워드 → 규칙 파싱 → 나머지는 페이지당 LLM 배치 호출 → 저장)
+- 과제 공지 스레드의 학생 댓글 → ingest.store_events로 BACKFILL_BATCH_SIZE개씩 저장 → processor 데몬이 처리
+- 히스토리 한 페이지(+그 페이지 스레드 댓글)를 마칠 때마다 cursor를 kv_store(postgres)에 저장 → 중단 후 이어서 실행
+- Slack 호출은 slack_api 클라이언트의 메서드별 한도를 따름 (SLACK_RATE_LIMITS로 조정)
+
+replay는 이미 저장된 slack_events를 id 순서로 REPLAY_BATCH_SIZE개씩 processor로 다시 처리 (초당 --rate건).
+공지가 늦게 등록돼 건너뛰어진 제출을 다시 넣을 때 사용.
+
+    python backfill.py history [--channel C123 ...] [--oldest 2026-03-01] [--latest 2026-03-31] [--restart]
+    python backfill.py replay [--since 2026-03-01] [--until 2026-04-01] [--channel C123] [--rate 100] [--restart]
+"""
+import os
+import time
+import asyncio
+import argparse
+from datetime import datetime
+from typing import AsyncIterator
+from dotenv import load_dotenv
+from sqlalchemy import select
+from db import get_read_session, get_session, dispose
+from models import Assignment, Class
+from identity import get_professor_id
+from ingest import store_events
+from kvstore import create_store
+from partitions import ensure_partitions
+from slack_api import slack, SlackApiError
+from announcements import handle_announcements
+import processor
+from log import get_logger
+
+load_dotenv()
+
+# 동시에 댓글을 읽을 과제 스레드 수
+BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", "4"))
+# conversations.history / replies 한 페이지 크기 (Slack 권장 200 이하)
+BACKFILL_PAGE_SIZE = int(os.getenv("BACKFILL_PAGE_SIZE", "200"))
+# store_events 한 번에 넣을 댓글 수
+BACKFILL_BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", "200"))
+REPLAY_BATCH_SIZE = int(os.getenv("REPLAY_BATCH_SIZE", "200"))
+# replay 초당 처리 이벤트 수 (processor 데몬/DB에 부담을 주지 않도록)
+REPLAY_RATE = float(os.getenv("REPLAY_RATE", "100"))
+
+# 실시간 이벤트로도 처리되는 일반 메시지만 (입장/퇴장, 수정/삭제 알림 등은 제외)
+_MESSAGE_SUBTYPES = {None, "file_share", "thread_broadcast"}
+
+log = get_logger("backfill")
+
+# 체크포인트는 프로세스가 끝나도 남아야 하므로 항상 postgres
+checkpoints = create_store("postgres")
+
+
+class _EventBuffer:
+    """댓글 이벤트를 모아서 BACKFILL_BATCH_SIZE개씩 저장"""
+
+    def __init__(self, batch_size: int = BACKFILL_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.stored = 0
+        self._bodies: list[dict] = []
+
+    async def add(self, body: dict):
+        self._bodies.append(body)
+        if len(self._bodies) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        # 저장 중에 다른 태스크가 add해도 섞이지 않도록 목록을 먼저 떼어냄
+        bodies, self._bodies = self._bodies, []
+        if bodies:
+            await store_events(bodies)
+            self.stored += len(bodies)
+
+
+def _to_slack_ts(value: str | None) -> str | None:
+    """YYYY-MM-DD 또는 epoch 초 → Slack oldest/latest 파라미터"""
+    if not value:
+        return None
+    try:
+        return str(float(value))
+    except ValueError:
+        return str(datetime.fromisoformat(value).timestamp())
+
+
+def _event_body(channel_id: str, message: dict) -> dict:
+    """히스토리 메시지 → 실시간 event_callback과 같은 모양. event_id는 재실행해도 같게"""
+    event = {**message, "type": "message", "channel": channel_id}
+    if event.get("thread_ts") == event.get("ts"):
+        # 스레드 부모: 실시간 이벤트로 왔을 때는 thread_ts가 없음 (있으면 댓글로 취급됨)
+        event.pop("thread_ts")
+    return {
+        "type": "event_callback",
+        "event_id": f"backfill-{channel_id}-{message['ts']}",
+        "event_time": int(float(message["ts"])),
+        "event": event,
+    }
+
+
+async def _pages(method: str, key: str, cursor: str | None = None, **params) -> AsyncIterator[tuple[list[dict], str | None]]:
+    """cursor 페이지를 하나씩 (목록, 다음 cursor)로. 전체를 모으지 않음"""
+    while True:
+        page_params = {**params, "limit": BACKFILL_PAGE_SIZE}
+        if cursor:
+            page_params["cursor"] = cursor
+        data = await slack.get(method, **page_params)
+        cursor = data.get("response_metadata", {}).get("next_cursor") or None
+        yield data.get(key, []), cursor
+        if not cursor:
+            return
+
+
+async def _assignment_post_ts(ts_list: list[str]) -> set[str]:
+    """ts 중 과제 공지로 저장된 것"""
+    if not ts_list:
+        return set()
+    async with get_session() as session:
+        return set((await session.scalars(
+            select(Assignment.slack_post_ts).where(Assignment.slack_post_ts.in_(ts_list))
+        )).all())
+
+
+async def _backfill_thread(channel_id: str, thread_ts: str, buffer: _EventBuffer):
+    async for replies, _ in _pages("conversations.replies", "messages", channel=channel_id, ts=thread_ts):
+        for reply in replies:
+            if reply["ts"] == thread_ts or reply.get("subtype") not in _MESSAGE_SUBTYPES or not reply.get("user"):
+                continue
+            # 실시간 경로와 같이 교수님 댓글은 제출이 아님
+            if await get_professor_id(reply["user"]) is not None:
+                continue
+            await buffer.add(_event_body(channel_id, reply))
+
+
+async def _backfill_page(channel_id: str, messages: list[dict], buffer: _EventBuffer) -> int:
+    """히스토리 한 페이지: 교수님 공지 파싱/저장 → 과제 공지 스레드의 댓글 저장. 과제 스레드 수 반환"""
+    semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+    roots = [
+        m for m in messages
+        if m.get("subtype") in _MESSAGE_SUBTYPES and m.get("thread_ts", m["ts"]) == m["ts"]
+    ]
+
+    # 이미 저장된 공지는 다시 파싱하지 않음 (재실행 시 LLM 호출 방지)
+    saved = await _assignment_post_ts([m["ts"] for m in roots])
+    events = []
+    for message in roots:
+        if message["ts"] in saved or not message.get("text") or not message.get("user"):
+            continue
+        if await get_professor_id(message["user"]) is not None:
+            events.append(_event_body(channel_id, message)["event"])
+    # 공지가 먼저 저장돼야 processor가 댓글의 과제를 찾음. 규칙으로 안 잡힌 공지는 페이지당 LLM 배치 호출로
+    await handle_announcements(events)
+
+    assignment_ts = await _assignment_post_ts([m["ts"] for m in roots if m.get("reply_count")])
+
+    async def process_thread(thread_ts: str):
+        async with semaphore:
+            await _backfill_thread(channel_id, thread_ts, buffer)
+
+    await asyncio.gather(*[process_thread(ts) for ts in assignment_ts])
+    return len(assignment_ts)
+
+
+async def backfill_channel(channel_id: str, oldest: str | None = None, latest: str | None = None, restart: bool = False) -> dict:
+    key = f"backfill:history:{channel_id}:{oldest or ''}:{latest or ''}"
+    checkpoint = None if restart else await checkpoints.get(key)
+    if checkpoint and checkpoint.get("done"):
+        log.info("channel already backfilled", channel=channel_id)
+        return checkpoint
+    checkpoint = checkpoint or {"cursor": None, "messages": 0, "threads": 0, "replies": 0, "done": False}
+
+    params = {"channel": channel_id}
+    if oldest:
+        params["oldest"] = oldest
+    if latest:
+        params["latest"] = latest
+
+    buffer = _EventBuffer()
+    try:
+        async for messages, cursor in _pages("conversations.history", "messages", checkpoint["cursor"], **params):
+            checkpoint["threads"] += await _backfill_page(channel_id, messages, buffer)
+            await buffer.flush()
+            checkpoint.update(
+                cursor=cursor, done=cursor is None,
+                messages=checkpoint["messages"] + len(messages), replies=checkpoint["replies"] + buffer.stored,
+            )
+            buffer.stored = 0
+            await checkpoints.set(key, checkpoint)
+            log.info("backfill page done", channel=channel_id, **checkpoint)
+    except SlackApiError as e:
+        if e.error != "invalid_cursor":
+            raise
+        # 오래된 cursor는 만료됨 → 처음부터 (이미 넣은 메시지는 중복 저장되지 않음)
+        log.warning("checkpoint cursor expired, restarting channel", channel=channel_id)
+        return await backfill_channel(channel_id, oldest, latest, restart=True)
+    return checkpoint
+
+
+async def backfill_history(channel_ids: list[str] | None, oldest: str | None, latest: str | None, restart: bool):
+    # 가장 오래된 월 파티션보다 이전 메시지가 default 파티션에 쌓이지 않도록 미리 생성
+    if oldest:
+        await ensure_partitions(from_month=datetime.utcfromtimestamp(float(_to_slack_ts(oldest))).date())
+    if not channel_ids:
+        async with get_read_session() as session:
+            channel_ids = (await session.scalars(
+                select(Class.slack_channel_id).where(Class.slack_channel_id.is_not(None))
+            )).all()
+    for channel_id in channel_ids:
+        result = await backfill_channel(channel_id, _to_slack_ts(oldest), _to_slack_ts(latest), restart)
+        log.info("channel backfilled", channel=channel_id, **result)
+    # --oldest 없이 전체 히스토리를 받았으면 default 파티션에 들어간 이벤트를 월 파티션으로
+    await ensure_partitions()
+
+
+async def replay(since: str | None, until: str | None, channel_id: str | None,
+                 rate: float = REPLAY_RATE, batch_size: int = REPLAY_BATCH_SIZE, restart: bool = False) -> int:
+    """저장된 이벤트를 초당 rate건 이하로 다시 처리. 처리한 이벤트 수 반환"""
+    min_time = int(float(_to_slack_ts(since) or 0))
+    max_time = int(float(_to_slack_ts(until) or time.time() + 86400))
+    # --until을 생략하면 max_time이 실행마다 달라지므로 키는 입력값으로
+    key = f"backfill:replay:{channel_id or ''}:{since or ''}:{until or ''}"
+    after_id = 0 if restart else (await checkpoints.get(key) or 0)
+
+    total = 0
+    started = time.monotonic()
+    while True:
+        last_id, done, deferred = await processor.replay_batch(after_id, min_time, max_time, channel_id, batch_size)
+        if last_id is None:
+            break
+        after_id = last_id
+        total += done
+        await checkpoints.set(key, after_id)
+        log.info("replay batch done", after_id=after_id, done=done, deferred=deferred, total=total)
+        # 누적 처리량이 rate를 넘지 않도록 대기
+        await asyncio.sleep(max(0.0, started + total / rate - time.monotonic()))
+    await checkpoints.delete(key)
+    return total
+
+
+async def main(args):
+    await slack.start()
+    try:
+        if args.command == "history":
+            await backfill_history(args.channel, args.oldest, args.latest, args.restart)
+        else:
+            total = await replay(args.since, args.until, args.channel, args.rate, args.batch_size, args.restart)
+            log.info("replay finished", events=total)
+    finally:
+        await slack.close()
+        await dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채널 히스토리 백필 / 저장된 이벤트 재처리")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    history = commands.add_parser("history", help="conversations.history/replies로 놓친 메시지 수집")
+    history.add_argument("--channel", action="append", help="채널 ID (여러 번 지정 가능, 없으면 등록된 수업 채널 전체)")
+    history.add_argument("--oldest", help="이 시각 이후 메시지만 (YYYY-MM-DD 또는 epoch 초)")
+    history.add_argument("--latest", help="이 시각 이전 메시지만")
+    history.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+
+    replay_parser = commands.add_parser("replay", help="저장된 slack_events를 processor로 다시 처리")
+    replay_parser.add_argument("--since", help="event_time 하한 (YYYY-MM-DD 또는 epoch 초)")
+    replay_parser.add_argument("--until", help="event_time 상한")
+    replay_parser.add_argument("--channel")
+    replay_parser.add_argument("--rate", type=float, default=REPLAY_RATE, help="초당 처리 이벤트 수")
+    replay_parser.add_argument("--batch-size", type=int, default=REPLAY_BATCH_SIZE)
+    replay_parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,235 @@
+"""
+조회용 인덱스 마이그레이션 벤치마크.
+
+별도 스키마(bench_indexes)에 인덱스 없는 예전 형태의 테이블을 만들고 대량 합성 데이터를 넣은 뒤,
+processor / save_announcement의 핫 쿼리를 마이그레이션 전후로 EXPLAIN + 지연시간 측정한다.
+마이그레이션 후에는 각 쿼리가 기대한 인덱스를 쓰는지 assert.
+
+    DATABASE_URL=... python benchmarks/bench_indexes.py [--assignments 20000] [--events 1000000]
+
+--keep: 끝나고 스키마를 지우지 않음
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import engine  # noqa: E402
+from migrate import apply_migrations, load_migrations  # noqa: E402
+
+SCHEMA = "bench_indexes"
+# 0005부터는 slack_events가 파티션 테이블로 바뀜 → 인덱스 효과만 보려고 0004까지만 적용
+LAST_MIGRATION = "0004"
+
+# migrations 적용 전 운영 DB와 같은 형태 (인덱스/FK 없음, verification_result.submission_id가 uuid)
+LEGACY_DDL = """
+CREATE TABLE student (
+    student_id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name varchar(50), slack_user_id varchar(50) UNIQUE
+);
+CREATE TABLE assignment (
+    assignment_id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    class_id uuid, professor_id uuid, title varchar(200), deadline timestamp,
+    slack_post_ts varchar(100), created_at timestamp
+);
+CREATE TABLE assignment_requirement (
+    requirement_id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    assignment_id uuid REFERENCES assignment, content varchar(500)
+);
+CREATE TABLE submission (
+    submission_id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    student_id uuid REFERENCES student, assignment_id uuid REFERENCES assignment,
+    content_text text, status varchar(20), slack_thread_ts varchar(100)
+);
+CREATE TABLE verification_result (
+    verification_result_id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    requirement_id bigint NOT NULL, submission_id uuid NOT NULL,
+    is_met boolean, verified_at timestamp, feedback text
+);
+CREATE TABLE slack_events (
+    id bigserial PRIMARY KEY, event_id text UNIQUE, user_id text, text text,
+    ts text, thread_ts text, event_time bigint, processed boolean NOT NULL DEFAULT false
+);
+"""
+
+# (SQL, 인자) 순서대로 실행
+SEED_STEPS = [
+    (
+        """
+        INSERT INTO student (name, slack_user_id)
+        SELECT 'student' || i, 'U' || lpad(i::text, 8, '0') FROM generate_series(1, $1) i
+        """,
+        lambda a: [a.students],
+    ),
+    (
+        """
+        INSERT INTO assignment (title, deadline, slack_post_ts, created_at)
+        SELECT 'assignment ' || i, now() + interval '7 days', (1700000000 + i)::text || '.000100', now()
+        FROM generate_series(1, $1) i
+        """,
+        lambda a: [a.assignments],
+    ),
+    (
+        # (과제, 학생) 쌍이 겹치지 않게 k → (k % 과제 수, k / 과제 수)
+        """
+        INSERT INTO submission (student_id, assignment_id, content_text, status)
+        SELECT s.student_id, a.assignment_id, 'submission', 'COMPLETED'
+        FROM generate_series(0, $3 - 1) k
+        JOIN (SELECT assignment_id, row_number() OVER (ORDER BY slack_post_ts) - 1 AS n FROM assignment) a
+            ON a.n = k % $2
+        JOIN (SELECT student_id, row_number() OVER (ORDER BY slack_user_id) - 1 AS n FROM student) s
+            ON s.n = (k / $2) % $1
+        """,
+        lambda a: [a.students, a.assignments, a.submissions],
+    ),
+    (
+        # 99%는 이미 처리된 이벤트, 최근 1%만 미처리. 80%는 스레드 댓글
+        """
+        INSERT INTO slack_events (event_id, user_id, text, ts, thread_ts, event_time, processed)
+        SELECT 'Ev' || i, 'U' || lpad((i % $1)::text, 8, '0'), 'message ' || i,
+               (1700000000 + i)::text || '.000200',
+               CASE WHEN i % 5 = 0 THEN NULL ELSE (1700000000 + i % $2)::text || '.000100' END,
+               1700000000 + i,
+               i <= $3 * 0.99
+        FROM generate_series(1, $3) i
+        """,
+        lambda a: [a.students, a.assignments, a.events],
+    ),
+]
+
+# (이름, SQL, 인자 생성(args, 제출 (student_id, assignment_id) 샘플), 기대 인덱스)
+QUERIES = [
+    (
+        "assignment by slack_post_ts",
+        "SELECT assignment_id FROM assignment WHERE slack_post_ts = $1",
+        lambda a, pairs: [f"{1700000000 + random.randint(1, a.assignments)}.000100"],
+        "ux_assignment_slack_post_ts",
+    ),
+    (
+        "submission exists",
+        "SELECT 1 FROM submission WHERE student_id = $1 AND assignment_id = $2",
+        lambda a, pairs: list(random.choice(pairs)),
+        "ux_submission_student_assignment",
+    ),
+    (
+        "submissions by assignment",
+        "SELECT count(*) FROM submission WHERE assignment_id = $1",
+        lambda a, pairs: [random.choice(pairs)[1]],
+        "ix_submission_assignment_id",
+    ),
+    (
+        "processor claim",
+        "SELECT id FROM slack_events WHERE processed = FALSE ORDER BY event_time ASC LIMIT 200",
+        lambda a, pairs: [],
+        "ix_slack_events_unprocessed",
+    ),
+    (
+        "pending announcements",
+        "SELECT DISTINCT ts FROM slack_events WHERE ts = ANY($1::text[]) AND thread_ts IS NULL AND processed = FALSE",
+        lambda a, pairs: [[f"{1700000000 + random.randint(1, a.events)}.000200" for _ in range(50)]],
+        "ix_slack_events_unprocessed_roots",
+    ),
+]
+
+
+def _index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+
+async def run_queries(conn, args, id_pairs: list, lookups: int, label: str) -> dict:
+    results = {}
+    print(f"\n[{label}]")
+    for name, sql, make_args, expected in QUERIES:
+        explained = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *make_args(args, id_pairs))
+        # db.py에서 json 코덱을 등록한 커넥션이면 이미 디코딩돼 있음
+        plan = (json.loads(explained) if isinstance(explained, str) else explained)[0]["Plan"]
+        used = _index_names(plan)
+
+        timings = []
+        for _ in range(lookups):
+            params = make_args(args, id_pairs)
+            started = time.perf_counter()
+            await conn.fetch(sql, *params)
+            timings.append(time.perf_counter() - started)
+
+        results[name] = (expected in used, _percentile(timings, 0.99))
+        print(f"  {name:<28} p50={_percentile(timings, 0.5):8.2f}ms  p99={_percentile(timings, 0.99):8.2f}ms  "
+              f"plan={plan['Node Type']}{' ' + ','.join(sorted(used)) if used else ''}")
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--assignments", type=int, default=20000)
+    parser.add_argument("--submissions", type=int, default=500000)
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--baseline-lookups", type=int, default=50, help="인덱스 없을 때 측정 횟수 (느림)")
+    parser.add_argument("--max-p99-ms", type=float, default=20.0, help="마이그레이션 후 p99 상한")
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    async with engine.connect() as sa_conn:
+        raw = await sa_conn.get_raw_connection()
+        conn = raw.driver_connection
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+        await conn.execute(f"SET search_path TO {SCHEMA}")
+        try:
+            await conn.execute(LEGACY_DDL)
+            started = time.perf_counter()
+            await conn.execute("SET synchronous_commit TO off")
+            for sql, make_params in SEED_STEPS:
+                await conn.execute(sql, *make_params(args))
+            await conn.execute("ANALYZE")
+            print(f"seeded {args.students} students / {args.assignments} assignments / "
+                  f"{args.submissions} submissions / {args.events} slack_events in {time.perf_counter() - started:.1f}s")
+
+            id_pairs = [
+                (r["student_id"], r["assignment_id"])
+                for r in await conn.fetch("SELECT student_id, assignment_id FROM submission TABLESAMPLE SYSTEM (1) LIMIT 5000")
+            ]
+
+            before = await run_queries(conn, args, id_pairs, args.baseline_lookups, "before migrations")
+
+            started = time.perf_counter()
+            applied = await apply_migrations(conn, [m for m in load_migrations() if m.version <= LAST_MIGRATION])
+            await conn.execute("ANALYZE")
+            print(f"\napplied migrations {applied} in {time.perf_counter() - started:.1f}s")
+
+            after = await run_queries(conn, args, id_pairs, args.lookups, "after migrations")
+
+            print()
+            failures = []
+            for name, (uses_index, p99) in after.items():
+                speedup = before[name][1] / p99 if p99 else float("inf")
+                print(f"  {name:<28} p99 {before[name][1]:8.2f}ms → {p99:6.2f}ms  ({speedup:,.0f}x)")
+                if not uses_index:
+                    failures.append(f"{name}: expected index not used")
+                if p99 > args.max_p99_ms:
+                    failures.append(f"{name}: p99 {p99:.2f}ms > {args.max_p99_ms}ms")
+            assert not failures, "\n".join(failures)
+            print("\nall hot lookups use their index")
+        finally:
+            if not args.keep:
+                await conn.execute("RESET search_path")
+                await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+키워드 분류기 마이크로 벤치마크.
+
+기존 방식(lower() + any(kw in text))과 keywords.KeywordMatcher를
+한국어/영어 혼합 슬랙 메시지 코퍼스에서 비교한다.
+
+    python benchmarks/bench_keywords.py [--messages 20000] [--extra-keywords 0 200 1000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keywords import DEFAULT_KEYWORDS, KeywordMatcher  # noqa: E402
+
+ANNOUNCEMENTS = [
+    "📢 {week}주차 과제 안내\n- 주제: {topic}\n- 제출: 스레드에 댓글로 PDF 첨부\n- 마감: {month}/{day}(금) 23:59까지",
+    "[{topic}] 팀 프로젝트 중간 보고서 제출 안내입니다. 마감은 {month}월 {day}일 자정입니다.",
+    "Homework #{week}: implement {topic}. Submit your notebook in this thread. Deadline: 2026-{month:02d}-{day:02d}",
+    "다음 주 금요일까지 {topic} 발표 자료 준비해 주세요. 발표 순서는 추후 공지합니다.",
+    "Assignment {week} is out! Please submit a short report on {topic} by {month}/{day}.",
+]
+
+CHATTER = [
+    "오늘 수업 자료 올려드렸습니다. 복습 꼭 하세요 🙂",
+    "점심 먹고 2시에 다시 모일게요",
+    "질문 있으면 스레드에 남겨주세요!",
+    "Thanks everyone, great session today.",
+    "줌 링크는 채널 상단에 고정해 두었습니다.",
+    "{topic} 관련 참고 링크 공유합니다: https://example.com/{week}",
+    "내일은 휴강입니다. 다음 시간에 {topic} 이어서 진행할게요.",
+    "Can someone share the slides from week {week}?",
+]
+
+TOPICS = ["머신러닝", "데이터 분석", "CNN", "transformer", "SQL 튜닝", "Spring Boot", "React", "클라우드 배포"]
+
+
+def make_corpus(n: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        # 실제 채널처럼 잡담이 공지보다 훨씬 많음 (약 1:4)
+        template = rng.choice(ANNOUNCEMENTS) if rng.random() < 0.2 else rng.choice(CHATTER)
+        corpus.append(template.format(
+            week=rng.randint(1, 16), topic=rng.choice(TOPICS),
+            month=rng.randint(1, 12), day=rng.randint(1, 28),
+        ))
+    return corpus
+
+
+def make_keywords(extra: int, seed: int = 7) -> dict[str, float]:
+    """채널·언어별로 키워드가 늘어나는 상황을 흉내낸 합성 키워드"""
+    rng = random.Random(seed)
+    syllables = "가나다라마바사아자차카타파하실습퀴즈시험평가리포트"
+    weights = dict(DEFAULT_KEYWORDS)
+    while len(weights) < len(DEFAULT_KEYWORDS) + extra:
+        word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.3:
+            word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+        weights[word] = 1.0
+    return weights
+
+
+def bench(label: str, fn, corpus: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    rate = len(corpus) / best
+    print(f"  {label:<28} {rate:>12,.0f} msg/s  ({best * 1000:8.1f} ms)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--extra-keywords", type=int, nargs="+", default=[0, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.messages)
+    avg_len = sum(map(len, corpus)) / len(corpus)
+    print(f"corpus: {len(corpus)} messages, avg {avg_len:.0f} chars")
+
+    for extra in args.extra_keywords:
+        weights = make_keywords(extra)
+        keywords = list(weights)
+        matcher = KeywordMatcher(weights)
+
+        # 두 방식의 판정이 같은지 먼저 확인
+        for text in corpus:
+            expected = any(kw in text.lower() for kw in keywords)
+            assert expected == bool(matcher.match(text).keywords), text
+
+        def baseline_match(text: str) -> bool:
+            text_lower = text.lower()
+            return any(kw in text_lower for kw in keywords)
+
+        # 매칭된 키워드 목록까지 필요한 경우 (점수 계산)의 기존 방식
+        def baseline_collect(text: str) -> list[str]:
+            text_lower = text.lower()
+            return [kw for kw in keywords if kw in text_lower]
+
+        print(f"\nkeywords: {len(keywords)}")
+        baseline = bench("lower() + any(kw in text)", baseline_match, corpus, args.repeat)
+        collect = bench("lower() + [kw for kw ...]", baseline_collect, corpus, args.repeat)
+        compiled = bench("KeywordMatcher.match", matcher.match, corpus, args.repeat)
+        print(f"  speedup vs any(): {compiled / baseline:.1f}x / vs collect: {compiled / collect:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+규칙 기반 공지 파서(announcement_rules) 정확도 / LLM 호출 감소율 평가.
+
+benchmarks/announcement_corpus.jsonl의 라벨(제목, 마감일, 요구사항)과 비교한다.
+- fast path: 전체 신뢰도가 임계값 이상이라 LLM을 건너뛰는 공지 비율 (= LLM 호출 감소율)
+- fast path 정확도: 건너뛴 공지 중 마감일/제목/요구사항이 라벨과 맞는 비율 (틀리면 잘못 저장됨)
+- 마감일 정확도(전체): 신뢰도와 관계없이 규칙이 뽑은 마감일이 맞는 비율 (참고용)
+
+    python benchmarks/eval_announcement_rules.py [--threshold 0.85] [--min-accuracy 0.95] [-v]
+"""
+import os
+import re
+import sys
+import json
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import announcement_rules  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "announcement_corpus.jsonl")
+
+
+def _norm(value: str | None) -> str:
+    return re.sub(r"\s+", " ", value or "").strip().lower()
+
+
+def load_corpus(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(corpus: list[dict], threshold: float, verbose: bool = False) -> dict:
+    fast = fast_correct = deadline_correct = 0
+    for case in corpus:
+        result = announcement_rules.extract(case["text"], datetime.fromisoformat(case["posted_at"]))
+        expected_deadline = datetime.fromisoformat(case["deadline"]) if case["deadline"] else None
+        checks = {
+            "deadline": result.deadline == expected_deadline,
+            "title": _norm(result.title) == _norm(case["title"]),
+            "requirements": [_norm(r) for r in result.requirements] == [_norm(r) for r in case["requirements"]],
+        }
+        deadline_correct += checks["deadline"]
+        routed = "rules" if result.confidence >= threshold else "llm"
+        if routed == "rules":
+            fast += 1
+            fast_correct += all(checks.values())
+
+        if verbose or (routed == "rules" and not all(checks.values())):
+            wrong = [name for name, ok in checks.items() if not ok]
+            print(
+                f"[{routed:5}] conf={result.confidence:.2f} "
+                f"(t={result.title_confidence:.2f} d={result.deadline_confidence:.2f} r={result.requirements_confidence:.2f}) "
+                f"deadline={result.deadline} wrong={wrong or '-'} | {case['text'].splitlines()[0][:40]}"
+            )
+
+    total = len(corpus)
+    return {
+        "total": total,
+        "fast_path": fast,
+        "llm_calls_saved": fast / total if total else 0.0,
+        "fast_path_accuracy": fast_correct / fast if fast else 1.0,
+        "deadline_accuracy": deadline_correct / total if total else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="규칙 기반 공지 파서 평가")
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--threshold", type=float, default=announcement_rules.RULE_PARSE_MIN_CONFIDENCE)
+    parser.add_argument("--min-accuracy", type=float, default=None, help="fast path 정확도가 이보다 낮으면 exit 1")
+    parser.add_argument("-v", "--verbose", action="store_true", help="모든 공지의 판정 출력")
+    args = parser.parse_args()
+
+    report = evaluate(load_corpus(args.corpus), args.threshold, args.verbose)
+    print(
+        f"\n공지 {report['total']}건, 임계값 {args.threshold}\n"
+        f"  fast path (LLM 호출 감소): {report['fast_path']}건 ({report['llm_calls_saved']:.0%})\n"
+        f"  fast path 정확도:          {report['fast_path_accuracy']:.1%}\n"
+        f"  마감일 정확도 (전체):       {report['deadline_accuracy']:.1%}"
+    )
+    if args.min_accuracy is not None and report["fast_path_accuracy"] < args.min_accuracy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+가입 폭주 중 웹훅 지연시간 부하 테스트.
+
+학기 초처럼 한 번에 수십~수백 명이 /auth/signup을 호출하는 동안
+/slack/events(url_verification, 서명 검증 포함)의 응답 지연이 유지되는지 확인한다.
+앱을 ASGI로 직접 띄워 같은 이벤트 루프에서 측정하므로, 루프를 막는 코드가 있으면 바로 드러난다.
+
+    DATABASE_URL=... python benchmarks/load_signup_burst.py [--signups 200] [--probe-interval 0.01]
+
+--inline-bcrypt: 예전처럼 핸들러 안에서 bcrypt를 직접 돌렸을 때와 비교
+가입으로 생성한 학생(slack_user_id가 LOADTEST_로 시작)은 끝나면 삭제한다.
+"""
+import os
+import sys
+import hmac
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SLACK_SIGNING_SECRET", "load-test-secret")
+
+import bcrypt  # noqa: E402
+import httpx  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+
+import passwords  # noqa: E402
+from main import app, SLACK_SIGNING_SECRET  # noqa: E402
+from db import get_session, engine  # noqa: E402
+from models import Student  # noqa: E402
+from routers.auth import VERIFIED_TOKEN_TTL, _token_key  # noqa: E402
+from kvstore import kv_store  # noqa: E402
+
+USER_PREFIX = "LOADTEST_"
+
+
+def _signed_challenge() -> tuple[bytes, dict]:
+    body = json.dumps({"type": "url_verification", "challenge": "ping"}).encode()
+    timestamp = str(int(time.time()))
+    signature = "v0=" + hmac.new(
+        SLACK_SIGNING_SECRET.encode(), f"v0:{timestamp}:{body.decode()}".encode(), hashlib.sha256
+    ).hexdigest()
+    return body, {"x-slack-request-timestamp": timestamp, "x-slack-signature": signature, "content-type": "application/json"}
+
+
+def _percentiles(values: list[float]) -> str:
+    if not values:
+        return "no samples"
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+    return f"n={len(ordered):<5} p50={at(0.50):7.1f}ms  p95={at(0.95):7.1f}ms  p99={at(0.99):7.1f}ms  max={ordered[-1] * 1000:7.1f}ms"
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> list[float]:
+    """
+    interval마다 웹훅을 보낸다고 치고, 보냈어야 할 시각부터 응답까지를 지연시간으로 기록.
+    루프가 막혀 있으면 요청이 늦게 나가는 시간까지 포함되므로 Slack이 실제로 겪는 지연과 같다.
+    """
+    latencies = []
+    due = time.perf_counter()
+    while not stop.is_set():
+        body, headers = _signed_challenge()
+        response = await client.post("/slack/events", content=body, headers=headers)
+        finished = time.perf_counter()
+        latencies.append(finished - due)
+        assert response.status_code == 200, response.text
+        due = finished + interval
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def signup(client: httpx.AsyncClient, idx: int) -> int | str:
+    temp_token = str(uuid.uuid4())
+    await kv_store.set(_token_key(temp_token), f"{USER_PREFIX}{idx:05d}", ttl=VERIFIED_TOKEN_TTL)
+    try:
+        response = await client.post("/auth/signup", json={
+            "temp_token": temp_token, "name": f"부하테스트{idx}", "password": f"pw-{idx}-{uuid.uuid4().hex}",
+        })
+    except Exception as e:
+        # 루프가 오래 막히면 DB 풀 대기 시간 초과 등으로 핸들러 자체가 터짐
+        return type(e).__name__
+    return response.status_code
+
+
+async def measure(client: httpx.AsyncClient, label: str, interval: float, burst=None):
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, stop, interval))
+    started = time.perf_counter()
+    statuses = []
+    if burst is None:
+        await asyncio.sleep(2)
+    else:
+        statuses = await burst()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    latencies = await probe_task
+
+    print(f"{label:<28} {_percentiles(latencies)}")
+    if statuses:
+        counts = {code: statuses.count(code) for code in sorted(set(statuses), key=str)}
+        print(f"{'':<28} signups: {len(statuses)} in {elapsed:.1f}s ({len(statuses) / elapsed:.1f}/s) status={counts}")
+
+
+async def cleanup():
+    async with get_session() as session:
+        await session.execute(delete(Student).where(Student.slack_user_id.like(f"{USER_PREFIX}%")))
+        await session.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signups", type=int, default=200)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--inline-bcrypt", action="store_true", help="핸들러 안에서 bcrypt를 직접 실행 (변경 전 동작)")
+    args = parser.parse_args()
+
+    if args.inline_bcrypt:
+        async def inline_hash(password: str) -> str:
+            return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=passwords.BCRYPT_ROUNDS)).decode()
+        passwords.hash_password = inline_hash
+
+    print(f"bcrypt rounds={passwords.BCRYPT_ROUNDS} workers={passwords.BCRYPT_MAX_WORKERS} "
+          f"max_pending={passwords.BCRYPT_MAX_PENDING} inline={args.inline_bcrypt}")
+
+    await cleanup()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        await measure(client, "webhook (idle)", args.probe_interval)
+
+        async def burst():
+            return await asyncio.gather(*(signup(client, i) for i in range(args.signups)))
+
+        await measure(client, f"webhook ({args.signups} signups)", args.probe_interval, burst)
+
+    await cleanup()
+    passwords.shutdown()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
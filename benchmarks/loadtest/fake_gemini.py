@@ -0,0 +1,121 @@
+"""
+부하 테스트용 Gemini API 대역 (오프라인, gRPC).
+
+SDK 기본 경로(grpc_asyncio)를 그대로 타도록 GenerativeService.GenerateContent를 평문 gRPC로 제공한다.
+앱 쪽 연결은 connect() (run.py가 앱 import 직후 호출). 앱 코드에는 대역용 설정을 두지 않는다.
+프롬프트 종류(공지 파싱 / 배치 파싱 / 제출 검증)를 구분해 각 파서가 받아들이는 JSON을 돌려준다.
+error_rate 비율로 UNAVAILABLE, quota_rate 비율로 RESOURCE_EXHAUSTED(429)를 돌려 재시도/회로 차단도 확인.
+
+    python benchmarks/loadtest/fake_gemini.py --port 8702 [--latency-ms 800] [--error-rate 0.02]
+"""
+import re
+import json
+import random
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+
+import grpc
+import google.ai.generativelanguage as glm
+from google.ai.generativelanguage_v1beta.services.generative_service.transports import GenerativeServiceGrpcAsyncIOTransport
+
+_SERVICE = "google.ai.generativelanguage.v1beta.GenerativeService"
+_BULLET = re.compile(r"^\s*(?:[-•*▶]|\d+[.)])\s+(.+)$", re.MULTILINE)
+
+
+def _parse(text: str) -> dict:
+    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+    return {
+        "title": lines[0][:100] if lines else "과제",
+        "content": text,
+        "deadline": (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%dT23:59"),
+        "topic": "부하 테스트",
+        "requirements": _BULLET.findall(text)[:10],
+    }
+
+
+def respond(prompt: str) -> str:
+    """프롬프트 → 앱 파서가 기대하는 JSON 문자열"""
+    if "요구사항 목록 (JSON):" in prompt:
+        # verifier.VERIFY_PROMPT_TEMPLATE
+        requirements = json.loads(prompt.split("요구사항 목록 (JSON):", 1)[1].split("\n\n제출 본문:", 1)[0])
+        return json.dumps([
+            {"index": r["index"], "is_met": random.random() < 0.8, "feedback": "부하 테스트 판정"}
+            for r in requirements
+        ], ensure_ascii=False)
+    if "공지 메시지 목록 (JSON):" in prompt:
+        # llm.BATCH_PROMPT_TEMPLATE
+        items = json.loads(prompt.split("공지 메시지 목록 (JSON):", 1)[1])
+        return json.dumps([{"ts": item["ts"], **_parse(item["text"])} for item in items], ensure_ascii=False)
+    if "공지 메시지:" in prompt:
+        # llm.PROMPT_TEMPLATE
+        return "```json\n" + json.dumps(_parse(prompt.split("공지 메시지:", 1)[1]), ensure_ascii=False) + "\n```"
+    return "{}"
+
+
+def connect(client, host: str):
+    """
+    llm.GeminiClient가 이 대역(host:port)을 부르도록 연결. 벤치마크 전용.
+    SDK는 TLS 채널만 만들기 때문에 평문 gRPC 채널로 만든 비동기 클라이언트를 모델에 직접 넣는다
+    (SDK 내부 속성이라 SDK 버전이 바뀌면 여기만 고치면 됨). generate_content_async 경로는 운영과 같음.
+    """
+    transport = GenerativeServiceGrpcAsyncIOTransport(channel=grpc.aio.insecure_channel(host))
+    client._model._async_client = glm.GenerativeServiceAsyncClient(transport=transport)
+
+
+class FakeGemini:
+    def __init__(self, latency_ms: float = 800, jitter_ms: float = 300, error_rate: float = 0.0, quota_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota_rate = quota_rate
+        self.calls = 0
+        self.errors = 0
+
+    async def generate_content(self, request: glm.GenerateContentRequest, context: grpc.aio.ServicerContext):
+        self.calls += 1
+        await asyncio.sleep(max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000)
+        roll = random.random()
+        if roll < self.quota_rate:
+            self.errors += 1
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "quota exceeded (fake)")
+        if roll < self.quota_rate + self.error_rate:
+            self.errors += 1
+            await context.abort(grpc.StatusCode.UNAVAILABLE, "backend unavailable (fake)")
+
+        prompt = "".join(part.text for content in request.contents for part in content.parts)
+        return glm.GenerateContentResponse(candidates=[glm.Candidate(
+            content=glm.Content(role="model", parts=[glm.Part(text=respond(prompt))]),
+            finish_reason=glm.Candidate.FinishReason.STOP,
+        )])
+
+    async def start(self, port: int = 0) -> tuple[grpc.aio.Server, int]:
+        """서버 시작, (서버, 실제 포트) 반환. port=0이면 빈 포트"""
+        server = grpc.aio.server()
+        server.add_generic_rpc_handlers([grpc.method_handlers_generic_handler(_SERVICE, {
+            "GenerateContent": grpc.unary_unary_rpc_method_handler(
+                self.generate_content,
+                request_deserializer=glm.GenerateContentRequest.deserialize,
+                response_serializer=glm.GenerateContentResponse.serialize,
+            ),
+        })])
+        port = server.add_insecure_port(f"127.0.0.1:{port}")
+        await server.start()
+        return server, port
+
+
+async def serve(args):
+    fake = FakeGemini(args.latency_ms, args.jitter_ms, args.error_rate, args.quota_rate)
+    server, port = await fake.start(args.port)
+    print(f"fake gemini listening on 127.0.0.1:{port}", flush=True)
+    await server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gemini API 대역 (gRPC)")
+    parser.add_argument("--port", type=int, default=8702)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--jitter-ms", type=float, default=300)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="UNAVAILABLE 응답 비율")
+    parser.add_argument("--quota-rate", type=float, default=0.0, help="RESOURCE_EXHAUSTED(429) 응답 비율")
+    asyncio.run(serve(parser.parse_args()))
@@ -0,0 +1,136 @@
+"""
+부하 테스트용 Slack Web API 대역 (오프라인).
+
+synthetic.Workspace와 같은 멤버/유저를 돌려주고, 제출 파일(/files/...)은 file_size 바이트를 스트리밍한다.
+응답마다 지연(latency ± jitter)을 넣고 error_rate 비율로 5xx, ratelimit_rate 비율로 429(Retry-After)를 돌려준다.
+run.py가 하위 프로세스로 띄우지만 단독으로 띄워 개발 서버의 SLACK_API_BASE_URL로 써도 된다.
+
+    python benchmarks/loadtest/fake_slack.py --port 8701 [--latency-ms 40] [--error-rate 0.01]
+"""
+import os
+import sys
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
+
+from synthetic import Workspace  # noqa: E402
+
+_FILE_CHUNK = 64 * 1024
+
+
+def create_app(
+    workspace: Workspace, latency_ms: float = 40, jitter_ms: float = 20,
+    error_rate: float = 0.0, ratelimit_rate: float = 0.0, file_size: int = 256 * 1024,
+) -> FastAPI:
+    app = FastAPI()
+    users = workspace.users()
+    users_by_id = {user["id"]: user for user in users}
+    users_by_email = {user["profile"].get("email"): user for user in users}
+    members = {workspace.channel_id(c): workspace.members(c) for c in range(workspace.channels)}
+    calls: dict[str, int] = {}
+
+    def _page(items: list, params) -> dict:
+        limit = int(params.get("limit") or 100)
+        start = int(params.get("cursor") or 0)
+        end = start + limit
+        return {"items": items[start:end], "next_cursor": str(end) if end < len(items) else ""}
+
+    @app.middleware("http")
+    async def simulate(request: Request, call_next):
+        method = request.url.path.strip("/").split("/")[0]
+        if method.startswith("_"):
+            return await call_next(request)
+        calls[method] = calls.get(method, 0) + 1
+        await asyncio.sleep(max(0.0, random.gauss(latency_ms, jitter_ms)) / 1000)
+        roll = random.random()
+        if roll < ratelimit_rate:
+            return JSONResponse({"ok": False, "error": "ratelimited"}, status_code=429, headers={"Retry-After": "1"})
+        if roll < ratelimit_rate + error_rate:
+            return JSONResponse({"ok": False, "error": "internal_error"}, status_code=503)
+        return await call_next(request)
+
+    @app.get("/_calls")
+    async def call_counts():
+        return calls
+
+    @app.get("/conversations.members")
+    async def conversations_members(request: Request):
+        channel = request.query_params.get("channel")
+        if channel not in members:
+            return {"ok": False, "error": "channel_not_found"}
+        page = _page(members[channel], request.query_params)
+        return {"ok": True, "members": page["items"], "response_metadata": {"next_cursor": page["next_cursor"]}}
+
+    @app.get("/users.list")
+    async def users_list(request: Request):
+        page = _page(users, request.query_params)
+        return {"ok": True, "members": page["items"], "response_metadata": {"next_cursor": page["next_cursor"]}}
+
+    @app.get("/users.info")
+    async def users_info(request: Request):
+        user = users_by_id.get(request.query_params.get("user"))
+        return {"ok": True, "user": user} if user else {"ok": False, "error": "user_not_found"}
+
+    @app.get("/users.lookupByEmail")
+    async def users_lookup_by_email(request: Request):
+        user = users_by_email.get(request.query_params.get("email"))
+        return {"ok": True, "user": user} if user else {"ok": False, "error": "users_not_found"}
+
+    @app.get("/conversations.history")
+    @app.get("/conversations.replies")
+    async def conversations_history():
+        return {"ok": True, "messages": [], "response_metadata": {"next_cursor": ""}}
+
+    @app.post("/chat.postMessage")
+    async def chat_post_message(request: Request):
+        payload = await request.json()
+        return {"ok": True, "channel": payload.get("channel"), "ts": "1.000000"}
+
+    @app.get("/files/{file_id}/{name}")
+    async def download(file_id: str, name: str):
+        # 파일 ID마다 내용이 달라야 저장소의 중복 제거에 모두 걸리지 않음
+        seed = file_id.encode()
+
+        async def body():
+            remaining = file_size
+            chunk = (seed * (_FILE_CHUNK // len(seed) + 1))[:_FILE_CHUNK]
+            while remaining > 0:
+                yield chunk[:remaining]
+                remaining -= len(chunk)
+
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    @app.api_route("/{method}", methods=["GET", "POST"])
+    async def unknown_method(method: str):
+        return {"ok": False, "error": "unknown_method"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slack Web API 대역")
+    parser.add_argument("--port", type=int, default=8701)
+    parser.add_argument("--channels", type=int, default=Workspace.channels)
+    parser.add_argument("--students", type=int, default=Workspace.students)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="5xx 응답 비율")
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--file-size", type=int, default=256 * 1024, help="제출 파일 크기 (바이트)")
+    args = parser.parse_args()
+
+    app = create_app(
+        Workspace(args.channels, args.students), args.latency_ms, args.jitter_ms,
+        args.error_rate, args.ratelimit_rate, args.file_size,
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
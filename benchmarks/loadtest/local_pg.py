@@ -0,0 +1,109 @@
+"""
+부하 테스트용 일회용 Postgres.
+
+임시 디렉터리에 initdb → 빈 포트로 pg_ctl start → 끝나면 stop + 디렉터리 삭제.
+Postgres 바이너리는 PG_BIN(디렉터리) → PATH → pg_config --bindir 순서로 찾는다.
+initdb는 root로 실행할 수 없으므로 일반 사용자로 실행하거나 run.py --database-url로 기존 DB를 지정.
+
+스키마는 운영 DB와 같은 순서로 만든다: models.py create_all + 마이그레이션 이전 slack_events → migrate.py
+"""
+import os
+import shutil
+import socket
+import tempfile
+import subprocess
+
+_USER = "postgres"
+_DATABASE = "loadtest"
+
+# 0005_partition_slack_events가 이어받는 마이그레이션 이전 slack_events (models.py에 없음)
+LEGACY_SLACK_EVENTS_DDL = """
+CREATE TABLE IF NOT EXISTS slack_events (
+    id bigserial PRIMARY KEY, event_id text UNIQUE, event_type text, event_subtype text,
+    team_id text, channel_id text, user_id text, text text, ts text, thread_ts text, event_time bigint,
+    {files},
+    raw_payload json, processed boolean NOT NULL DEFAULT FALSE
+)
+""".format(files=",\n    ".join(
+    f"file_{i}_id text, file_{i}_name text, file_{i}_mimetype text, file_{i}_url text" for i in range(1, 6)
+))
+
+
+def _bin_dir() -> str:
+    if os.getenv("PG_BIN"):
+        return os.environ["PG_BIN"]
+    initdb = shutil.which("initdb")
+    if initdb:
+        return os.path.dirname(initdb)
+    pg_config = shutil.which("pg_config")
+    if pg_config:
+        return subprocess.run([pg_config, "--bindir"], capture_output=True, text=True, check=True).stdout.strip()
+    raise RuntimeError("Postgres 바이너리를 찾을 수 없습니다. PG_BIN을 지정하거나 --database-url을 사용하세요.")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LocalPostgres:
+    """with LocalPostgres() as pg: pg.url → postgresql://postgres@127.0.0.1:<port>/loadtest"""
+
+    def __init__(self, settings: dict[str, str] | None = None):
+        self.bin_dir = _bin_dir()
+        self.port = free_port()
+        # 부하 테스트 동시 연결 수 + processor/verifier 풀
+        self.settings = {"max_connections": "200", **(settings or {})}
+        self.directory: str | None = None
+
+    @property
+    def url(self) -> str:
+        return f"postgresql://{_USER}@127.0.0.1:{self.port}/{_DATABASE}"
+
+    def _run(self, name: str, *args: str):
+        subprocess.run([os.path.join(self.bin_dir, name), *args], check=True, capture_output=True, text=True)
+
+    def start(self):
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            raise RuntimeError("initdb는 root로 실행할 수 없습니다. 일반 사용자로 실행하거나 --database-url을 사용하세요.")
+        self.directory = tempfile.mkdtemp(prefix="events-loadtest-pg-")
+        data = os.path.join(self.directory, "data")
+        self._run("initdb", "-D", data, "-U", _USER, "-A", "trust", "-E", "UTF8", "--no-sync")
+        options = " ".join(f"-c {key}={value}" for key, value in self.settings.items())
+        self._run(
+            "pg_ctl", "-D", data, "-w", "-l", os.path.join(self.directory, "postgres.log"),
+            "-o", f"-p {self.port} -k {self.directory} -c listen_addresses=127.0.0.1 {options}", "start",
+        )
+        self._run("createdb", "-h", "127.0.0.1", "-p", str(self.port), "-U", _USER, _DATABASE)
+
+    def stop(self):
+        if self.directory is None:
+            return
+        try:
+            self._run("pg_ctl", "-D", os.path.join(self.directory, "data"), "-m", "immediate", "stop")
+        finally:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def __enter__(self) -> "LocalPostgres":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+async def create_schema():
+    """빈 DB에 스키마 생성 (DATABASE_URL 환경변수가 이미 설정된 뒤 호출)"""
+    from sqlalchemy import text
+    from db import engine
+    from models import Base
+    from migrate import apply_migrations
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(LEGACY_SLACK_EVENTS_DDL))
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await apply_migrations(raw.driver_connection)
@@ -0,0 +1,407 @@
+"""
+엔드투엔드 부하 테스트 (오프라인).
+
+일회용 Postgres + Slack/Gemini 대역(하위 프로세스)을 띄우고, 앱을 ASGI로 직접 올려 단계별로 측정한다.
+- webhook:   서명된 /slack/events 요청을 초당 --rate건 (열린 부하: 응답을 기다리지 않고 예정 시각에 보냄)
+             지연시간 = 보냈어야 할 시각 → 응답. 끝난 뒤 이벤트 큐(공지 파싱·저장)가 빌 때까지 대기
+- processor: 쌓인 slack_events를 processor.run_workers로 처리 (process_pending_events)
+- files:     제출 파일 받기 (file_store.fetch_pending_files)
+- verify:    요구사항 검증 (verifier.verify_pending)
+- userlist:  /slack/command /userlist 를 초당 --userlist-rate건
+단계마다 처리량, p50/p95/p99 지연, 이벤트당 DB 왕복 수(db_queries_total), LLM/Slack 호출 수를 출력.
+
+    python benchmarks/loadtest/run.py [--rate 100] [--duration 20] [--phases webhook,processor]
+    python benchmarks/loadtest/run.py --output base.json            # 기준 저장
+    python benchmarks/loadtest/run.py --baseline base.json          # 기준보다 tolerance 이상 나빠지면 exit 1
+
+--database-url: 일회용 Postgres 대신 기존 DB 사용 (스키마가 없으면 만들고, 데이터는 지우지 않음)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import Counter
+from contextlib import contextmanager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(os.path.dirname(HERE)))
+
+from synthetic import EventGenerator, Workspace, sign  # noqa: E402
+from local_pg import LocalPostgres, create_schema, free_port  # noqa: E402
+
+SIGNING_SECRET = "loadtest-signing-secret"
+PHASES = ("webhook", "processor", "files", "verify", "userlist")
+
+
+def _spawn(script: str, port: int, *args) -> subprocess.Popen:
+    """대역 서버를 하위 프로세스로 띄우고 포트가 열릴 때까지 대기 (앱과 이벤트 루프/CPU를 나눠 쓰지 않도록)"""
+    process = subprocess.Popen([sys.executable, "-W", "ignore", os.path.join(HERE, script), "--port", str(port), *map(str, args)])
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{script} 시작 실패 (exit {process.returncode})")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"{script}가 {port} 포트를 열지 않음")
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000 if ordered else 0.0
+
+
+def _summary(count: int, seconds: float, latencies: list[float], round_trips: float, **extra) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "count": count,
+        "seconds": round(seconds, 3),
+        "throughput": round(count / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(_percentile(ordered, 0.50), 1),
+        "p95_ms": round(_percentile(ordered, 0.95), 1),
+        "p99_ms": round(_percentile(ordered, 0.99), 1),
+        "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+        "db_round_trips_per_event": round(round_trips / count, 2) if count else 0.0,
+        **extra,
+    }
+
+
+@contextmanager
+def _timing(module, name: str):
+    """module.name(코루틴 함수) 호출마다 걸린 시간을 기록. 같은 모듈 안의 호출도 전역 이름으로 찾으므로 잡힘"""
+    original = getattr(module, name)
+    samples: list[float] = []
+
+    async def timed(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+
+    setattr(module, name, timed)
+    try:
+        yield samples
+    finally:
+        setattr(module, name, original)
+
+
+class Probe:
+    """단계 시작 시점의 누적 카운터 → 단계 동안의 증가량"""
+
+    def __init__(self):
+        from metrics import db_queries_total, events_total, announcement_parse_total
+        import llm
+        from slack_api import slack
+
+        self._counters = {"db": db_queries_total, "events": events_total, "parse": announcement_parse_total}
+        self._llm = llm.get_client()
+        self._slack = slack
+        self._start = self._read()
+
+    def _read(self) -> dict:
+        values = {name: counter.snapshot() for name, counter in self._counters.items()}
+        values["llm_calls"] = self._llm.calls
+        values["slack_calls"] = self._slack.calls
+        return values
+
+    def delta(self) -> dict:
+        now = self._read()
+
+        def diff(name: str) -> dict:
+            return {
+                ",".join(key) or "total": now[name][key] - self._start[name].get(key, 0.0)
+                for key in now[name] if now[name][key] != self._start[name].get(key, 0.0)
+            }
+
+        return {
+            "db_round_trips": sum(diff("db").values()),
+            "outcomes": {key: int(value) for key, value in diff("events").items()},
+            "parse_methods": {key: int(value) for key, value in diff("parse").items()},
+            "llm_calls": now["llm_calls"] - self._start["llm_calls"],
+            "slack_calls": now["slack_calls"] - self._start["slack_calls"],
+        }
+
+
+async def _open_loop(rate: float, duration: float, request) -> tuple[list[float], Counter, float]:
+    """예정 시각(i / rate)마다 request(i)를 띄움. 지연시간은 예정 시각부터 → 느려진 루프도 지연에 포함"""
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+
+    async def send(i: int, due: float):
+        try:
+            statuses[await request(i)] += 1
+        except Exception as e:
+            statuses[type(e).__name__] += 1
+        latencies.append(time.perf_counter() - due)
+
+    started = time.perf_counter()
+    tasks = []
+    for i in range(int(rate * duration)):
+        due = started + i / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(i, due)))
+    await asyncio.gather(*tasks)
+    return latencies, statuses, time.perf_counter() - started
+
+
+async def seed(workspace: Workspace):
+    """수업/교수님/학생 (이미 있으면 건너뜀)"""
+    import uuid
+    from sqlalchemy import select
+    from db import get_session
+    from models import Class, Professor, Student
+
+    async with get_session() as session:
+        if await session.scalar(select(Class.class_id).where(Class.slack_channel_id == workspace.channel_id(0))):
+            return
+        for c in range(workspace.channels):
+            class_id = uuid.uuid4()
+            session.add(Class(class_id=class_id, class_name=workspace.class_name(c), class_group="loadtest",
+                              slack_channel_id=workspace.channel_id(c)))
+            session.add(Professor(name=f"교수{c}", slack_user_id=workspace.professor_id(c), password="!"))
+            session.add_all(
+                Student(name=f"학생{c}-{s}", slack_user_id=workspace.student_id(c, s), class_id=class_id)
+                for s in range(workspace.students)
+            )
+        await session.commit()
+
+
+async def webhook_phase(client, generator: EventGenerator, rate: float, duration: float) -> dict:
+    from worker import event_queue
+
+    events = iter(generator)
+
+    async def request(_):
+        body, retry = next(events)
+        raw = json.dumps(body, ensure_ascii=False).encode()
+        headers = sign(raw, SIGNING_SECRET)
+        if retry:
+            headers["x-slack-retry-num"] = "1"
+        return (await client.post("/slack/events", content=raw, headers=headers)).status_code
+
+    probe = Probe()
+    started = time.perf_counter()
+    latencies, statuses, elapsed = await _open_loop(rate, duration, request)
+    # ack 이후 워커가 하는 일(공지 파싱·저장, 제출 후보 저장)까지 끝나야 DB 왕복 수가 맞음
+    while True:
+        queue = event_queue.stats()
+        if queue["depth"] == 0 and queue["completed"] + queue["failed"] >= queue["enqueued"]:
+            break
+        await asyncio.sleep(0.05)
+    settled = time.perf_counter() - started
+    delta = probe.delta()
+    return _summary(
+        len(latencies), elapsed, latencies, delta["db_round_trips"],
+        settled_seconds=round(settled, 3), statuses={str(k): v for k, v in statuses.items()},
+        outcomes=delta["outcomes"], parse_methods=delta["parse_methods"], llm_calls=delta["llm_calls"],
+    )
+
+
+async def batch_phase(module, batch_function: str, run) -> dict:
+    """배치 작업(run) 한 번을 끝까지 실행, 배치당 지연시간"""
+    probe = Probe()
+    with _timing(module, batch_function) as samples:
+        started = time.perf_counter()
+        count = await run()
+        elapsed = time.perf_counter() - started
+    delta = probe.delta()
+    return _summary(
+        count, elapsed, samples, delta["db_round_trips"],
+        calls=len(samples), llm_calls=delta["llm_calls"], slack_calls=delta["slack_calls"],
+    )
+
+
+async def userlist_phase(client, workspace: Workspace, rate: float, duration: float) -> dict:
+    from urllib.parse import urlencode
+
+    async def request(i):
+        raw = urlencode({
+            "command": "/userlist", "channel_id": workspace.channel_id(i % workspace.channels),
+            "user_id": workspace.professor_id(0), "text": "",
+        }).encode()
+        headers = {**sign(raw, SIGNING_SECRET), "content-type": "application/x-www-form-urlencoded"}
+        return (await client.post("/slack/command", content=raw, headers=headers)).status_code
+
+    probe = Probe()
+    latencies, statuses, elapsed = await _open_loop(rate, duration, request)
+    delta = probe.delta()
+    return _summary(
+        len(latencies), elapsed, latencies, delta["db_round_trips"],
+        statuses={str(k): v for k, v in statuses.items()}, slack_calls=delta["slack_calls"],
+    )
+
+
+async def run(args, slack_url: str, gemini_host: str) -> dict:
+    import httpx
+    import llm
+    import processor
+    import file_store
+    import verifier
+    from db import dispose
+    from main import app
+    from fake_gemini import connect
+
+    # lifespan의 llm.init_client()는 이미 만든 클라이언트를 그대로 씀
+    connect(llm.init_client(), gemini_host)
+    workspace = Workspace(args.channels, args.students)
+    # create_all / 마이그레이션 모두 이미 있으면 건너뜀
+    await create_schema()
+    await seed(workspace)
+
+    generator = EventGenerator(
+        workspace, slack_url, fanout=args.fanout, file_ratio=args.file_ratio,
+        chatter_ratio=args.chatter_ratio, retry_ratio=args.retry_ratio, seed=args.seed,
+    )
+    report = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+            for phase in args.phases:
+                if phase == "webhook":
+                    report[phase] = await webhook_phase(client, generator, args.rate, args.duration)
+                elif phase == "processor":
+                    report[phase] = await batch_phase(
+                        processor, "process_batch", lambda: processor.run_workers(args.processor_workers, args.processor_batch_size),
+                    )
+                elif phase == "files":
+                    report[phase] = await batch_phase(file_store, "fetch_file", file_store.fetch_pending_files)
+                elif phase == "verify":
+                    report[phase] = await batch_phase(verifier, "verify_batch", verifier.verify_pending)
+                elif phase == "userlist":
+                    report[phase] = await userlist_phase(client, workspace, args.userlist_rate, args.duration)
+                _print_phase(phase, report[phase])
+    await dispose()
+    return report
+
+
+def _print_phase(name: str, result: dict):
+    print(
+        f"{name:<10} n={result['count']:<6} {result['throughput']:8.1f}/s  "
+        f"p50={result['p50_ms']:7.1f}ms p95={result['p95_ms']:7.1f}ms p99={result['p99_ms']:7.1f}ms max={result['max_ms']:7.1f}ms  "
+        f"db/event={result['db_round_trips_per_event']:.2f}",
+        flush=True,
+    )
+    extra = {k: v for k, v in result.items() if k not in ("count", "seconds", "throughput", "p50_ms", "p95_ms", "p99_ms", "max_ms", "db_round_trips_per_event")}
+    print(f"{'':<10} {json.dumps(extra, ensure_ascii=False)}", flush=True)
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """기준 대비 나빠진 항목 (처리량 감소, p99 증가, 이벤트당 DB 왕복 증가)"""
+    regressions = []
+    for phase, base in baseline.items():
+        current = report.get(phase)
+        if current is None:
+            continue
+        if current["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{phase}: throughput {base['throughput']} -> {current['throughput']}/s")
+        if current["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{phase}: p99 {base['p99_ms']} -> {current['p99_ms']}ms")
+        # 왕복 수는 거의 결정적이라 작은 증가도 잡되, 재시도 등 잡음은 0.5까지 허용
+        if current["db_round_trips_per_event"] > base["db_round_trips_per_event"] * (1 + tolerance) + 0.5:
+            regressions.append(f"{phase}: db/event {base['db_round_trips_per_event']} -> {current['db_round_trips_per_event']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔드투엔드 부하 테스트 (Slack/Gemini 대역 + 일회용 Postgres)")
+    parser.add_argument("--phases", default=",".join(PHASES), help=f"쉼표로 구분, 순서대로 실행 ({','.join(PHASES)})")
+    parser.add_argument("--rate", type=float, default=100, help="webhook 초당 이벤트 수")
+    parser.add_argument("--duration", type=float, default=20, help="webhook/userlist 단계 길이 (초)")
+    parser.add_argument("--userlist-rate", type=float, default=20)
+    parser.add_argument("--channels", type=int, default=Workspace.channels)
+    parser.add_argument("--students", type=int, default=Workspace.students, help="채널당 학생 수")
+    parser.add_argument("--fanout", type=int, default=30, help="공지 1건당 평균 스레드 댓글 수")
+    parser.add_argument("--file-ratio", type=float, default=0.3, help="파일이 첨부된 제출 비율")
+    parser.add_argument("--chatter-ratio", type=float, default=0.1, help="과제와 무관한 학생 메시지 비율")
+    parser.add_argument("--retry-ratio", type=float, default=0.02, help="Slack 재전송(같은 event_id) 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processor-workers", type=int, default=None, help="기본: PROCESSOR_WORKERS")
+    parser.add_argument("--processor-batch-size", type=int, default=None, help="기본: PROCESSOR_BATCH_SIZE")
+    parser.add_argument("--slack-latency-ms", type=float, default=40)
+    parser.add_argument("--slack-error-rate", type=float, default=0.0)
+    parser.add_argument("--slack-ratelimit-rate", type=float, default=0.0)
+    parser.add_argument("--file-size", type=int, default=256 * 1024)
+    parser.add_argument("--gemini-latency-ms", type=float, default=800)
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0)
+    parser.add_argument("--gemini-quota-rate", type=float, default=0.0)
+    parser.add_argument("--database-url", help="일회용 Postgres 대신 사용할 DB")
+    parser.add_argument("--output", help="결과를 JSON으로 저장")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="기준 대비 허용 비율")
+    args = parser.parse_args()
+    args.phases = [phase.strip() for phase in args.phases.split(",") if phase.strip()]
+    unknown = set(args.phases) - set(PHASES)
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(sorted(unknown))}")
+
+    slack_port, gemini_port = free_port(), free_port()
+    pg = None if args.database_url else LocalPostgres()
+    processes = []
+    files_dir = tempfile.mkdtemp(prefix="events-loadtest-files-")
+    try:
+        if pg is not None:
+            pg.start()
+        processes.append(_spawn(
+            "fake_slack.py", slack_port, "--channels", args.channels, "--students", args.students,
+            "--latency-ms", args.slack_latency_ms, "--error-rate", args.slack_error_rate,
+            "--ratelimit-rate", args.slack_ratelimit_rate, "--file-size", args.file_size,
+        ))
+        processes.append(_spawn(
+            "fake_gemini.py", gemini_port, "--latency-ms", args.gemini_latency_ms,
+            "--error-rate", args.gemini_error_rate, "--quota-rate", args.gemini_quota_rate,
+        ))
+
+        # 앱 모듈은 import 시점에 환경변수를 읽으므로 그 전에 설정 (.env보다 우선)
+        slack_url = f"http://127.0.0.1:{slack_port}"
+        os.environ.update({
+            "DATABASE_URL": args.database_url or pg.url,
+            "SLACK_API_BASE_URL": slack_url,
+            "SLACK_BOT_TOKEN": "xoxb-loadtest",
+            "SLACK_SIGNING_SECRET": SIGNING_SECRET,
+            "GEMINI_API_KEY": "loadtest",
+            "FILE_STORE_DIR": files_dir,
+        })
+        os.environ.pop("DATABASE_READ_URL", None)
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        if args.processor_workers is None or args.processor_batch_size is None:
+            import processor
+            args.processor_workers = args.processor_workers or processor.PROCESSOR_WORKERS
+            args.processor_batch_size = args.processor_batch_size or processor.PROCESSOR_BATCH_SIZE
+
+        print(f"rate={args.rate}/s duration={args.duration}s channels={args.channels} students={args.students} "
+              f"fanout={args.fanout} slack={args.slack_latency_ms}ms gemini={args.gemini_latency_ms}ms", flush=True)
+        report = asyncio.run(run(args, slack_url, f"127.0.0.1:{gemini_port}"))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+        if pg is not None:
+            pg.stop()
+        shutil.rmtree(files_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+부하 테스트용 합성 워크스페이스 / Slack 이벤트 생성기.
+
+fake_slack.py(멤버·유저 목록), run.py(DB 시드·웹훅 요청)가 같은 Workspace 인자로 같은 ID를 만든다.
+공지 본문은 benchmarks/announcement_corpus.jsonl에서 골라 규칙 파서 / LLM 경로가 실제 비율로 섞이게 한다.
+"""
+import os
+import hmac
+import json
+import time
+import random
+import hashlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterator
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "announcement_corpus.jsonl")
+
+TEAM_ID = "TLOADTEST"
+
+_SUBMISSION_TEXTS = (
+    "과제 제출합니다.",
+    "제출합니다! 깃허브: https://github.com/student/repo-{n}",
+    "보고서 첨부합니다. 확인 부탁드립니다.",
+    "{n}번 과제 제출합니다. 노트북 파일 첨부했습니다.",
+    "늦어서 죄송합니다. 제출합니다.",
+)
+_CHATTER_TEXTS = ("혹시 마감 연장되나요?", "오늘 수업 자료 어디 있나요?", "점심 뭐 먹지", "스터디 하실 분?")
+_FILE_TYPES = (("pdf", "application/pdf"), ("ipynb", "application/json"), ("zip", "application/zip"), ("md", "text/markdown"))
+
+
+@dataclass(frozen=True)
+class Workspace:
+    """채널 하나 = 수업 하나 (교수님 1명 + 학생 students명)"""
+    channels: int = 4
+    students: int = 40
+
+    def channel_id(self, c: int) -> str:
+        return f"CLT{c:05d}"
+
+    def class_name(self, c: int) -> str:
+        return f"부하테스트 수업 {c}"
+
+    def professor_id(self, c: int) -> str:
+        return f"ULTP{c:05d}"
+
+    def student_id(self, c: int, s: int) -> str:
+        return f"ULTS{c:05d}{s:04d}"
+
+    def members(self, c: int) -> list[str]:
+        return [self.professor_id(c)] + [self.student_id(c, s) for s in range(self.students)] + ["USLACKBOT"]
+
+    def users(self) -> list[dict]:
+        users = []
+        for c in range(self.channels):
+            users.append(_user(self.professor_id(c), f"prof{c}", f"교수{c}"))
+            users.extend(_user(self.student_id(c, s), f"student{c}_{s}", f"학생{c}-{s}") for s in range(self.students))
+        users.append({"id": "USLACKBOT", "name": "slackbot", "is_bot": True, "profile": {}})
+        return users
+
+
+def _user(user_id: str, name: str, real_name: str) -> dict:
+    return {
+        "id": user_id, "name": name, "real_name": real_name, "deleted": False, "is_bot": False,
+        "profile": {"email": f"{name}@loadtest.invalid", "real_name": real_name},
+    }
+
+
+def load_announcements(path: str = CORPUS) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["text"] for line in f if line.strip()]
+
+
+def sign(body: bytes, secret: str, timestamp: str | None = None) -> dict:
+    """Slack 서명 헤더 (v0=HMAC-SHA256(secret, "v0:{timestamp}:{body}"))"""
+    timestamp = timestamp or str(int(time.time()))
+    signature = "v0=" + hmac.new(secret.encode(), f"v0:{timestamp}:{body.decode()}".encode(), hashlib.sha256).hexdigest()
+    return {"x-slack-request-timestamp": timestamp, "x-slack-signature": signature, "content-type": "application/json"}
+
+
+@dataclass
+class EventGenerator:
+    """
+    실제 채널과 비슷한 순서의 message 이벤트 (event_callback 본문) 생성.
+    - 공지 1건당 평균 fanout개의 스레드 댓글 (학생 제출, 가끔 교수님 댓글)
+    - 제출 중 file_ratio는 파일 첨부 (fake Slack의 /files/...에서 받음)
+    - chatter_ratio는 학생의 일반 메시지 (교수님이 아니므로 바로 건너뜀)
+    - retry_ratio는 이미 보낸 이벤트의 재전송 (같은 event_id, dedup 경로)
+    """
+    workspace: Workspace
+    slack_base_url: str
+    fanout: int = 30
+    file_ratio: float = 0.3
+    chatter_ratio: float = 0.1
+    retry_ratio: float = 0.02
+    seed: int = 0
+    announcements: list[str] = field(default_factory=load_announcements)
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+        self._count = 0
+        # 최근 공지 스레드 (channel, thread_ts). 제출은 대부분 최근 공지에 달림
+        self._threads: deque[tuple[int, str]] = deque(maxlen=20)
+        # 재전송할 후보 (최근 보낸 이벤트)
+        self._sent: deque[dict] = deque(maxlen=200)
+        self._ts = time.time() - 3600
+        # 같은 DB로 다시 돌려도 event_id가 겹쳐 전부 재전송으로 처리되지 않도록
+        self._run = f"{int(time.time()):x}"
+
+    def _next_ts(self) -> str:
+        self._ts += self._random.uniform(0.001, 0.2)
+        return f"{self._ts:.6f}"
+
+    def _body(self, channel: int, event: dict) -> dict:
+        self._count += 1
+        ts = event["ts"]
+        return {
+            "type": "event_callback",
+            "team_id": TEAM_ID,
+            "event_id": f"EvLT{self._run}{self.seed:04d}{self._count:09d}",
+            "event_time": int(float(ts)),
+            "event": {"type": "message", "channel": self.workspace.channel_id(channel), **event},
+        }
+
+    def _announcement(self) -> dict:
+        channel = self._random.randrange(self.workspace.channels)
+        ts = self._next_ts()
+        self._threads.append((channel, ts))
+        # 분반 번호를 붙여 공지마다 본문이 달라지게 (파싱 캐시에 모두 걸리지 않도록)
+        text = f"{self._count}분반 " + self._random.choice(self.announcements)
+        return self._body(channel, {"user": self.workspace.professor_id(channel), "text": text, "ts": ts})
+
+    def _reply(self) -> dict:
+        # 최근 공지일수록 댓글이 많음
+        channel, thread_ts = self._threads[-1 - min(int(self._random.expovariate(0.5)), len(self._threads) - 1)]
+        ts = self._next_ts()
+        if self._random.random() < 0.05:
+            return self._body(channel, {
+                "user": self.workspace.professor_id(channel), "text": "확인했습니다.", "ts": ts, "thread_ts": thread_ts,
+            })
+        student = self._random.randrange(self.workspace.students)
+        event = {
+            "user": self.workspace.student_id(channel, student),
+            "text": self._random.choice(_SUBMISSION_TEXTS).format(n=self._count),
+            "ts": ts,
+            "thread_ts": thread_ts,
+        }
+        if self._random.random() < self.file_ratio:
+            extension, mimetype = self._random.choice(_FILE_TYPES)
+            file_id = f"FLT{self._count:09d}"
+            event.update(subtype="file_share", files=[{
+                "id": file_id, "name": f"report_{self._count}.{extension}", "mimetype": mimetype,
+                "url_private": f"{self.slack_base_url}/files/{file_id}/report_{self._count}.{extension}",
+            }])
+        return self._body(channel, event)
+
+    def _chatter(self) -> dict:
+        channel = self._random.randrange(self.workspace.channels)
+        student = self._random.randrange(self.workspace.students)
+        return self._body(channel, {
+            "user": self.workspace.student_id(channel, student), "text": self._random.choice(_CHATTER_TEXTS), "ts": self._next_ts(),
+        })
+
+    def next(self) -> tuple[dict, bool]:
+        """(본문, 재전송 여부)"""
+        roll = self._random.random()
+        if self._sent and roll < self.retry_ratio:
+            return self._random.choice(self._sent), True
+        if roll < self.retry_ratio + self.chatter_ratio:
+            body = self._chatter()
+        elif not self._threads or self._random.random() < 1 / (self.fanout + 1):
+            body = self._announcement()
+        else:
+            body = self._reply()
+        self._sent.append(body)
+        return body, False
+
+    def __iter__(self) -> Iterator[tuple[dict, bool]]:
+        while True:
+            yield self.next()
@@ -0,0 +1,122 @@
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+_MISSING = object()
+
+
+async def single_flight(
+    inflight: dict[Hashable, asyncio.Future], key: Hashable, loader: Callable[[], Awaitable[Any]],
+    on_wait: Callable[[], None] | None = None,
+) -> Any:
+    """
+    같은 key로 동시에 들어온 호출은 loader를 한 번만 실행하고 나머지는 그 결과를 기다림.
+    loader를 실행하던 호출(리더)이 취소되면 공유 future도 취소 → 취소되지 않은 대기자는 직접 다시 로드
+    (리더의 CancelledError를 대기자에게 넘기지 않음)
+    """
+    while True:
+        future = inflight.get(key)
+        if future is None:
+            break
+        if on_wait is not None:
+            on_wait()
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled() or asyncio.current_task().cancelling():
+                raise
+
+    future = asyncio.get_running_loop().create_future()
+    inflight[key] = future
+    try:
+        value = await loader()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+        future.exception()
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        if inflight.get(key) is future:
+            del inflight[key]
+
+
+class TTLCache:
+    """
+    크기 제한 LRU + TTL 캐시.
+    - 값이 None이면 negative_ttl 동안 "없음"으로 캐싱 (교수님 아님 등)
+    - 같은 키를 동시에 로드하면 loader는 한 번만 실행 (나머지는 결과 대기)
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, negative_ttl: float | None = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """
+        캐시에 있으면 값, 없거나 만료됐으면 default (기본값: 캐시 미스 표시용 _MISSING)
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+
+        async def load():
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        return await single_flight(self._inflight, key, load)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
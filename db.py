@@ -1,15 +1,115 @@
 import os
+import asyncio
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from metrics import db_queries_total
 
 load_dotenv()
 
+
+def _async_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
 _raw_url = os.getenv("DATABASE_URL", "")
-DATABASE_URL = _raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+DATABASE_URL = _async_url(_raw_url)
+# 읽기 전용 조회(교수님/수업 식별, 파싱 캐시)를 보낼 레플리카. 없으면 primary 사용
+DATABASE_READ_URL = _async_url(os.getenv("DATABASE_READ_URL", ""))
+
+# 커넥션 풀 (엔진마다 따로 적용)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# 이 시간(초)보다 오래된 커넥션은 새로 연결 (LB/방화벽 idle timeout 대비)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# 커넥션당 asyncpg prepared statement 캐시 크기. pgbouncer transaction 모드 뒤라면 0
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+# 시작 시 미리 열어둘 커넥션 수 (첫 요청들이 연결 비용을 내지 않도록)
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", str(min(DB_POOL_SIZE, 5))))
+
+
+def _create_engine(url: str, read_only: bool = False) -> AsyncEngine:
+    connect_args = {"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE}
+    if DB_STATEMENT_CACHE_SIZE == 0:
+        # pgbouncer: asyncpg 자체 statement 캐시도 끔
+        connect_args["statement_cache_size"] = 0
+    if read_only:
+        # 레플리카 세션에서 실수로 쓰기를 하면 바로 에러
+        connect_args["server_settings"] = {"default_transaction_read_only": "on"}
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def _count_round_trips(target: AsyncEngine, name: str):
+    """db_queries_total: 문장 실행 + BEGIN/COMMIT/ROLLBACK (이벤트당 DB 왕복 수 측정용)"""
+
+    def count(*_):
+        db_queries_total.inc(engine=name)
+
+    for event_name in ("before_cursor_execute", "begin", "commit", "rollback"):
+        event.listen(target.sync_engine, event_name, count)
+
+
+engine = _create_engine(DATABASE_URL)
+read_engine = _create_engine(DATABASE_READ_URL, read_only=True) if DATABASE_READ_URL else engine
+_count_round_trips(engine, "primary")
+if read_engine is not engine:
+    _count_round_trips(read_engine, "replica")
 
-engine = create_async_engine(DATABASE_URL, echo=False)
 AsyncSessionFactory = async_sessionmaker(engine, expire_on_commit=False)
+ReadSessionFactory = async_sessionmaker(read_engine, expire_on_commit=False)
 
 
 def get_session() -> AsyncSession:
     return AsyncSessionFactory()
+
+
+def get_read_session() -> AsyncSession:
+    """
+    조회 전용 세션. DATABASE_READ_URL이 있으면 레플리카로 감.
+    레플리카 지연이 있으므로 방금 쓴 값을 바로 읽어야 하는 곳에는 get_session 사용
+    """
+    return ReadSessionFactory()
+
+
+async def warm_up(connections: int = DB_WARMUP_CONNECTIONS):
+    """엔진마다 커넥션 N개를 동시에 열어 풀에 채워둠"""
+
+    async def ping(target: AsyncEngine):
+        async with target.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    engines = [engine] if read_engine is engine else [engine, read_engine]
+    await asyncio.gather(*[ping(target) for target in engines for _ in range(max(connections, 1))])
+
+
+async def dispose():
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+def pool_stats() -> dict:
+    def describe(target: AsyncEngine) -> dict:
+        pool = target.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+    return {
+        "primary": describe(engine),
+        "replica": describe(read_engine) if read_engine is not engine else None,
+    }
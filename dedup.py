@@ -0,0 +1,107 @@
+import os
+import asyncio
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from cache import TTLCache
+from db import get_session
+from models import SlackEventReceipt
+from log import get_logger
+
+load_dotenv()
+
+EVENT_DEDUP_CACHE_SIZE = int(os.getenv("EVENT_DEDUP_CACHE_SIZE", "50000"))
+# Slack 재전송은 수 분 안에 끝나므로 메모리에는 1시간, DB에는 하루 보관
+EVENT_DEDUP_TTL = float(os.getenv("EVENT_DEDUP_TTL", "3600"))
+EVENT_DEDUP_RETENTION_HOURS = float(os.getenv("EVENT_DEDUP_RETENTION_HOURS", "24"))
+EVENT_DEDUP_PURGE_INTERVAL = float(os.getenv("EVENT_DEDUP_PURGE_INTERVAL", "3600"))
+
+log = get_logger("dedup")
+
+
+class EventDeduplicator:
+    """
+    event_id 기준 멱등성 보장.
+    - 이 프로세스가 이미 받은 event_id → 메모리 LRU에서 바로 판정
+    - 다른 uvicorn 워커가 받았을 수도 있는 event_id → slack_event_receipt PK로 판정
+    """
+
+    def __init__(self):
+        self._seen = TTLCache("event_dedup", EVENT_DEDUP_CACHE_SIZE, EVENT_DEDUP_TTL)
+        self.accepted = 0
+        self.duplicates = 0
+        self.db_errors = 0
+
+    async def claim(self, event_id: str | None) -> bool:
+        """처음 받은 이벤트면 True (처리 대상), 이미 받은 이벤트면 False"""
+        if not event_id:
+            return True
+
+        if self._seen.get(event_id, None) is not None:
+            self.duplicates += 1
+            return False
+
+        try:
+            async with get_session() as session:
+                inserted = await session.scalar(
+                    insert(SlackEventReceipt)
+                    .values(event_id=event_id)
+                    .on_conflict_do_nothing(index_elements=[SlackEventReceipt.event_id])
+                    .returning(SlackEventReceipt.event_id)
+                )
+                await session.commit()
+        except Exception as e:
+            # DB 장애 시에도 이벤트는 받아야 함 → 이 프로세스 안에서만 중복 제거
+            self.db_errors += 1
+            log.error("dedup claim failed", event_id=event_id, error=str(e))
+            inserted = event_id
+
+        self._seen.set(event_id, True)
+        if inserted is None:
+            self.duplicates += 1
+            return False
+
+        self.accepted += 1
+        return True
+
+    async def release(self, event_id: str | None):
+        """claim했지만 처리를 맡지 못한 이벤트 (큐 가득 참 등) → Slack 재전송 때 다시 처리되도록 해제"""
+        if not event_id:
+            return
+        self._seen.invalidate(event_id)
+        try:
+            async with get_session() as session:
+                await session.execute(delete(SlackEventReceipt).where(SlackEventReceipt.event_id == event_id))
+                await session.commit()
+        except Exception as e:
+            self.db_errors += 1
+            log.error("dedup release failed", event_id=event_id, error=str(e))
+
+    async def purge_expired(self):
+        cutoff = datetime.utcnow() - timedelta(hours=EVENT_DEDUP_RETENTION_HOURS)
+        async with get_session() as session:
+            result = await session.execute(delete(SlackEventReceipt).where(SlackEventReceipt.received_at < cutoff))
+            await session.commit()
+        if result.rowcount:
+            log.info("dedup receipts purged", count=result.rowcount)
+
+    async def run_purger(self):
+        """lifespan에서 백그라운드 태스크로 실행"""
+        while True:
+            await asyncio.sleep(EVENT_DEDUP_PURGE_INTERVAL)
+            try:
+                await self.purge_expired()
+            except Exception as e:
+                log.error("dedup purge failed", error=str(e))
+
+    def stats(self) -> dict:
+        return {
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "db_errors": self.db_errors,
+            "memory_size": self._seen.stats()["size"],
+        }
+
+
+dedup = EventDeduplicator()
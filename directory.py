@@ -0,0 +1,113 @@
+import os
+import time
+import asyncio
+from dotenv import load_dotenv
+from cache import TTLCache
+from log import get_logger
+from slack_api import SlackClient, SlackApiError, slack
+
+load_dotenv()
+
+# 채널별 사람 멤버 목록 캐시
+MEMBER_DIRECTORY_TTL = float(os.getenv("MEMBER_DIRECTORY_TTL", "600"))
+MEMBER_DIRECTORY_CHANNELS = int(os.getenv("MEMBER_DIRECTORY_CHANNELS", "500"))
+# users.list로 받아둔 워크스페이스 유저 정보 유효 시간
+MEMBER_DIRECTORY_USERS_TTL = float(os.getenv("MEMBER_DIRECTORY_USERS_TTL", "3600"))
+# 모르는 유저가 이 수보다 많으면 users.info 여러 번 대신 users.list 한 번으로 받아옴
+MEMBER_DIRECTORY_BULK_THRESHOLD = int(os.getenv("MEMBER_DIRECTORY_BULK_THRESHOLD", "20"))
+SLACK_USERS_INFO_CONCURRENCY = int(os.getenv("SLACK_USERS_INFO_CONCURRENCY", "10"))
+
+log = get_logger("directory")
+
+
+def _is_human(user: dict) -> bool:
+    # 봇/앱 제외
+    return not (user.get("is_bot") or user.get("is_app_user") or user.get("id") == "USLACKBOT")
+
+
+class MemberDirectory:
+    """
+    채널 멤버 디렉터리.
+    - conversations.members 커서 페이지네이션 (큰 채널도 잘리지 않음)
+    - users.list 일괄 조회 + 동시 호출 수 제한 users.info 보충
+    - Slack 호출은 공용 SlackClient (레이트 리밋, 429 재시도, 중복 호출 합치기)
+    - 채널별 사람 멤버 목록 TTL 캐시, member_joined/left 이벤트로 부분 갱신
+    """
+
+    def __init__(self, client: SlackClient):
+        self.client = client
+        self._users: dict[str, dict] = {}
+        self._users_loaded_at: float | None = None
+        self._channels = TTLCache("channel_members", MEMBER_DIRECTORY_CHANNELS, MEMBER_DIRECTORY_TTL)
+        self._user_semaphore = asyncio.Semaphore(SLACK_USERS_INFO_CONCURRENCY)
+        self._users_lock = asyncio.Lock()
+
+    async def prefetch_users(self):
+        """워크스페이스 전체 유저를 users.list로 한 번에 받아둠"""
+        async with self._users_lock:
+            # 기다리는 동안 다른 요청이 이미 받아왔으면 생략
+            if self._users_fresh():
+                return
+            members = await self.client.paginate("users.list", "members", limit=200)
+            self._users = {user["id"]: user for user in members}
+            self._users_loaded_at = time.monotonic()
+
+    def _users_fresh(self) -> bool:
+        return (
+            self._users_loaded_at is not None
+            and time.monotonic() - self._users_loaded_at < MEMBER_DIRECTORY_USERS_TTL
+        )
+
+    async def _get_user(self, user_id: str) -> dict | None:
+        user = self._users.get(user_id)
+        if user is not None:
+            return user
+        async with self._user_semaphore:
+            try:
+                data = await self.client.get("users.info", user=user_id)
+            except SlackApiError as e:
+                log.warning("users.info failed", user=user_id, error=e.error)
+                return None
+        user = data.get("user", {})
+        self._users[user_id] = user
+        return user
+
+    async def get_human_members(self, channel_id: str) -> list[dict]:
+        cached = self._channels.get(channel_id, None)
+        if cached is not None:
+            return list(cached.values())
+
+        member_ids = await self.client.paginate("conversations.members", "members", channel=channel_id, limit=1000)
+
+        missing = [user_id for user_id in member_ids if user_id not in self._users]
+        if len(missing) > MEMBER_DIRECTORY_BULK_THRESHOLD and not self._users_fresh():
+            await self.prefetch_users()
+
+        users = await asyncio.gather(*[self._get_user(user_id) for user_id in member_ids])
+        humans = {user["id"]: user for user in users if user and _is_human(user)}
+        self._channels.set(channel_id, humans)
+        return list(humans.values())
+
+    async def on_member_joined(self, channel_id: str, user_id: str):
+        """member_joined_channel 이벤트: 캐시된 채널이면 해당 멤버만 추가"""
+        members = self._channels.get(channel_id, None)
+        if members is None:
+            return
+        user = await self._get_user(user_id)
+        if user and _is_human(user):
+            members[user_id] = user
+
+    def on_member_left(self, channel_id: str, user_id: str):
+        """member_left_channel 이벤트: 캐시된 채널이면 해당 멤버만 제거"""
+        members = self._channels.get(channel_id, None)
+        if members is not None:
+            members.pop(user_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "known_users": len(self._users),
+            "channels": self._channels.stats(),
+        }
+
+
+directory = MemberDirectory(slack)
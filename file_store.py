@@ -0,0 +1,200 @@
+import os
+import uuid
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterable
+from dotenv import load_dotenv
+from sqlalchemy import or_, select, update
+from db import get_session
+from models import Submission
+from slack_api import slack, SlackApiError
+from log import get_logger
+
+load_dotenv()
+
+# 제출 파일 로컬 저장소 (SHA-256 내용 주소: {root}/ab/cd/abcd...)
+FILE_STORE_DIR = os.getenv("FILE_STORE_DIR", "data/files")
+FILE_FETCH_CONCURRENCY = int(os.getenv("FILE_FETCH_CONCURRENCY", "4"))
+FILE_FETCH_CHUNK_SIZE = int(os.getenv("FILE_FETCH_CHUNK_SIZE", str(256 * 1024)))
+# 이보다 큰 파일은 받다가 중단
+FILE_MAX_BYTES = int(os.getenv("FILE_MAX_BYTES", str(200 * 1024 * 1024)))
+# 실패(삭제된 파일, 권한 없음 등)가 이 횟수를 넘으면 더 시도하지 않음
+FILE_FETCH_MAX_ATTEMPTS = int(os.getenv("FILE_FETCH_MAX_ATTEMPTS", "5"))
+# 실패 후 재시도 간격: FILE_FETCH_RETRY_BASE초부터 두 배씩 (기본 60초 → 5번째 시도까지 약 15분)
+FILE_FETCH_RETRY_BASE = float(os.getenv("FILE_FETCH_RETRY_BASE", "60"))
+FILE_FETCH_BATCH_SIZE = int(os.getenv("FILE_FETCH_BATCH_SIZE", "50"))
+FILE_FETCH_INTERVAL = float(os.getenv("FILE_FETCH_INTERVAL", "30"))
+
+log = get_logger("file_store")
+
+
+class FileTooLargeError(Exception):
+    pass
+
+
+class FileStore:
+    """
+    내용 주소 파일 저장소.
+    - 받는 동안 임시 파일에 chunk 단위로 쓰면서 SHA-256 계산 (파일 전체를 메모리에 올리지 않음)
+    - 다 받으면 해시 경로로 rename. 같은 내용이 이미 있으면 임시 파일만 지움 (한 번만 저장)
+    - 디스크 쓰기는 스레드에서 (이벤트 루프를 막지 않음)
+    """
+
+    def __init__(self, root: str = FILE_STORE_DIR):
+        self.root = Path(root)
+        self.stored = 0
+        self.deduplicated = 0
+        self.bytes_written = 0
+
+    def path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def exists(self, sha256: str) -> bool:
+        return self.path(sha256).exists()
+
+    async def put_stream(self, chunks: AsyncIterable[bytes], max_bytes: int = FILE_MAX_BYTES) -> tuple[str, int]:
+        """chunk 스트림을 저장하고 (sha256, 크기) 반환"""
+        tmp_dir = self.root / "tmp"
+        await asyncio.to_thread(tmp_dir.mkdir, parents=True, exist_ok=True)
+        tmp_path = tmp_dir / uuid.uuid4().hex
+        digest = hashlib.sha256()
+        size = 0
+
+        def write(f, chunk: bytes):
+            digest.update(chunk)
+            f.write(chunk)
+
+        f = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise FileTooLargeError(f"{size} bytes > {max_bytes}")
+                await asyncio.to_thread(write, f, chunk)
+            await asyncio.to_thread(f.close)
+
+            sha256 = digest.hexdigest()
+            created = await asyncio.to_thread(self._commit, tmp_path, self.path(sha256))
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise
+
+        if created:
+            self.stored += 1
+            self.bytes_written += size
+        else:
+            self.deduplicated += 1
+        return sha256, size
+
+    @staticmethod
+    def _commit(tmp_path: Path, final_path: Path) -> bool:
+        if final_path.exists():
+            tmp_path.unlink()
+            return False
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+        # 같은 파일을 동시에 받은 경우에도 rename은 원자적이라 어느 쪽이 이겨도 내용은 같음
+        os.replace(tmp_path, final_path)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "root": str(self.root),
+            "stored": self.stored,
+            "deduplicated": self.deduplicated,
+            "bytes_written": self.bytes_written,
+        }
+
+
+file_store = FileStore()
+
+_semaphore = asyncio.Semaphore(FILE_FETCH_CONCURRENCY)
+fetched = 0
+failed = 0
+
+
+async def fetch_file(url: str) -> tuple[str, int]:
+    """Slack url_private를 받아 저장소에 넣고 (sha256, 크기) 반환. 동시에 FILE_FETCH_CONCURRENCY개까지"""
+    async with _semaphore:
+        return await file_store.put_stream(slack.download(url, FILE_FETCH_CHUNK_SIZE))
+
+
+async def _fetch_submission(submission_id: int, url: str, attempts: int) -> bool:
+    """받았으면 True. 실패하면 시도 횟수를 올리고 다음 시도 시각을 지수 백오프로 늦춤"""
+    global fetched, failed
+
+    try:
+        sha256, size = await fetch_file(url)
+    except Exception as e:
+        failed += 1
+        if isinstance(e, (SlackApiError, FileTooLargeError, OSError)):
+            log.warning("submission file fetch failed", submission_id=submission_id, attempts=attempts + 1, error=str(e))
+        else:
+            # 예상 못 한 오류도 시도 횟수에 포함 → 같은 행을 끝없이 다시 받지 않음
+            log.error("submission file fetch failed", submission_id=submission_id, attempts=attempts + 1, error=repr(e))
+        values = {
+            "file_fetch_attempts": Submission.file_fetch_attempts + 1,
+            "file_fetch_retry_at": datetime.utcnow() + timedelta(seconds=FILE_FETCH_RETRY_BASE * 2 ** attempts),
+        }
+    else:
+        fetched += 1
+        values = {"file_sha256": sha256, "file_size": size}
+
+    async with get_session() as session:
+        await session.execute(update(Submission).where(Submission.submission_id == submission_id).values(**values))
+        await session.commit()
+    return "file_sha256" in values
+
+
+async def fetch_pending_files(batch_size: int = FILE_FETCH_BATCH_SIZE) -> int:
+    """
+    아직 로컬에 없는 제출 파일을 받음. 처리한 제출 수 반환.
+    배치 전체가 실패하면(Slack 장애 등) 이번 회차는 멈추고 다음 주기에 다시 시도.
+    """
+    total = 0
+    while True:
+        async with get_session() as session:
+            rows = (await session.execute(
+                select(Submission.submission_id, Submission.file_url, Submission.file_fetch_attempts)
+                .where(
+                    Submission.file_url.is_not(None),
+                    Submission.file_sha256.is_(None),
+                    Submission.file_fetch_attempts < FILE_FETCH_MAX_ATTEMPTS,
+                    or_(Submission.file_fetch_retry_at.is_(None), Submission.file_fetch_retry_at <= datetime.utcnow()),
+                )
+                .order_by(Submission.submission_id)
+                .limit(batch_size)
+            )).all()
+        if not rows:
+            return total
+
+        results = await asyncio.gather(*[
+            _fetch_submission(row.submission_id, row.file_url, row.file_fetch_attempts) for row in rows
+        ])
+        total += len(rows)
+        if len(rows) < batch_size or not any(results):
+            return total
+
+
+async def run_fetcher(stop: asyncio.Event, wake: asyncio.Event):
+    """processor 데몬에서 백그라운드 태스크로 실행. 제출이 저장되면 wake, 아니어도 FILE_FETCH_INTERVAL마다"""
+    while not stop.is_set():
+        wake.clear()
+        try:
+            count = await fetch_pending_files()
+            if count:
+                log.info("submission files fetched", count=count, **file_store.stats())
+        except Exception as e:
+            log.error("file fetcher failed", error=str(e))
+
+        stop_wait = asyncio.create_task(stop.wait())
+        wake_wait = asyncio.create_task(wake.wait())
+        _, pending = await asyncio.wait({stop_wait, wake_wait}, timeout=FILE_FETCH_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+
+def stats() -> dict:
+    return {**file_store.stats(), "fetched": fetched, "failed": failed}
@@ -0,0 +1,85 @@
+import os
+import uuid
+from dotenv import load_dotenv
+from sqlalchemy import select
+from cache import TTLCache
+from db import get_read_session
+from models import Professor, Class, Student
+
+load_dotenv()
+
+IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", "10000"))
+IDENTITY_CACHE_TTL = float(os.getenv("IDENTITY_CACHE_TTL", "600"))
+# 교수님이 아닌 유저(대부분의 학생 메시지)는 짧게 캐싱 → 가입 직후에도 금방 반영
+IDENTITY_NEGATIVE_TTL = float(os.getenv("IDENTITY_NEGATIVE_TTL", "60"))
+
+# slack_user_id → professor_id (교수님 아니면 None)
+professor_cache = TTLCache("professor", IDENTITY_CACHE_SIZE, IDENTITY_CACHE_TTL, IDENTITY_NEGATIVE_TTL)
+# slack_channel_id → class_id (등록 안 된 채널이면 None)
+class_cache = TTLCache("class", IDENTITY_CACHE_SIZE, IDENTITY_CACHE_TTL, IDENTITY_NEGATIVE_TTL)
+# slack_user_id → student_id (미등록이면 None을 IDENTITY_NEGATIVE_TTL 동안 저장.
+# processor는 None을 미스로 보고 DB에서 다시 찾거나 자동 등록하며, 조회된(커밋된) 학생만 set)
+student_cache = TTLCache("student", IDENTITY_CACHE_SIZE, IDENTITY_CACHE_TTL, IDENTITY_NEGATIVE_TTL)
+
+
+async def get_professor_id(slack_user_id: str | None) -> uuid.UUID | None:
+    if not slack_user_id:
+        return None
+
+    async def load():
+        async with get_read_session() as session:
+            return await session.scalar(
+                select(Professor.professor_id).where(Professor.slack_user_id == slack_user_id)
+            )
+
+    return await professor_cache.get_or_load(slack_user_id, load)
+
+
+async def get_class_id(channel_id: str | None) -> uuid.UUID | None:
+    if not channel_id:
+        return None
+
+    async def load():
+        async with get_read_session() as session:
+            return await session.scalar(
+                select(Class.class_id).where(Class.slack_channel_id == channel_id)
+            )
+
+    return await class_cache.get_or_load(channel_id, load)
+
+
+async def get_student_id(slack_user_id: str | None) -> uuid.UUID | None:
+    if not slack_user_id:
+        return None
+
+    async def load():
+        async with get_read_session() as session:
+            return await session.scalar(
+                select(Student.student_id).where(Student.slack_user_id == slack_user_id)
+            )
+
+    return await student_cache.get_or_load(slack_user_id, load)
+
+
+def invalidate_user(slack_user_id: str):
+    """가입/관리자 변경 시 호출: 해당 유저의 교수님·학생 캐시 제거"""
+    professor_cache.invalidate(slack_user_id)
+    student_cache.invalidate(slack_user_id)
+
+
+def invalidate_channel(channel_id: str):
+    class_cache.invalidate(channel_id)
+
+
+def invalidate_all():
+    professor_cache.clear()
+    class_cache.clear()
+    student_cache.clear()
+
+
+def stats() -> dict:
+    return {
+        "professor": professor_cache.stats(),
+        "class": class_cache.stats(),
+        "student": student_cache.stats(),
+    }
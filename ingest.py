@@ -0,0 +1,80 @@
+import json
+import time
+from sqlalchemy import text
+from db import get_session
+
+# processor 데몬이 LISTEN하는 채널 (slack_events INSERT 시 트리거가 NOTIFY)
+NOTIFY_CHANNEL = "slack_events_new"
+
+# 트리거는 migrations/0005 (문장 단위 트리거라 배치 INSERT여도 NOTIFY는 한 번)
+
+# slack_events는 event_time 기준 월별 파티션 (migrations/0005). 첨부 파일은 slack_event_files에 한 행씩.
+# 이벤트 + 파일을 한 문장(한 번의 왕복)으로 저장, 이미 있는 이벤트는 파일도 건너뜀
+_INSERT_EVENTS_SQL = text("""
+    WITH input AS (
+        SELECT DISTINCT ON (event_id) *
+        FROM jsonb_to_recordset(CAST(:events AS jsonb)) AS e(
+            event_id text, event_type text, event_subtype text,
+            team_id text, channel_id text, user_id text,
+            text text, ts text, thread_ts text, event_time bigint,
+            files jsonb, raw_payload jsonb
+        )
+    ), inserted AS (
+        INSERT INTO slack_events (
+            event_id, event_type, event_subtype,
+            team_id, channel_id, user_id,
+            text, ts, thread_ts, event_time,
+            raw_payload
+        )
+        SELECT event_id, event_type, event_subtype,
+               team_id, channel_id, user_id,
+               text, ts, thread_ts, event_time,
+               raw_payload
+        FROM input
+        ON CONFLICT (event_id, event_time) DO NOTHING
+        RETURNING id, event_id, event_time
+    )
+    INSERT INTO slack_event_files (event_row_id, event_time, position, file_id, name, mimetype, url)
+    SELECT i.id, i.event_time, f.position - 1, f.file ->> 'id', f.file ->> 'name', f.file ->> 'mimetype', f.file ->> 'url_private'
+    FROM inserted i
+    JOIN input USING (event_id)
+    CROSS JOIN LATERAL jsonb_array_elements(input.files) WITH ORDINALITY AS f(file, position)
+""")
+
+# 전송용 필드: 이벤트 재처리에 필요 없고 token은 저장하면 안 됨
+_DROPPED_PAYLOAD_FIELDS = ("token", "authorizations", "authed_users", "event_context")
+
+
+def _event_params(body: dict) -> dict:
+    event = body.get("event", {})
+    return {
+        "event_id": body.get("event_id"),
+        "event_type": event.get("type"),
+        "event_subtype": event.get("subtype"),
+        "team_id": body.get("team_id"),
+        "channel_id": event.get("channel"),
+        "user_id": event.get("user"),
+        "text": event.get("text"),
+        "ts": event.get("ts"),
+        "thread_ts": event.get("thread_ts"),
+        # 파티션 키라 비어 있으면 안 됨
+        "event_time": body.get("event_time") or int(float(event.get("ts") or time.time())),
+        "files": [
+            {key: f.get(key) for key in ("id", "name", "mimetype", "url_private")}
+            for f in event.get("files", [])
+        ],
+        "raw_payload": {key: value for key, value in body.items() if key not in _DROPPED_PAYLOAD_FIELDS},
+    }
+
+
+async def store_events(bodies: list[dict]):
+    """event_callback 본문들을 slack_events에 저장 (이미 있는 event_id는 무시)"""
+    if not bodies:
+        return
+    async with get_session() as session:
+        await session.execute(_INSERT_EVENTS_SQL, {"events": json.dumps([_event_params(body) for body in bodies], ensure_ascii=False)})
+        await session.commit()
+
+
+async def store_event(body: dict):
+    await store_events([body])
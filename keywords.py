@@ -0,0 +1,102 @@
+import os
+import re
+import json
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 채널별 키워드/가중치 설정 파일 (JSON)
+# {"default": {"과제": 1.0, ...}, "channels": {"C0123": {"실습": 1.0, "발표": 0.3}}}
+# 채널 설정은 default에 덧붙여지고, 같은 키워드는 채널 가중치로 덮어씀
+KEYWORDS_CONFIG_PATH = os.getenv("KEYWORDS_CONFIG_PATH")
+# 점수가 이 값 이상이면 과제 공지 후보 → LLM 파싱
+KEYWORD_SCORE_THRESHOLD = float(os.getenv("KEYWORD_SCORE_THRESHOLD", "1.0"))
+# 이 값 이상 ~ THRESHOLD 미만은 애매한 메시지 → LLM 호출 없이 따로 기록
+KEYWORD_BORDERLINE_THRESHOLD = float(os.getenv("KEYWORD_BORDERLINE_THRESHOLD", "0.5"))
+
+DEFAULT_KEYWORDS = {
+    "과제": 1.0, "제출": 1.0, "마감": 1.0, "assignment": 1.0, "submit": 1.0, "deadline": 1.0,
+    "homework": 1.0, "프로젝트": 1.0, "보고서": 1.0, "발표": 1.0,
+}
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    keywords: tuple[str, ...]
+    score: float
+
+    @property
+    def route(self) -> str:
+        """assignment: LLM 파싱 / borderline: 애매함 / none: 무관"""
+        if self.keywords and self.score >= KEYWORD_SCORE_THRESHOLD:
+            return "assignment"
+        if self.keywords and self.score >= KEYWORD_BORDERLINE_THRESHOLD:
+            return "borderline"
+        return "none"
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """
+    키워드를 접두사 트리로 묶은 정규식 (예: 제출|제출물|제목 → 제(?:출(?:물)?|목)).
+    위치마다 키워드 수만큼 시도하지 않고 트리를 한 번 따라가므로 키워드가 늘어도 거의 일정한 속도.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        ends_here = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends_here:
+            # 더 긴 키워드를 먼저 시도하고, 없으면 여기서 끝난 키워드로 매칭
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """여러 키워드를 한 번에 찾는 컴파일된 매처. 매칭된 키워드와 가중치 합계를 반환"""
+
+    def __init__(self, weights: dict[str, float]):
+        self.weights = {kw.lower(): w for kw, w in weights.items() if kw}
+        # re.IGNORECASE는 유니코드에서 느림 → 텍스트를 소문자로 바꾼 뒤 매칭
+        self._pattern = re.compile(_trie_pattern(list(self.weights))) if self.weights else None
+
+    def match(self, text: str | None) -> KeywordMatch:
+        if not text or self._pattern is None:
+            return KeywordMatch((), 0.0)
+
+        keywords = tuple(dict.fromkeys(self._pattern.findall(text.lower())))
+        return KeywordMatch(keywords, sum((self.weights[kw] for kw in keywords), 0.0))
+
+
+def _load_config() -> dict:
+    if not KEYWORDS_CONFIG_PATH:
+        return {}
+    with open(KEYWORDS_CONFIG_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_config = _load_config()
+_default_weights = {**DEFAULT_KEYWORDS, **_config.get("default", {})}
+_default_matcher = KeywordMatcher(_default_weights)
+_channel_matchers = {
+    channel_id: KeywordMatcher({**_default_weights, **weights})
+    for channel_id, weights in _config.get("channels", {}).items()
+}
+
+
+def matcher_for(channel_id: str | None) -> KeywordMatcher:
+    return _channel_matchers.get(channel_id, _default_matcher)
+
+
+def classify(text: str | None, channel_id: str | None = None) -> KeywordMatch:
+    return matcher_for(channel_id).match(text)
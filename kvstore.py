@@ -0,0 +1,181 @@
+import os
+import time
+import asyncio
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any
+from dotenv import load_dotenv
+from sqlalchemy import select, delete, or_
+from sqlalchemy.dialects.postgresql import insert
+from db import get_session
+from models import KVEntry
+from log import get_logger
+
+load_dotenv()
+
+# memory: 프로세스 하나일 때 / postgres: uvicorn 워커·인스턴스 여러 개가 같은 값을 봐야 할 때
+KV_STORE_BACKEND = os.getenv("KV_STORE_BACKEND", "memory")
+KV_MEMORY_MAX_ENTRIES = int(os.getenv("KV_MEMORY_MAX_ENTRIES", "100000"))
+KV_SWEEP_INTERVAL = float(os.getenv("KV_SWEEP_INTERVAL", "60"))
+
+log = get_logger("kvstore")
+
+
+class KVStore(ABC):
+    """
+    만료 시간이 있는 key-value 저장소 인터페이스.
+    값은 JSON으로 직렬화 가능한 것만. ttl=None이면 만료 없음.
+    구현이 빠진 백엔드는 생성 시점에 TypeError.
+    """
+
+    _sweeper: asyncio.Task | None = None
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None = None):
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    async def pop(self, key: str) -> Any | None:
+        """값을 꺼내면서 삭제. 여러 워커가 동시에 꺼내도 한 곳만 값을 받음 (1회용 코드/토큰)"""
+        ...
+
+    @abstractmethod
+    async def sweep(self) -> int:
+        """만료된 항목 삭제, 삭제한 개수 반환"""
+        ...
+
+    async def start(self):
+        self._sweeper = asyncio.create_task(self._run_sweeper())
+
+    async def close(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    async def _run_sweeper(self):
+        while True:
+            await asyncio.sleep(KV_SWEEP_INTERVAL)
+            try:
+                removed = await self.sweep()
+                if removed:
+                    log.debug("expired entries swept", removed=removed)
+            except Exception as e:
+                log.error("sweep failed", error=str(e))
+
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__}
+
+
+class MemoryKVStore(KVStore):
+    """프로세스 내 저장소. 조회 시 만료 확인 + 주기적 sweep, 최대 개수 넘으면 오래된 것부터 버림"""
+
+    def __init__(self, maxsize: int = KV_MEMORY_MAX_ENTRIES):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.evicted = 0
+
+    def _live(self, key: str) -> tuple[float, Any] | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._live(key)
+        return None if entry is None else entry[1]
+
+    async def set(self, key: str, value: Any, ttl: float | None = None):
+        expires_at = float("inf") if ttl is None else time.monotonic() + ttl
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evicted += 1
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    async def pop(self, key: str) -> Any | None:
+        entry = self._live(key)
+        if entry is None:
+            return None
+        del self._data[key]
+        return entry[1]
+
+    async def sweep(self) -> int:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._data), "maxsize": self.maxsize, "evicted": self.evicted}
+
+
+class PostgresKVStore(KVStore):
+    """kv_store 테이블 기반. 모든 워커가 같은 값을 보고, 만료된 행은 조회에서 제외 + 주기적 삭제"""
+
+    @staticmethod
+    def _not_expired(now: datetime):
+        return or_(KVEntry.expires_at.is_(None), KVEntry.expires_at > now)
+
+    async def get(self, key: str) -> Any | None:
+        async with get_session() as session:
+            return await session.scalar(
+                select(KVEntry.value).where(KVEntry.key == key, self._not_expired(datetime.utcnow()))
+            )
+
+    async def set(self, key: str, value: Any, ttl: float | None = None):
+        expires_at = None if ttl is None else datetime.utcnow() + timedelta(seconds=ttl)
+        stmt = insert(KVEntry).values(key=key, value=value, expires_at=expires_at)
+        async with get_session() as session:
+            await session.execute(stmt.on_conflict_do_update(
+                index_elements=[KVEntry.key],
+                set_={"value": stmt.excluded.value, "expires_at": stmt.excluded.expires_at},
+            ))
+            await session.commit()
+
+    async def delete(self, key: str):
+        async with get_session() as session:
+            await session.execute(delete(KVEntry).where(KVEntry.key == key))
+            await session.commit()
+
+    async def pop(self, key: str) -> Any | None:
+        async with get_session() as session:
+            value = await session.scalar(
+                delete(KVEntry)
+                .where(KVEntry.key == key, self._not_expired(datetime.utcnow()))
+                .returning(KVEntry.value)
+            )
+            await session.commit()
+        return value
+
+    async def sweep(self) -> int:
+        async with get_session() as session:
+            result = await session.execute(delete(KVEntry).where(KVEntry.expires_at < datetime.utcnow()))
+            await session.commit()
+        return result.rowcount
+
+
+def create_store(backend: str = KV_STORE_BACKEND) -> KVStore:
+    if backend == "memory":
+        return MemoryKVStore()
+    if backend == "postgres":
+        return PostgresKVStore()
+    raise ValueError(f"알 수 없는 KV_STORE_BACKEND: {backend}")
+
+
+kv_store = create_store()
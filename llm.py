@@ -1,16 +1,185 @@
 import os
 import json
+import time
+import random
+import asyncio
+from datetime import datetime
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
+import parse_cache
+from log import get_logger
 
 load_dotenv()
 
-# ── LLM 제공자 교체 시 이 함수만 수정 ──────────────────────────────────────
-def _get_model():
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    return genai.GenerativeModel("gemini-2.5-flash")
+MODEL_NAME = "gemini-2.5-flash"
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+# 배치 파싱: 한 번의 호출에 넣을 추정 토큰 수(입력 + 출력)와 최대 공지 수
+LLM_BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "8000"))
+LLM_BATCH_MAX_ITEMS = int(os.getenv("LLM_BATCH_MAX_ITEMS", "25"))
+
+log = get_logger("llm")
+
+# 429 / 5xx / 타임아웃만 재시도. 400(잘못된 요청) 등은 재시도해도 같은 결과
+_RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServerError,
+    google_exceptions.DeadlineExceeded,
+    asyncio.TimeoutError,
+)
+
+
+class LLMUnavailableError(Exception):
+    """회로 차단 중이거나 재시도를 모두 소진함"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 threshold번 쌓이면 cooldown 동안 호출 자체를 차단(open).
+    cooldown 후에는 한 번만 시험 호출(half-open) → 성공하면 다시 closed.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> str | None:
+        """
+        호출해도 되면 허가 표시("call", half-open 시험 호출이면 "probe"), 차단 중이면 None.
+        결과를 record_success/record_failure/release에 같은 표시와 함께 알려야 함
+        """
+        state = self.state
+        if state == "closed":
+            return "call"
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return "probe"
+        return None
+
+    def record_success(self, token: str):
+        self.failures = 0
+        self.opened_at = None
+        if token == "probe":
+            self._probing = False
+
+    def record_failure(self, token: str):
+        self.failures += 1
+        if token == "probe" or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        if token == "probe":
+            self._probing = False
+
+    def release(self, token: str):
+        """결과를 알 수 없는 호출(취소, 잘못된 요청): 상태는 그대로, 시험 호출이었으면 자리만 반납"""
+        if token == "probe":
+            self._probing = False
+
+
+# ── LLM 제공자 교체 시 이 클래스만 수정 ────────────────────────────────────
+class GeminiClient:
+    """
+    앱 시작 시 한 번만 생성하는 Gemini 클라이언트.
+    비동기 API 사용 + 동시 호출 수 제한 + 호출별 타임아웃 + 지터 재시도 + 회로 차단.
+    """
+
+    def __init__(self):
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        self._model = genai.GenerativeModel(MODEL_NAME)
+        self._semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        self.breaker = CircuitBreaker(LLM_BREAKER_THRESHOLD, LLM_BREAKER_COOLDOWN)
+
+        self.in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+
+    async def generate(self, prompt: str) -> str:
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            token = self.breaker.allow()
+            if token is None:
+                self.rejected += 1
+                raise LLMUnavailableError(f"LLM 회로 차단 중 (연속 실패 {self.breaker.failures}회)")
+
+            try:
+                async with self._semaphore:
+                    self.in_flight += 1
+                    self.calls += 1
+                    try:
+                        response = await asyncio.wait_for(
+                            self._model.generate_content_async(prompt),
+                            timeout=LLM_TIMEOUT,
+                        )
+                    finally:
+                        self.in_flight -= 1
+            except _RETRYABLE_ERRORS as e:
+                self.breaker.record_failure(token)
+                if attempt == LLM_MAX_RETRIES:
+                    self.failures += 1
+                    raise LLMUnavailableError(f"LLM 호출 실패 ({attempt + 1}회 시도): {e!r}") from e
+
+                # full jitter: 0 ~ base * 2^attempt 사이에서 무작위 대기
+                self.retries += 1
+                await asyncio.sleep(random.uniform(0, LLM_RETRY_BASE_DELAY * 2 ** attempt))
+                continue
+            except asyncio.CancelledError:
+                # 클라이언트 연결 끊김/종료로 취소 → 시험 호출이었다면 자리를 돌려놔야 회로가 다시 시험함
+                self.breaker.release(token)
+                raise
+            except Exception:
+                # 재시도 대상이 아닌 오류(400 등)는 장애도 정상 응답도 아님 → 회로에 반영하지 않음
+                self.breaker.release(token)
+                self.failures += 1
+                raise
+
+            self.breaker.record_success(token)
+            return response.text
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": LLM_MAX_CONCURRENCY,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "breaker": self.breaker.state,
+        }
 # ────────────────────────────────────────────────────────────────────────────
 
+_client: GeminiClient | None = None
+
+
+def init_client() -> GeminiClient:
+    """lifespan에서 호출. processor CLI처럼 lifespan 없이 쓰면 첫 호출 때 생성"""
+    global _client
+    if _client is None:
+        _client = GeminiClient()
+    return _client
+
+
+def get_client() -> GeminiClient:
+    return _client if _client is not None else init_client()
+
+
 PROMPT_TEMPLATE = """
 다음은 교육 플랫폼 슬랙 채널에 올라온 교수님의 과제 공지 메시지야.
 아래 JSON 형식으로만 응답해. 다른 텍스트는 절대 포함하지 마.
@@ -27,17 +196,166 @@ PROMPT_TEMPLATE = """
 {text}
 """
 
-async def parse_announcement(text: str) -> dict:
-    model = _get_model()
-    prompt = PROMPT_TEMPLATE.format(text=text)
+BATCH_PROMPT_TEMPLATE = """
+다음은 교육 플랫폼 슬랙 채널에 올라온 교수님의 과제 공지 메시지 목록이야.
+각 공지는 "ts"로 구분돼. 공지마다 아래 형식의 객체를 만들어 JSON 배열로만 응답해.
+다른 텍스트는 절대 포함하지 마. "ts"는 입력값을 그대로 돌려줘.
 
-    response = model.generate_content(prompt)
-    raw = response.text.strip()
+[
+  {{
+    "ts": "입력 ts 그대로",
+    "title": "과제 제목 (간결하게 한 문장)",
+    "content": "공지 전체 내용 원문",
+    "deadline": 마감일이 텍스트에 없으면, null,
+    "topic": "과제 주제/분야 (예: 머신러닝, 데이터분석 등)",
+    "requirements": ["요구사항1", "요구사항2", "..."]
+  }}
+]
+
+공지 메시지 목록 (JSON):
+{items}
+"""
 
+
+def _strip_code_fence(raw: str) -> str:
     # 마크다운 코드블록 제거
+    raw = raw.strip()
     if raw.startswith("```"):
         raw = raw.split("```")[1]
         if raw.startswith("json"):
             raw = raw[4:]
+    return raw.strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한글 ≈ 1자 1토큰, 영문 ≈ 4자 1토큰) → UTF-8 바이트 / 3"""
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def is_valid_parse(parsed) -> bool:
+    """save_announcement가 그대로 저장할 수 있는 형태인지 확인"""
+    if not isinstance(parsed, dict):
+        return False
+    if not isinstance(parsed.get("title"), str) or not parsed["title"].strip():
+        return False
+    deadline = parsed.get("deadline")
+    if deadline is not None:
+        if not isinstance(deadline, str):
+            return False
+        try:
+            datetime.fromisoformat(deadline)
+        except ValueError:
+            return False
+    requirements = parsed.get("requirements", [])
+    return isinstance(requirements, list) and all(isinstance(r, str) for r in requirements)
+
+
+async def parse_announcement(text: str) -> dict:
+    # 같은 공지(수정·재게시·여러 채널 동시 게시)는 캐시에서 바로 반환
+    cache_key = parse_cache.make_key(text, PROMPT_TEMPLATE, MODEL_NAME)
+    cached = await parse_cache.get(cache_key)
+    # 검증 없이 저장됐던 예전 항목도 걸러냄 (DB 캐시는 만료되지 않음)
+    if cached is not None and is_valid_parse(cached):
+        return cached
+
+    prompt = PROMPT_TEMPLATE.format(text=text)
+    raw = await get_client().generate(prompt)
+
+    parsed = json.loads(_strip_code_fence(raw))
+    if not is_valid_parse(parsed):
+        # 잘못된 응답을 캐시하면 같은 공지에 영원히 같은 결과가 나가므로 저장하지 않고 실패 처리
+        raise ValueError(f"LLM 응답 형식이 올바르지 않음: {raw[:200]!r}")
+    await parse_cache.put(cache_key, MODEL_NAME, parsed)
+    return parsed
+
+
+def _echoes_text(parsed: dict, text: str) -> bool:
+    content = parsed.get("content")
+    return isinstance(content, str) and parse_cache.normalize_text(content) == parse_cache.normalize_text(text)
+
+
+def _chunk_by_budget(items: list[dict]) -> list[list[dict]]:
+    """
+    토큰 예산에 맞춰 배치 크기를 정함.
+    응답에 content(원문)가 다시 들어오므로 공지 하나당 입력의 약 2배 + 고정 오버헤드로 추정.
+    """
+    overhead = estimate_tokens(BATCH_PROMPT_TEMPLATE)
+    chunks: list[list[dict]] = []
+    current: list[dict] = []
+    used = overhead
+    for item in items:
+        cost = estimate_tokens(item["text"]) * 2 + 100
+        if current and (used + cost > LLM_BATCH_TOKEN_BUDGET or len(current) >= LLM_BATCH_MAX_ITEMS):
+            chunks.append(current)
+            current, used = [], overhead
+        current.append(item)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _parse_chunk(chunk: list[dict]) -> dict[str, dict]:
+    payload = json.dumps([{"ts": item["ts"], "text": item["text"]} for item in chunk], ensure_ascii=False)
+    raw = await get_client().generate(BATCH_PROMPT_TEMPLATE.format(items=payload))
+    try:
+        results = json.loads(_strip_code_fence(raw))
+    except json.JSONDecodeError as e:
+        log.warning("batch parse response invalid, falling back", items=len(chunk), error=str(e))
+        return {}
+    if not isinstance(results, list):
+        return {}
+    return {str(r.get("ts")): r for r in results if isinstance(r, dict)}
+
+
+async def parse_announcements_batch(items: list[dict]) -> dict[str, dict]:
+    """
+    여러 공지를 한 번의 LLM 호출로 파싱 (백필/재처리용).
+    items: [{"ts": str, "text": str}, ...] → {ts: parsed}
+    검증에 실패한 공지만 parse_announcement로 개별 재시도하고, 그래도 실패하면 결과에서 제외.
+    """
+    results: dict[str, dict] = {}
+    pending: list[dict] = []
+
+    for item in items:
+        key = parse_cache.make_key(item["text"], PROMPT_TEMPLATE, MODEL_NAME)
+        cached = await parse_cache.get(key)
+        if cached is not None and is_valid_parse(cached):
+            results[item["ts"]] = cached
+        else:
+            pending.append({**item, "cache_key": key})
+
+    chunks = _chunk_by_budget(pending)
+    chunk_results = await asyncio.gather(*[_parse_chunk(chunk) for chunk in chunks], return_exceptions=True)
+
+    fallback: list[dict] = []
+    for chunk, parsed_by_ts in zip(chunks, chunk_results):
+        if isinstance(parsed_by_ts, Exception):
+            log.warning("batch parse call failed, falling back", items=len(chunk), error=str(parsed_by_ts))
+            parsed_by_ts = {}
+        for item in chunk:
+            parsed = parsed_by_ts.get(item["ts"])
+            # ts만으로 짝을 지으면 모델이 ts를 바꿔 달았을 때 다른 공지의 결과가 이 공지 키로 영구 캐시됨
+            # → 돌려준 원문(content)이 입력과 같을 때만 받아들이고, 아니면 개별 파싱
+            if not is_valid_parse(parsed) or not _echoes_text(parsed, item["text"]):
+                fallback.append(item)
+                continue
+            parsed.pop("ts", None)
+            results[item["ts"]] = parsed
+            # 배치 프롬프트도 단건과 같은 스키마를 요구하므로 단건 키로 저장 → 실시간 경로와 캐시 공유
+            await parse_cache.put(item["cache_key"], MODEL_NAME, parsed)
+
+    if fallback:
+        log.info("batch parse retrying invalid items", items=len(fallback))
+        retried = await asyncio.gather(
+            *[parse_announcement(item["text"]) for item in fallback],
+            return_exceptions=True,
+        )
+        for item, parsed in zip(fallback, retried):
+            if isinstance(parsed, Exception):
+                log.error("parse failed", ts=item["ts"], error=str(parsed))
+                continue
+            results[item["ts"]] = parsed
 
-    return json.loads(raw.strip())
+    log.info("batch parsed", items=len(items), cached=len(items) - len(pending), batch_calls=len(chunks), fallback=len(fallback))
+    return results
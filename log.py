@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import queue
+import random
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# 값이 로그에 남으면 안 되는 필드 (중첩 dict/list 안까지 적용)
+LOG_REDACT_FIELDS = {
+    f.strip() for f in os.getenv("LOG_REDACT_FIELDS", "text,email,password,code,token,temp_token,body").split(",") if f.strip()
+}
+# 카테고리별 DEBUG 로그 샘플링 비율, 예: "payload:0,member:0.01"
+LOG_SAMPLE_RATES = {
+    category.strip(): float(rate)
+    for category, rate in (
+        item.split(":", 1) for item in os.getenv("LOG_SAMPLE_RATES", "").split(",") if ":" in item
+    )
+}
+
+_REDACTED = "[REDACTED]"
+# 포맷터가 채우는 키. 같은 이름의 호출자 필드(예: Slack 메시지 ts)는 field_ 접두어를 붙여 남김
+_RESERVED_KEYS = ("ts", "level", "category", "msg", "exc")
+
+
+def redact(value):
+    if isinstance(value, dict):
+        return {k: _REDACTED if k in LOG_REDACT_FIELDS and v is not None else redact(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드 하나 = JSON 한 줄"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "category": record.name.removeprefix("app."),
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            for key, value in redact(fields).items():
+                payload[f"field_{key}" if key in _RESERVED_KEYS else key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    큐가 가득 차면 기다리지 않고 버림 → 로그 때문에 요청 처리가 막히지 않음.
+    JSON 직렬화는 리스너 스레드에서 하도록 prepare에서 포맷하지 않음.
+    """
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def setup_logging():
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    root = logging.getLogger("app")
+    root.setLevel(LOG_LEVEL)
+    root.propagate = False
+    root.handlers = [_DroppingQueueHandler(log_queue)]
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """남은 로그를 모두 출력하고 리스너 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class StructLogger:
+    """
+    카테고리별 구조화 로거.
+        log = get_logger("webhook")
+        log.info("event received", event_id=..., channel=...)
+    """
+
+    def __init__(self, category: str):
+        self.category = category
+        self._logger = logging.getLogger(f"app.{category}")
+        self._sample_rate = LOG_SAMPLE_RATES.get(category, 1.0)
+
+    # level/msg는 위치 전용 → 호출자가 level=, msg= 필드를 넘겨도 인자와 충돌하지 않음
+    def _log(self, level: int, msg: str, /, exc_info=None, **fields):
+        if not self._logger.isEnabledFor(level):
+            return
+        if level <= logging.DEBUG and self._sample_rate < 1.0 and random.random() >= self._sample_rate:
+            return
+        self._logger.log(level, msg, exc_info=exc_info, extra={"fields": fields})
+
+    def debug(self, msg: str, /, **fields):
+        self._log(logging.DEBUG, msg, **fields)
+
+    def info(self, msg: str, /, **fields):
+        self._log(logging.INFO, msg, **fields)
+
+    def warning(self, msg: str, /, **fields):
+        self._log(logging.WARNING, msg, **fields)
+
+    def error(self, msg: str, /, exc_info=None, **fields):
+        self._log(logging.ERROR, msg, exc_info=exc_info, **fields)
+
+
+def get_logger(category: str) -> StructLogger:
+    setup_logging()
+    return StructLogger(category)
+
+
+def dropped_count() -> int:
+    return _DroppingQueueHandler.dropped
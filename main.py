@@ -118,42 +118,66 @@
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from sqlalchemy import select, text
-from db import engine, get_session
-from llm import parse_announcement
-from models import Professor
-from processor import save_announcement
+import db
+from db import engine
+import llm
+import identity
+import parse_cache
+import passwords
+from kvstore import kv_store
+from identity import get_professor_id
+from announcements import handle_announcement
+from ingest import store_event
 from routers.auth import router as auth_router
+from routers.admin import router as admin_router
+from routers.assignments import router as assignments_router
+from worker import event_queue, QueueFullError
+from keywords import classify
+from dedup import dedup
+from directory import directory
+from slack_api import slack, SlackApiError
+from metrics import registry, CallbackMetric, stage_seconds, webhook_seconds, events_total
+from log import get_logger, shutdown_logging, dropped_count
 import json
 import os
+import asyncio
 import hmac
 import hashlib
 import time
-import httpx
-from datetime import datetime, timedelta
 
 
 load_dotenv()
 
 SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
-SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 
-ASSIGNMENT_KEYWORDS = [
-    "과제", "제출", "마감", "assignment", "submit", "deadline",
-    "homework", "프로젝트", "보고서", "발표"
-]
+log = get_logger("main")
+webhook_log = get_logger("webhook")
+# 원본 payload 전체 덤프 (기본 redact, LOG_SAMPLE_RATES="payload:..."로 샘플링)
+payload_log = get_logger("payload")
+member_log = get_logger("member")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.connect() as conn:
-        await conn.execute(text("SELECT 1"))
-    print("[DB] 연결 성공")
+    await db.warm_up()
+    log.info("db connected", warmup_connections=db.DB_WARMUP_CONNECTIONS, replica=db.read_engine is not engine)
+    llm.init_client()
+    await event_queue.start()
+    await slack.start()
+    await kv_store.start()
+    purger = asyncio.create_task(dedup.run_purger())
     yield
-    await engine.dispose()
-    print("[DB] 연결 종료")
+    purger.cancel()
+    await event_queue.drain()
+    await slack.close()
+    await kv_store.close()
+    passwords.shutdown()
+    await db.dispose()
+    log.info("db disconnected")
+    shutdown_logging()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -166,11 +190,32 @@ app.add_middleware(
 )
 
 app.include_router(auth_router)
-
-
-def has_assignment_keyword(text: str) -> bool:
-    text_lower = text.lower()
-    return any(kw in text_lower for kw in ASSIGNMENT_KEYWORDS)
+app.include_router(admin_router)
+app.include_router(assignments_router)
+
+# ── /metrics 게이지: 스크레이프 시점에 읽음 ────────────────────────────────
+registry.gauge("event_queue_depth", "Jobs waiting in the in-process event queue", event_queue.depth)
+registry.gauge("db_pool_checked_out", "DB connections currently checked out", lambda: engine.pool.checkedout())
+registry.gauge("db_pool_size", "Configured DB pool size", lambda: engine.pool.size())
+registry.gauge("db_pool_overflow", "DB connections opened beyond the pool size", lambda: max(engine.pool.overflow(), 0))
+registry.gauge("llm_in_flight", "Gemini calls currently in flight", lambda: llm.get_client().in_flight)
+registry.gauge("llm_breaker_open", "1 if the Gemini circuit breaker is open", lambda: int(llm.get_client().breaker.state == "open"))
+registry.register(CallbackMetric("parse_cache_lookups_total", "LLM parse cache lookups by result", lambda: {
+    "memory_hit": parse_cache.memory_hits, "db_hit": parse_cache.db_hits, "miss": parse_cache.misses,
+}, "counter", ("result",)))
+registry.register(CallbackMetric("llm_calls_total", "Gemini calls by result", lambda: {
+    "call": llm.get_client().calls, "retry": llm.get_client().retries,
+    "failure": llm.get_client().failures, "rejected": llm.get_client().rejected,
+}, "counter", ("result",)))
+registry.register(CallbackMetric("slack_api_calls_total", "Slack Web API calls by result", lambda: {
+    "call": slack.calls, "coalesced": slack.coalesced, "rate_limited": slack.rate_limited,
+    "retry": slack.retries, "error": slack.errors,
+}, "counter", ("result",)))
+registry.register(CallbackMetric("log_records_dropped_total", "Log records dropped because the log queue was full", dropped_count, "counter"))
+
+
+def has_assignment_keyword(text: str, channel_id: str | None = None) -> bool:
+    return classify(text, channel_id).route == "assignment"
 
 
 def verify_slack_signature(body: bytes, timestamp: str, signature: str) -> bool:
@@ -182,7 +227,7 @@ def verify_slack_signature(body: bytes, timestamp: str, signature: str) -> bool:
         base_string.encode(),
         hashlib.sha256
     ).hexdigest()
-    return hmac.compare_digest(expected, signature)
+    return hmac.compare_digest(expected.encode(), signature.encode())
 
 
 @app.get("/")
@@ -190,88 +235,57 @@ async def health_check():
     return {"status": "ok"}
 
 
-async def get_channel_members_info(channel_id: str) -> str:
-    """채널 멤버 목록 조회 및 정보 반환"""
-    headers = {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        "Content-Type": "application/json"
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "db": db.pool_stats(),
+        "event_queue": event_queue.stats(),
+        "identity_cache": identity.stats(),
+        "parse_cache": parse_cache.stats(),
+        "llm": llm.get_client().stats(),
+        "member_directory": directory.stats(),
+        "slack_api": slack.stats(),
+        "event_dedup": dedup.stats(),
+        "password_hasher": passwords.stats(),
+        "kv_store": kv_store.stats(),
     }
 
-    try:
-        async with httpx.AsyncClient() as client:
-            # 1. 채널 멤버 목록 조회
-            members_response = await client.get(
-                "https://slack.com/api/conversations.members",
-                headers=headers,
-                params={"channel": channel_id}
-            )
-            members_data = members_response.json()
-
-            if not members_data.get("ok"):
-                error_msg = f"❌ 멤버 목록 조회 실패: {members_data.get('error')}"
-                print(error_msg)
-                return error_msg
-
-            member_ids = members_data.get("members", [])
-
-            print("\n" + "="*50)
-            print(f"채널 ID       : {channel_id}")
-            print(f"전체 멤버 수  : {len(member_ids)}")
-            print("="*50)
-
-            # 2. 각 멤버의 상세 정보 조회
-            human_members = []
-            for user_id in member_ids:
-                user_response = await client.get(
-                    "https://slack.com/api/users.info",
-                    headers=headers,
-                    params={"user": user_id}
-                )
-                user_data = user_response.json()
-
-                if not user_data.get("ok"):
-                    print(f"⚠️  유저 정보 조회 실패 ({user_id}): {user_data.get('error')}")
-                    continue
-
-                user = user_data.get("user", {})
-
-                # 봇/앱 제외
-                if user.get("is_bot") or user.get("is_app_user"):
-                    continue
-
-                human_members.append(user)
-
-            print(f"\n사람 멤버 수  : {len(human_members)}")
-            print("-"*50)
-
-            # 3. 콘솔 출력
-            result_lines = [f"📋 채널 멤버 목록 (총 {len(human_members)}명)\n"]
-
-            for idx, user in enumerate(human_members, 1):
-                real_name = user.get('real_name', user.get('name', 'Unknown'))
-                username = user.get('name')
-                email = user.get('profile', {}).get('email', 'N/A')
-
-                print(f"\n[{idx}] {real_name}")
-                print(f"    ID         : {user.get('id')}")
-                print(f"    Username   : {username}")
-                print(f"    Email      : {email}")
-                print(f"    Display    : {user.get('profile', {}).get('display_name', 'N/A')}")
-                print(f"    Status     : {user.get('profile', {}).get('status_text', '')}")
-                print(f"    Deleted    : {user.get('deleted', False)}")
-
-                # Slack 응답용 텍스트
-                result_lines.append(f"{idx}. *{real_name}* (@{username})")
-                result_lines.append(f"   Email: {email}\n")
-
-            print("\n" + "="*50 + "\n")
-
-            return "\n".join(result_lines)
 
+async def get_channel_members_info(channel_id: str) -> str:
+    """채널 멤버 목록 조회 및 정보 반환"""
+    try:
+        human_members = await directory.get_human_members(channel_id)
+    except SlackApiError as e:
+        member_log.error("member list failed", channel=channel_id, error=e.error)
+        return f"❌ 멤버 목록 조회 실패: {e.error}"
     except Exception as e:
-        error_msg = f"❌ 에러 발생: {str(e)}"
-        print(error_msg)
-        return error_msg
+        member_log.error("member list failed", channel=channel_id, error=str(e))
+        return f"❌ 에러 발생: {str(e)}"
+
+    member_log.info("member list", channel=channel_id, members=len(human_members))
+
+    result_lines = [f"📋 채널 멤버 목록 (총 {len(human_members)}명)\n"]
+
+    for idx, user in enumerate(human_members, 1):
+        real_name = user.get('real_name', user.get('name', 'Unknown'))
+        username = user.get('name')
+        email = user.get('profile', {}).get('email', 'N/A')
+
+        member_log.debug(
+            "member", channel=channel_id, user=user.get('id'), username=username, email=email,
+            deleted=user.get('deleted', False),
+        )
+
+        # Slack 응답용 텍스트
+        result_lines.append(f"{idx}. *{real_name}* (@{username})")
+        result_lines.append(f"   Email: {email}\n")
+
+    return "\n".join(result_lines)
 
 
 @app.post("/slack/command")
@@ -283,11 +297,7 @@ async def handle_slack_commands(request: Request):
     channel_id = form_data.get("channel_id")
     user_id = form_data.get("user_id")
 
-    print("\n" + "="*50)
-    print(f"Slash Command : {command}")
-    print(f"채널 ID       : {channel_id}")
-    print(f"실행자 ID     : {user_id}")
-    print("="*50)
+    log.info("slash command", command=command, channel=channel_id, user=user_id)
 
     if command == "/userlist":
         result_text = await get_channel_members_info(channel_id)
@@ -305,18 +315,23 @@ async def handle_slack_commands(request: Request):
 
 @app.post("/slack/events")
 async def handle_slack_events(request: Request):
-    if request.headers.get("x-slack-retry-num"):
-        return {"ok": True}
+    with webhook_seconds.time():
+        return await _handle_slack_events(request)
 
+
+async def _handle_slack_events(request: Request):
     body_bytes = await request.body()
     timestamp = request.headers.get("x-slack-request-timestamp", "")
     signature = request.headers.get("x-slack-signature", "")
 
-    if not verify_slack_signature(body_bytes, timestamp, signature):
+    with stage_seconds.time(stage="signature"):
+        valid = verify_slack_signature(body_bytes, timestamp, signature)
+    if not valid:
+        events_total.inc(outcome="invalid_signature")
         raise HTTPException(status_code=403, detail="Invalid signature")
 
     body = json.loads(body_bytes)
-    print("body: ", body)
+    payload_log.debug("payload", body=body)
 
     if body.get("type") == "url_verification":
         return {"challenge": body.get("challenge")}
@@ -327,66 +342,90 @@ async def handle_slack_events(request: Request):
     event = body.get("event", {})
     event_type = event.get("type")
 
+    # 채널 멤버 변동 → 멤버 디렉터리 캐시 부분 갱신 (users.info 호출 가능성 있어 워커에서)
+    if event_type == "member_joined_channel":
+        await _enqueue_or_skip(directory.on_member_joined, event.get("channel"), event.get("user"))
+        return {"ok": True}
+    if event_type == "member_left_channel":
+        directory.on_member_left(event.get("channel"), event.get("user"))
+        return {"ok": True}
+
     # message 이벤트 처리 (기존 로직)
     if event_type != "message":
         return {"ok": True}
 
-    # DB 없이 일단 콘솔에 출력
-    print("\n" + "="*50)
-    print(f"이벤트 ID     : {body.get('event_id')}")
-    print(f"채널          : {event.get('channel')}")
-    print(f"발신자 ID     : {event.get('user')}")
-    print(f"메시지 내용   : {event.get('text')}")
-    print(f"ts            : {event.get('ts')}")
-    print(f"thread_ts     : {event.get('thread_ts')}")
-    print(f"subtype       : {event.get('subtype')}")
-
-    files = event.get("files", [])
-    if files:
-        print(f"첨부 파일 수  : {len(files)}")
-        for f in files:
-            print(f"  - {f.get('name')} ({f.get('mimetype')})")
-
-    # 교수님 여부 확인 (DB 조회)
-    user_id = event.get("user")
-    async with get_session() as session:
-        professor = await session.scalar(
-            select(Professor).where(Professor.slack_user_id == user_id)
-        )
-    is_professor = professor is not None
-
-    is_announcement = not event.get("thread_ts") and is_professor
-    if is_professor:
-        print("판단          :", "교수님 공지 후보" if is_announcement else "학생 제출")
-    else:
-        print("판단          : 교수님 메시지 아님 → 스킵")
-    print("="*50 + "\n")
-
-    if not is_professor:
+    # 이미 받은 event_id(재전송)는 바로 ack, 받지 못했던 이벤트의 재전송은 처리
+    event_id = body.get("event_id")
+    with stage_seconds.time(stage="dedup"):
+        claimed = await dedup.claim(event_id)
+    if not claimed:
+        events_total.inc(outcome="duplicate")
+        webhook_log.info("duplicate event", event_id=event_id, retry=request.headers.get('x-slack-retry-num'))
         return {"ok": True}
 
-    if is_announcement and event.get("text"):
-        if not has_assignment_keyword(event.get("text")):
-            print("[스킵] 과제 관련 키워드 없음")
-            return {"ok": True}
-
-        try:
-            parsed = await parse_announcement(event.get("text"))
-            if not parsed.get('deadline'):
-                ts_value = float(event.get("ts"))
-                base_date = datetime.fromtimestamp(ts_value)
-                calculated_deadline = (base_date + timedelta(days=7)).strftime('%Y-%m-%d')
-                parsed['deadline'] = calculated_deadline
-
-            print("[LLM 파싱 결과]")
-            print(f"  제목        : {parsed.get('title')}")
-            print(f"  주제        : {parsed.get('topic')}")
-            print(f"  마감일      : {parsed.get('deadline')}")
-            print(f"  요구사항    : {parsed.get('requirements')}")
-            print()
-            await save_announcement(event, parsed)
-        except Exception as e:
-            print(f"[처리 실패] {e}")
+    # 이벤트 하나당 로그 한 줄 (메시지 본문은 LOG_REDACT_FIELDS 설정에 따라 가림)
+    webhook_log.info(
+        "event received",
+        event_id=event_id,
+        channel=event.get("channel"),
+        user=event.get("user"),
+        ts=event.get("ts"),
+        thread_ts=event.get("thread_ts"),
+        subtype=event.get("subtype"),
+        text=event.get("text"),
+        text_len=len(event.get("text") or ""),
+        files=[{"name": f.get("name"), "mimetype": f.get("mimetype")} for f in event.get("files", [])],
+    )
+
+    try:
+        with stage_seconds.time(stage="enqueue"):
+            await event_queue.enqueue(process_message_event, body)
+    except QueueFullError as e:
+        # 503 → Slack이 나중에 재전송, 그때 다시 처리되도록 claim 해제
+        events_total.inc(outcome="rejected_queue_full")
+        webhook_log.warning("event rejected", event_id=event_id, reason=str(e))
+        await dedup.release(event_id)
+        raise HTTPException(status_code=503, detail="Event queue is full")
 
     return {"ok": True}
 
+
+async def _enqueue_or_skip(func, *args):
+    # 캐시 갱신은 실패해도 TTL 만료 후 다시 채워지므로 큐가 차면 그냥 버림
+    try:
+        await event_queue.enqueue(func, *args, timeout=0)
+    except QueueFullError:
+        pass
+
+
+async def process_message_event(body: dict):
+    """
+    워커에서 실행
+    - 스레드 댓글(학생 제출 후보) → slack_events 저장 → processor 데몬이 NOTIFY 받고 처리
+    - 교수님 글 → announcements (키워드 필터 → 규칙/LLM 파싱 → 저장)
+    """
+    event = body.get("event", {})
+
+    # 교수님 여부 확인 (identity 캐시 → 미스일 때만 DB 조회)
+    with stage_seconds.time(stage="professor_lookup"):
+        is_professor = await get_professor_id(event.get("user")) is not None
+
+    if event.get("thread_ts") and not is_professor and event.get("user"):
+        log.debug("submission candidate stored", ts=event.get("ts"))
+        with stage_seconds.time(stage="store_event"):
+            await store_event(body)
+        events_total.inc(outcome="stored_submission")
+        return
+
+    is_announcement = not event.get("thread_ts") and is_professor
+    if not is_professor:
+        events_total.inc(outcome="skipped_not_professor")
+        log.debug("skipped: not a professor", ts=event.get("ts"))
+        return
+
+    if not (is_announcement and event.get("text")):
+        log.debug("skipped: professor thread reply", ts=event.get("ts"))
+        events_total.inc(outcome="skipped_other")
+        return
+
+    await handle_announcement(event)
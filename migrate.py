@@ -0,0 +1,127 @@
+"""
+스키마 마이그레이션 실행기.
+
+migrations/NNNN_이름.sql 파일을 번호 순서대로 한 번씩 적용하고 schema_migrations 테이블에 기록한다.
+- 기본은 파일 하나를 트랜잭션 하나로 실행
+- 첫 줄이 "-- migrate: no-transaction"이면 문장(;) 단위로 트랜잭션 없이 실행
+  (CREATE INDEX CONCURRENTLY용. 이런 파일에는 $$ 함수 본문을 넣지 않음)
+- 여러 인스턴스가 동시에 떠도 advisory lock으로 한 곳만 실행
+
+    python migrate.py            # 미적용 마이그레이션 적용
+    python migrate.py --status   # 적용 여부만 출력
+"""
+import re
+import asyncio
+import hashlib
+import argparse
+from pathlib import Path
+from dataclasses import dataclass
+from db import engine
+from log import get_logger
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+# 임의의 고정 키 (pg_advisory_lock)
+_LOCK_KEY = 74_201_016
+_NO_TRANSACTION = "-- migrate: no-transaction"
+
+log = get_logger("migrate")
+
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version    text PRIMARY KEY,
+        name       text NOT NULL,
+        checksum   text NOT NULL,
+        applied_at timestamp NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+    )
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(_NO_TRANSACTION)
+
+    def statements(self) -> list[str]:
+        # 줄 끝의 ; 기준으로 나눔 (no-transaction 파일 전용)
+        parts = re.split(r";\s*$", self.sql, flags=re.MULTILINE)
+        return [part.strip() for part in parts if re.sub(r"--.*", "", part).strip()]
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        version, _, name = path.stem.partition("_")
+        migrations.append(Migration(version, name, path.read_text(encoding="utf-8")))
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"마이그레이션 번호 중복: {versions}")
+    return migrations
+
+
+async def apply_migrations(conn, migrations: list[Migration] | None = None) -> list[str]:
+    """
+    asyncpg 커넥션에 미적용 마이그레이션 적용, 적용한 version 목록 반환.
+    search_path를 바꾼 커넥션을 넘기면 해당 스키마에 적용됨 (benchmarks/bench_indexes.py)
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    await conn.execute(_CREATE_TABLE_SQL)
+    await conn.execute("SELECT pg_advisory_lock($1)", _LOCK_KEY)
+    try:
+        applied = {r["version"]: r["checksum"] for r in await conn.fetch("SELECT version, checksum FROM schema_migrations")}
+        done = []
+        for migration in migrations:
+            if migration.version in applied:
+                if applied[migration.version] != migration.checksum:
+                    log.warning("applied migration was modified", version=migration.version, name=migration.name)
+                continue
+
+            log.info("applying migration", version=migration.version, name=migration.name,
+                     transactional=migration.transactional)
+            record = "INSERT INTO schema_migrations (version, name, checksum) VALUES ($1, $2, $3)"
+            if migration.transactional:
+                async with conn.transaction():
+                    await conn.execute(migration.sql)
+                    await conn.execute(record, migration.version, migration.name, migration.checksum)
+            else:
+                for statement in migration.statements():
+                    await conn.execute(statement)
+                await conn.execute(record, migration.version, migration.name, migration.checksum)
+            done.append(migration.version)
+        return done
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", _LOCK_KEY)
+
+
+async def migration_status(conn) -> list[tuple[Migration, bool]]:
+    await conn.execute(_CREATE_TABLE_SQL)
+    applied = {r["version"] for r in await conn.fetch("SELECT version FROM schema_migrations")}
+    return [(m, m.version in applied) for m in load_migrations()]
+
+
+async def main(status_only: bool = False):
+    async with engine.connect() as sa_conn:
+        raw = await sa_conn.get_raw_connection()
+        conn = raw.driver_connection
+        if status_only:
+            for migration, applied in await migration_status(conn):
+                print(f"{'applied' if applied else 'pending':<8} {migration.version} {migration.name}")
+        else:
+            done = await apply_migrations(conn)
+            log.info("migrations finished", applied=done)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션 적용")
+    parser.add_argument("--status", action="store_true", help="적용 여부만 출력")
+    args = parser.parse_args()
+    asyncio.run(main(args.status))
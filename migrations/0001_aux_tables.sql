@@ -0,0 +1,37 @@
+-- 이 서비스가 직접 만드는 보조 테이블 + slack_events NOTIFY 트리거
+-- 지금까지 models.py의 create_all이나 processor 데몬 시작 시 만들던 것들이라 모두 IF NOT EXISTS
+
+CREATE TABLE IF NOT EXISTS llm_parse_cache (
+    cache_key  varchar(64) PRIMARY KEY,
+    model      varchar(100) NOT NULL,
+    result     jsonb NOT NULL,
+    created_at timestamp
+);
+
+CREATE TABLE IF NOT EXISTS slack_event_receipt (
+    event_id    varchar(50) PRIMARY KEY,
+    received_at timestamp NOT NULL
+);
+-- dedup.purge_expired: received_at < cutoff
+CREATE INDEX IF NOT EXISTS ix_slack_event_receipt_received_at ON slack_event_receipt (received_at);
+
+CREATE TABLE IF NOT EXISTS kv_store (
+    key        varchar(255) PRIMARY KEY,
+    value      jsonb NOT NULL,
+    expires_at timestamp
+);
+-- PostgresKVStore.sweep: expires_at < now
+CREATE INDEX IF NOT EXISTS ix_kv_store_expires_at ON kv_store (expires_at) WHERE expires_at IS NOT NULL;
+
+-- 문장 단위 트리거: 배치 INSERT여도 NOTIFY는 한 번만 발생
+CREATE OR REPLACE FUNCTION notify_slack_events_new() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('slack_events_new', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS slack_events_notify ON slack_events;
+CREATE TRIGGER slack_events_notify
+AFTER INSERT ON slack_events
+FOR EACH STATEMENT EXECUTE FUNCTION notify_slack_events_new();
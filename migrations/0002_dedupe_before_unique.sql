@@ -0,0 +1,28 @@
+-- 0003의 유니크 인덱스를 만들기 전에 기존 중복 정리
+-- (인덱스가 없던 동안 동시 처리로 같은 공지/제출이 두 번 들어갔을 수 있음)
+
+-- 같은 slack_post_ts 공지가 여러 개면 가장 먼저 만든 것만 남기고,
+-- 나머지에 달린 제출은 남길 공지로 옮긴 뒤 요구사항과 함께 삭제
+CREATE TEMP TABLE _dup_assignment ON COMMIT DROP AS
+SELECT a.assignment_id AS dup_id, k.assignment_id AS keep_id
+FROM assignment a
+JOIN LATERAL (
+    SELECT assignment_id FROM assignment b
+    WHERE b.slack_post_ts = a.slack_post_ts
+    ORDER BY b.created_at NULLS LAST, b.assignment_id
+    LIMIT 1
+) k ON k.assignment_id <> a.assignment_id
+WHERE a.slack_post_ts IS NOT NULL;
+
+UPDATE submission s SET assignment_id = d.keep_id
+FROM _dup_assignment d WHERE s.assignment_id = d.dup_id;
+
+DELETE FROM assignment_requirement r USING _dup_assignment d WHERE r.assignment_id = d.dup_id;
+DELETE FROM assignment a USING _dup_assignment d WHERE a.assignment_id = d.dup_id;
+
+-- 같은 (student_id, assignment_id) 제출은 가장 먼저 들어온 것만 남김
+DELETE FROM submission s
+USING submission k
+WHERE s.student_id = k.student_id
+  AND s.assignment_id = k.assignment_id
+  AND s.submission_id > k.submission_id;
@@ -0,0 +1,28 @@
+-- migrate: no-transaction
+-- 운영 중인 테이블이라 CONCURRENTLY로 생성 (쓰기 잠금 없음)
+-- 생성 도중 실패하면 INVALID 인덱스가 남고 IF NOT EXISTS가 그걸 건너뛰므로,
+-- 재실행 전에 \d 로 확인해서 INVALID면 DROP INDEX CONCURRENTLY 할 것
+
+-- save_announcement / processor: 공지 ts → assignment 조회, 공지 중복 INSERT 방지
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_assignment_slack_post_ts
+    ON assignment (slack_post_ts) WHERE slack_post_ts IS NOT NULL;
+
+-- processor: 학생별 과제 제출 중복 확인 + ON CONFLICT 대상
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_submission_student_assignment
+    ON submission (student_id, assignment_id);
+
+-- 과제별 제출 목록 (위 인덱스는 student_id가 앞이라 못 씀)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_submission_assignment_id
+    ON submission (assignment_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignment_requirement_assignment_id
+    ON assignment_requirement (assignment_id);
+
+-- processor claim: WHERE processed = FALSE ORDER BY event_time
+-- 처리된 행(대부분)은 인덱스에 안 들어가므로 작게 유지됨
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_slack_events_unprocessed
+    ON slack_events (event_time) WHERE processed = FALSE;
+
+-- processor: 아직 처리 안 된 공지(스레드 루트) 확인
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_slack_events_unprocessed_roots
+    ON slack_events (ts) WHERE processed = FALSE AND thread_ts IS NULL;
@@ -0,0 +1,35 @@
+-- verification_result.submission_id가 uuid로 잘못 만들어져 있어 submission(bigint)을 참조할 수 없었음
+-- 아직 이 테이블에 쓰는 코드가 없으므로 비어 있어야 정상. 데이터가 있으면 멈추고 수동 확인
+DO $$
+BEGIN
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'verification_result' AND column_name = 'submission_id') = 'uuid'
+    THEN
+        IF EXISTS (SELECT 1 FROM verification_result) THEN
+            RAISE EXCEPTION 'verification_result has rows with uuid submission_id; migrate them manually';
+        END IF;
+        ALTER TABLE verification_result ALTER COLUMN submission_id TYPE bigint USING NULL;
+    END IF;
+END
+$$;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_verification_result_submission' AND conrelid = 'verification_result'::regclass) THEN
+        ALTER TABLE verification_result
+            ADD CONSTRAINT fk_verification_result_submission
+            FOREIGN KEY (submission_id) REFERENCES submission (submission_id) ON DELETE CASCADE;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_verification_result_requirement' AND conrelid = 'verification_result'::regclass) THEN
+        ALTER TABLE verification_result
+            ADD CONSTRAINT fk_verification_result_requirement
+            FOREIGN KEY (requirement_id) REFERENCES assignment_requirement (requirement_id) ON DELETE CASCADE;
+    END IF;
+END
+$$;
+
+-- 제출 하나의 요구사항별 결과는 하나 (재검증은 UPSERT)
+CREATE UNIQUE INDEX IF NOT EXISTS ux_verification_result_submission_requirement
+    ON verification_result (submission_id, requirement_id);
+CREATE INDEX IF NOT EXISTS ix_verification_result_requirement_id
+    ON verification_result (requirement_id);
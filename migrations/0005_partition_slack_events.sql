@@ -0,0 +1,142 @@
+-- slack_events → event_time(epoch 초) 기준 월별 파티션 테이블
+-- - file_1..5_* 컬럼 → slack_event_files 자식 테이블 (같은 월 경계로 파티션, 파일 개수 제한 없음)
+-- - raw_payload json → jsonb, 전송용 필드(token, authorizations 등)는 저장하지 않음
+-- - 기존 행은 한 트랜잭션 안에서 복사 (테이블이 크면 점검 시간에 실행)
+-- 파티션 추가/보관은 partitions.py (processor 데몬이 주기적으로 실행)
+
+-- 기존 테이블은 이름을 바꿔두고 끝에서 삭제. 인덱스/시퀀스 이름은 새 테이블이 이어받음
+DO $$
+BEGIN
+    IF to_regclass('slack_events') IS NOT NULL
+       AND (SELECT relkind FROM pg_class WHERE oid = 'slack_events'::regclass) = 'r' THEN
+        ALTER TABLE slack_events RENAME TO slack_events_legacy;
+        DROP TRIGGER IF EXISTS slack_events_notify ON slack_events_legacy;
+        ALTER INDEX IF EXISTS ix_slack_events_unprocessed RENAME TO ix_slack_events_legacy_unprocessed;
+        ALTER INDEX IF EXISTS ix_slack_events_unprocessed_roots RENAME TO ix_slack_events_legacy_unprocessed_roots;
+    END IF;
+END $$;
+
+CREATE SEQUENCE IF NOT EXISTS slack_events_id_seq;
+
+-- 파티션 키가 unique 제약에 포함돼야 해서 중복 방지는 (event_id, event_time).
+-- Slack 재전송은 event_time이 같으므로 event_id 단독 unique와 같은 효과
+CREATE TABLE slack_events (
+    id            bigint NOT NULL DEFAULT nextval('slack_events_id_seq'),
+    event_id      text NOT NULL,
+    event_type    text,
+    event_subtype text,
+    team_id       text,
+    channel_id    text,
+    user_id       text,
+    text          text,
+    ts            text,
+    thread_ts     text,
+    event_time    bigint NOT NULL,
+    raw_payload   jsonb,
+    processed     boolean NOT NULL DEFAULT FALSE,
+    CONSTRAINT pk_slack_events PRIMARY KEY (id, event_time),
+    CONSTRAINT ux_slack_events_event_id UNIQUE (event_id, event_time)
+) PARTITION BY RANGE (event_time);
+
+-- 파티션 테이블끼리 FK를 걸면 파티션 분리(DETACH)가 막히므로 FK 없이 (event_row_id, event_time)으로 연결
+CREATE TABLE slack_event_files (
+    event_row_id bigint NOT NULL,
+    event_time   bigint NOT NULL,
+    position     smallint NOT NULL,
+    file_id      text,
+    name         text,
+    mimetype     text,
+    url          text,
+    CONSTRAINT pk_slack_event_files PRIMARY KEY (event_row_id, event_time, position)
+) PARTITION BY RANGE (event_time);
+
+-- 범위 밖 event_time(잘못된 값, 파티션 생성 전 도착)도 잃지 않도록
+CREATE TABLE slack_events_default PARTITION OF slack_events DEFAULT;
+CREATE TABLE slack_event_files_default PARTITION OF slack_event_files DEFAULT;
+
+-- from_month가 속한 달부터 (이번 달 + months_ahead)까지 월 파티션 생성, 새로 만든 개수 반환
+CREATE OR REPLACE FUNCTION ensure_slack_event_partitions(from_month date, months_ahead int) RETURNS int AS $$
+DECLARE
+    month date := date_trunc('month', from_month)::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'utc') + make_interval(months => months_ahead))::date;
+    lower_bound bigint;
+    upper_bound bigint;
+    suffix text;
+    created int := 0;
+BEGIN
+    WHILE month <= last_month LOOP
+        suffix := to_char(month, 'YYYYMM');
+        lower_bound := extract(epoch FROM month::timestamp)::bigint;
+        upper_bound := extract(epoch FROM (month + interval '1 month')::timestamp)::bigint;
+        IF to_regclass('slack_events_p' || suffix) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I PARTITION OF slack_events FOR VALUES FROM (%s) TO (%s)',
+                           'slack_events_p' || suffix, lower_bound, upper_bound);
+            created := created + 1;
+        END IF;
+        IF to_regclass('slack_event_files_p' || suffix) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I PARTITION OF slack_event_files FOR VALUES FROM (%s) TO (%s)',
+                           'slack_event_files_p' || suffix, lower_bound, upper_bound);
+        END IF;
+        month := (month + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    first_month date;
+BEGIN
+    IF to_regclass('slack_events_legacy') IS NULL THEN
+        PERFORM ensure_slack_event_partitions((now() AT TIME ZONE 'utc')::date, 2);
+        RETURN;
+    END IF;
+
+    -- event_time이 비어 있던 행은 메시지 ts(epoch 초.마이크로초)로 대신
+    CREATE TEMP VIEW _slack_events_copy AS
+    SELECT *, COALESCE(event_time, split_part(ts, '.', 1)::bigint, extract(epoch FROM now())::bigint) AS part_time
+    FROM slack_events_legacy;
+
+    SELECT date_trunc('month', to_timestamp(min(part_time)) AT TIME ZONE 'utc')::date INTO first_month
+    FROM _slack_events_copy;
+    PERFORM ensure_slack_event_partitions(COALESCE(first_month, (now() AT TIME ZONE 'utc')::date), 2);
+
+    INSERT INTO slack_events (
+        id, event_id, event_type, event_subtype, team_id, channel_id, user_id,
+        text, ts, thread_ts, event_time, raw_payload, processed
+    )
+    SELECT id, event_id, event_type, event_subtype, team_id, channel_id, user_id,
+           text, ts, thread_ts, part_time,
+           raw_payload::jsonb - ARRAY['token', 'authorizations', 'authed_users', 'event_context'],
+           processed
+    FROM _slack_events_copy
+    WHERE event_id IS NOT NULL;
+
+    INSERT INTO slack_event_files (event_row_id, event_time, position, file_id, name, mimetype, url)
+    SELECT e.id, e.part_time, f.position, f.file_id, f.name, f.mimetype, f.url
+    FROM _slack_events_copy e
+    CROSS JOIN LATERAL (VALUES
+        (0, e.file_1_id, e.file_1_name, e.file_1_mimetype, e.file_1_url),
+        (1, e.file_2_id, e.file_2_name, e.file_2_mimetype, e.file_2_url),
+        (2, e.file_3_id, e.file_3_name, e.file_3_mimetype, e.file_3_url),
+        (3, e.file_4_id, e.file_4_name, e.file_4_mimetype, e.file_4_url),
+        (4, e.file_5_id, e.file_5_name, e.file_5_mimetype, e.file_5_url)
+    ) AS f(position, file_id, name, mimetype, url)
+    WHERE e.event_id IS NOT NULL AND (f.file_id IS NOT NULL OR f.url IS NOT NULL);
+
+    PERFORM setval('slack_events_id_seq', GREATEST((SELECT max(id) FROM slack_events), 1));
+    DROP VIEW _slack_events_copy;
+    -- 기존 bigserial 시퀀스가 테이블과 같이 삭제되지 않도록 소유 해제
+    ALTER SEQUENCE slack_events_id_seq OWNED BY NONE;
+    DROP TABLE slack_events_legacy;
+END $$;
+
+ALTER SEQUENCE slack_events_id_seq OWNED BY slack_events.id;
+
+-- 0003과 같은 부분 인덱스를 부모에 (파티션마다 자동 생성)
+CREATE INDEX ix_slack_events_unprocessed ON slack_events (event_time) WHERE processed = FALSE;
+CREATE INDEX ix_slack_events_unprocessed_roots ON slack_events (ts) WHERE processed = FALSE AND thread_ts IS NULL;
+
+CREATE TRIGGER slack_events_notify
+AFTER INSERT ON slack_events
+FOR EACH STATEMENT EXECUTE FUNCTION notify_slack_events_new();
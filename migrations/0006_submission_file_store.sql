@@ -0,0 +1,14 @@
+-- migrate: no-transaction
+-- 제출 파일 로컬 저장소 참조 (file_store.py). submission이 커서 인덱스는 CONCURRENTLY
+
+ALTER TABLE submission ADD COLUMN IF NOT EXISTS file_sha256 varchar(64);
+ALTER TABLE submission ADD COLUMN IF NOT EXISTS file_size bigint;
+ALTER TABLE submission ADD COLUMN IF NOT EXISTS file_fetch_attempts smallint NOT NULL DEFAULT 0;
+
+-- 같은 파일을 낸 제출 찾기
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_submission_file_sha256
+    ON submission (file_sha256);
+
+-- file_store.fetch_pending_files: 아직 받지 않은 제출 파일 (받고 나면 인덱스에서 빠짐)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_submission_file_pending
+    ON submission (submission_id) WHERE file_url IS NOT NULL AND file_sha256 IS NULL;
@@ -0,0 +1,13 @@
+-- migrate: no-transaction
+-- routers/assignments.py 키셋 페이지네이션용 인덱스
+
+-- 수업별 과제 목록: WHERE class_id = ? ORDER BY deadline DESC, assignment_id DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignment_class_deadline
+    ON assignment (class_id, deadline, assignment_id);
+
+-- 과제별 제출 목록: WHERE assignment_id = ? AND submission_id > ? ORDER BY submission_id
+-- 과제별 집계(count)도 이 인덱스로 되므로 0003의 단일 컬럼 인덱스는 삭제
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_submission_assignment_submission
+    ON submission (assignment_id, submission_id);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_submission_assignment_id;
@@ -0,0 +1,207 @@
+-- 과제별 제출 통계 (대시보드가 매번 submission/student를 세지 않도록)
+-- submission / student / assignment 쓰기마다 문장 단위 트리거가 증감분만 반영.
+-- 어긋났다고 의심되면 python assignment_stats.py --rebuild
+
+CREATE TABLE IF NOT EXISTS assignment_stats (
+    assignment_id uuid PRIMARY KEY REFERENCES assignment (assignment_id) ON DELETE CASCADE,
+    class_id      uuid,
+    -- 수업 수강생 수 (student.class_id 기준)
+    roster_size   integer NOT NULL DEFAULT 0,
+    submitted     integer NOT NULL DEFAULT 0,
+    -- submitted_at > deadline
+    late          integer NOT NULL DEFAULT 0,
+    -- is_met_requirements가 정해진 제출 / 그중 TRUE
+    verified      integer NOT NULL DEFAULT 0,
+    met           integer NOT NULL DEFAULT 0,
+    updated_at    timestamp
+);
+
+-- 수강생 증감 시 해당 수업의 과제 통계 갱신
+CREATE INDEX IF NOT EXISTS ix_assignment_stats_class_id ON assignment_stats (class_id);
+-- 통계 재계산 시 수업별 수강생 수
+CREATE INDEX IF NOT EXISTS ix_student_class_id ON student (class_id);
+
+-- 지정한 과제(NULL이면 전체)의 통계를 처음부터 다시 계산, 갱신한 행 수 반환
+CREATE OR REPLACE FUNCTION assignment_stats_refresh(ids uuid[]) RETURNS int AS $$
+DECLARE
+    refreshed int;
+BEGIN
+    INSERT INTO assignment_stats (assignment_id, class_id, roster_size, submitted, late, verified, met, updated_at)
+    SELECT a.assignment_id, a.class_id, r.roster_size, s.submitted, s.late, s.verified, s.met, now() AT TIME ZONE 'utc'
+    FROM assignment a
+    CROSS JOIN LATERAL (
+        SELECT count(*) AS roster_size FROM student st WHERE st.class_id = a.class_id
+    ) r
+    CROSS JOIN LATERAL (
+        SELECT count(*) AS submitted,
+               count(*) FILTER (WHERE sub.submitted_at > a.deadline) AS late,
+               count(*) FILTER (WHERE sub.is_met_requirements IS NOT NULL) AS verified,
+               count(*) FILTER (WHERE sub.is_met_requirements) AS met
+        FROM submission sub WHERE sub.assignment_id = a.assignment_id
+    ) s
+    WHERE ids IS NULL OR a.assignment_id = ANY(ids)
+    ON CONFLICT (assignment_id) DO UPDATE SET
+        class_id = excluded.class_id, roster_size = excluded.roster_size,
+        submitted = excluded.submitted, late = excluded.late,
+        verified = excluded.verified, met = excluded.met, updated_at = excluded.updated_at;
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 제출 한 건의 변화: 새 행은 +1, 이전 행은 -1
+DO $$
+BEGIN
+    IF to_regtype('assignment_stats_change') IS NULL THEN
+        CREATE TYPE assignment_stats_change AS (
+            assignment_id uuid, submitted_at timestamp, is_met boolean, sign int
+        );
+    END IF;
+END $$;
+
+-- 제출 변화 목록을 과제별 증감으로 합쳐 반영 (변화 없는 과제는 건드리지 않음)
+CREATE OR REPLACE FUNCTION assignment_stats_apply(changes assignment_stats_change[]) RETURNS void AS $$
+DECLARE
+    ids uuid[];
+    d_submitted int[];
+    d_late int[];
+    d_verified int[];
+    d_met int[];
+BEGIN
+    SELECT array_agg(d.assignment_id ORDER BY d.assignment_id),
+           array_agg(d.submitted ORDER BY d.assignment_id), array_agg(d.late ORDER BY d.assignment_id),
+           array_agg(d.verified ORDER BY d.assignment_id), array_agg(d.met ORDER BY d.assignment_id)
+    INTO ids, d_submitted, d_late, d_verified, d_met
+    FROM (
+        SELECT c.assignment_id,
+               sum(c.sign)::int AS submitted,
+               COALESCE(sum(c.sign) FILTER (WHERE c.submitted_at > a.deadline), 0)::int AS late,
+               COALESCE(sum(c.sign) FILTER (WHERE c.is_met IS NOT NULL), 0)::int AS verified,
+               COALESCE(sum(c.sign) FILTER (WHERE c.is_met), 0)::int AS met
+        FROM unnest(changes) c
+        JOIN assignment a ON a.assignment_id = c.assignment_id
+        GROUP BY c.assignment_id
+    ) d
+    WHERE (d.submitted, d.late, d.verified, d.met) <> (0, 0, 0, 0);
+
+    IF ids IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- 여러 과제를 한 문장에서 갱신하는 트랜잭션끼리 교착되지 않도록 항상 같은 순서로 잠금
+    PERFORM 1 FROM assignment_stats WHERE assignment_id = ANY(ids) ORDER BY assignment_id FOR UPDATE;
+    UPDATE assignment_stats s SET
+        submitted = s.submitted + d.submitted,
+        late = s.late + d.late,
+        verified = s.verified + d.verified,
+        met = s.met + d.met,
+        updated_at = now() AT TIME ZONE 'utc'
+    FROM unnest(ids, d_submitted, d_late, d_verified, d_met) AS d(assignment_id, submitted, late, verified, met)
+    WHERE s.assignment_id = d.assignment_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION assignment_stats_on_submission() RETURNS trigger AS $$
+DECLARE
+    changes assignment_stats_change[];
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        SELECT array_agg((n.assignment_id, n.submitted_at, n.is_met_requirements, 1)::assignment_stats_change)
+        INTO changes FROM new_rows n;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        SELECT changes || array_agg((o.assignment_id, o.submitted_at, o.is_met_requirements, -1)::assignment_stats_change)
+        INTO changes FROM old_rows o;
+    END IF;
+    PERFORM assignment_stats_apply(changes);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 수강생 추가/삭제/수업 변경 → 그 수업 과제들의 roster_size 증감
+CREATE OR REPLACE FUNCTION assignment_stats_on_student() RETURNS trigger AS $$
+DECLARE
+    classes uuid[];
+    signs int[];
+    deltas record;
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        SELECT array_agg(n.class_id), array_agg(1) INTO classes, signs FROM new_rows n WHERE n.class_id IS NOT NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        SELECT classes || array_agg(o.class_id), signs || array_agg(-1) INTO classes, signs
+        FROM old_rows o WHERE o.class_id IS NOT NULL;
+    END IF;
+
+    FOR deltas IN
+        SELECT c.class_id, sum(c.sign) AS delta
+        FROM unnest(classes, signs) AS c(class_id, sign)
+        GROUP BY c.class_id
+        HAVING sum(c.sign) <> 0
+        ORDER BY c.class_id
+    LOOP
+        PERFORM 1 FROM assignment_stats WHERE class_id = deltas.class_id ORDER BY assignment_id FOR UPDATE;
+        UPDATE assignment_stats SET roster_size = roster_size + deltas.delta, updated_at = now() AT TIME ZONE 'utc'
+        WHERE class_id = deltas.class_id;
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 새 과제는 통계 행 생성, 마감일/수업이 바뀐 과제는 다시 계산 (드묾)
+CREATE OR REPLACE FUNCTION assignment_stats_on_assignment() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM assignment_stats_refresh(ARRAY(SELECT n.assignment_id FROM new_rows n));
+    ELSE
+        PERFORM assignment_stats_refresh(ARRAY(
+            SELECT n.assignment_id FROM new_rows n JOIN old_rows o ON o.assignment_id = n.assignment_id
+            WHERE n.deadline IS DISTINCT FROM o.deadline OR n.class_id IS DISTINCT FROM o.class_id
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 전이 테이블(REFERENCING)은 이벤트 하나당 트리거 하나
+DROP TRIGGER IF EXISTS assignment_stats_submission_insert ON submission;
+CREATE TRIGGER assignment_stats_submission_insert
+AFTER INSERT ON submission REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assignment_stats_on_submission();
+
+DROP TRIGGER IF EXISTS assignment_stats_submission_update ON submission;
+CREATE TRIGGER assignment_stats_submission_update
+AFTER UPDATE ON submission REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assignment_stats_on_submission();
+
+DROP TRIGGER IF EXISTS assignment_stats_submission_delete ON submission;
+CREATE TRIGGER assignment_stats_submission_delete
+AFTER DELETE ON submission REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assignment_stats_on_submission();
+
+DROP TRIGGER IF EXISTS assignment_stats_student_insert ON student;
+CREATE TRIGGER assignment_stats_student_insert
+AFTER INSERT ON student REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assignment_stats_on_student();
+
+DROP TRIGGER IF EXISTS assignment_stats_student_update ON student;
+CREATE TRIGGER assignment_stats_student_update
+AFTER UPDATE ON student REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assignment_stats_on_student();
+
+DROP TRIGGER IF EXISTS assignment_stats_student_delete ON student;
+CREATE TRIGGER assignment_stats_student_delete
+AFTER DELETE ON student REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assignment_stats_on_student();
+
+DROP TRIGGER IF EXISTS assignment_stats_assignment_insert ON assignment;
+CREATE TRIGGER assignment_stats_assignment_insert
+AFTER INSERT ON assignment REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assignment_stats_on_assignment();
+
+DROP TRIGGER IF EXISTS assignment_stats_assignment_update ON assignment;
+CREATE TRIGGER assignment_stats_assignment_update
+AFTER UPDATE ON assignment REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assignment_stats_on_assignment();
+
+SELECT assignment_stats_refresh(NULL);
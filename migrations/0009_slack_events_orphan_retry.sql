@@ -0,0 +1,7 @@
+-- 공지를 아직 찾지 못한 스레드 댓글 재시도 (processor._handle_submissions)
+-- 실시간 공지는 slack_events를 거치지 않고 바로 assignment에 저장되므로, 공지 저장(LLM 파싱)이
+-- 끝나기 전에 들어온 제출은 processed로 표시하지 않고 retry_at 이후 다시 claim한다.
+-- 파티션 테이블이라 부모에 추가하면 모든 월 파티션에 적용됨
+
+ALTER TABLE slack_events ADD COLUMN IF NOT EXISTS retry_count smallint NOT NULL DEFAULT 0;
+ALTER TABLE slack_events ADD COLUMN IF NOT EXISTS retry_at timestamp;
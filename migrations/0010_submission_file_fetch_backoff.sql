@@ -0,0 +1,4 @@
+-- 제출 파일 받기 실패 후 다음 시도 시각 (file_store.fetch_pending_files, 지수 백오프)
+-- NULL이면 바로 시도. Slack 장애 동안 재시도 횟수를 몇 초 만에 다 써 버리지 않도록
+
+ALTER TABLE submission ADD COLUMN IF NOT EXISTS file_fetch_retry_at timestamp;
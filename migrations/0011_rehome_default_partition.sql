@@ -0,0 +1,77 @@
+-- DEFAULT 파티션에 들어간 이벤트(가장 오래된 월 파티션보다 이전인 백필 이벤트, 파티션 생성 전 도착)도
+-- 월 파티션으로 옮겨서 partitions.py 보관 대상이 되도록 한다.
+-- DEFAULT에 그 달 행이 있으면 월 파티션을 만들 수 없으므로(제약 위반) 행을 잠시 빼 두었다가 다시 넣음
+
+-- 월 파티션 하나(이벤트 + 파일) 생성, 새로 만들었으면 TRUE
+CREATE OR REPLACE FUNCTION create_slack_event_partition(month date) RETURNS boolean AS $$
+DECLARE
+    suffix text := to_char(month, 'YYYYMM');
+    lower_bound bigint := extract(epoch FROM month::timestamp)::bigint;
+    upper_bound bigint := extract(epoch FROM (month + interval '1 month')::timestamp)::bigint;
+    created boolean := FALSE;
+    tables text[];
+BEGIN
+    FOREACH tables SLICE 1 IN ARRAY ARRAY[
+        ARRAY['slack_events', 'slack_events_default', 'slack_events_p' || suffix],
+        ARRAY['slack_event_files', 'slack_event_files_default', 'slack_event_files_p' || suffix]
+    ] LOOP
+        CONTINUE WHEN to_regclass(tables[3]) IS NOT NULL;
+        -- 옮기는 동안 그 달 이벤트가 DEFAULT에 새로 들어오지 않도록
+        EXECUTE format('LOCK TABLE %I IN ACCESS EXCLUSIVE MODE', tables[2]);
+        EXECUTE format('CREATE TEMP TABLE _rehomed (LIKE %I)', tables[1]);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM %I WHERE event_time >= %s AND event_time < %s RETURNING *) '
+            'INSERT INTO _rehomed SELECT * FROM moved',
+            tables[2], lower_bound, upper_bound
+        );
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%s) TO (%s)',
+                       tables[3], tables[1], lower_bound, upper_bound);
+        EXECUTE format('INSERT INTO %I SELECT * FROM _rehomed', tables[1]);
+        DROP TABLE _rehomed;
+        created := created OR tables[1] = 'slack_events';
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- from_month가 속한 달부터 (이번 달 + months_ahead)까지 월 파티션 생성, 새로 만든 개수 반환
+CREATE OR REPLACE FUNCTION ensure_slack_event_partitions(from_month date, months_ahead int) RETURNS int AS $$
+DECLARE
+    month date := date_trunc('month', from_month)::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'utc') + make_interval(months => months_ahead))::date;
+    created int := 0;
+BEGIN
+    WHILE month <= last_month LOOP
+        IF create_slack_event_partition(month) THEN
+            created := created + 1;
+        END IF;
+        month := (month + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- DEFAULT 파티션에 행이 있는 달의 월 파티션을 만들어 옮김, 새로 만든 개수 반환.
+-- (이번 달 + months_ahead) 이후의 잘못된 event_time은 DEFAULT에 그대로 둠
+CREATE OR REPLACE FUNCTION rehome_slack_event_defaults(months_ahead int) RETURNS int AS $$
+DECLARE
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'utc') + make_interval(months => months_ahead))::date;
+    month date;
+    created int := 0;
+BEGIN
+    FOR month IN
+        SELECT date_trunc('month', to_timestamp(event_time) AT TIME ZONE 'utc')::date AS m FROM slack_events_default
+        UNION
+        SELECT date_trunc('month', to_timestamp(event_time) AT TIME ZONE 'utc')::date FROM slack_event_files_default
+        ORDER BY m
+    LOOP
+        EXIT WHEN month > last_month;
+        IF create_slack_event_partition(month) THEN
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rehome_slack_event_defaults(2);
@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, ForeignKey, DateTime, Integer, BigInteger, Boolean, Identity
+from sqlalchemy import String, Text, ForeignKey, DateTime, Integer, BigInteger, SmallInteger, Boolean, Identity, Index, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 
 class Base(DeclarativeBase):
@@ -35,6 +35,9 @@ class Class(Base):
 
 class Student(Base):
     __tablename__ = "student"
+    __table_args__ = (
+        Index("ix_student_class_id", "class_id"),
+    )
 
     student_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(50))
@@ -48,6 +51,13 @@ class Student(Base):
 
 class Assignment(Base):
     __tablename__ = "assignment"
+    __table_args__ = (
+        Index(
+            "ux_assignment_slack_post_ts", "slack_post_ts",
+            unique=True, postgresql_where=text("slack_post_ts IS NOT NULL"),
+        ),
+        Index("ix_assignment_class_deadline", "class_id", "deadline", "assignment_id"),
+    )
 
     assignment_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     class_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("classes.class_id"))
@@ -63,6 +73,9 @@ class Assignment(Base):
 
 class AssignmentRequirement(Base):
     __tablename__ = "assignment_requirement"
+    __table_args__ = (
+        Index("ix_assignment_requirement_assignment_id", "assignment_id"),
+    )
 
     requirement_id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
     assignment_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("assignment.assignment_id"))
@@ -71,6 +84,15 @@ class AssignmentRequirement(Base):
 
 class Submission(Base):
     __tablename__ = "submission"
+    __table_args__ = (
+        Index("ux_submission_student_assignment", "student_id", "assignment_id", unique=True),
+        Index("ix_submission_assignment_submission", "assignment_id", "submission_id"),
+        Index("ix_submission_file_sha256", "file_sha256"),
+        Index(
+            "ix_submission_file_pending", "submission_id",
+            postgresql_where=text("file_url IS NOT NULL AND file_sha256 IS NULL"),
+        ),
+    )
 
     submission_id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
     student_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("student.student_id"))
@@ -78,6 +100,12 @@ class Submission(Base):
     content_text: Mapped[str | None] = mapped_column(Text)
     file_url: Mapped[str | None] = mapped_column(Text)
     file_name: Mapped[str | None] = mapped_column(String(255))
+    # file_store.py 로컬 저장소 키 (받기 전이면 None)
+    file_sha256: Mapped[str | None] = mapped_column(String(64))
+    file_size: Mapped[int | None] = mapped_column(BigInteger)
+    file_fetch_attempts: Mapped[int] = mapped_column(SmallInteger, server_default=text("0"), default=0)
+    # 받기 실패 후 다음 시도 시각 (UTC)
+    file_fetch_retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False))
     status: Mapped[str | None] = mapped_column(String(20))
     slack_thread_ts: Mapped[str | None] = mapped_column(String(100))
     is_met_requirements: Mapped[bool | None] = mapped_column(Boolean)
@@ -88,10 +116,70 @@ class Submission(Base):
 
 class VerificationResult(Base):
     __tablename__ = "verification_result"
+    __table_args__ = (
+        Index("ux_verification_result_submission_requirement", "submission_id", "requirement_id", unique=True),
+        Index("ix_verification_result_requirement_id", "requirement_id"),
+    )
 
     verification_result_id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
-    requirement_id: Mapped[int] = mapped_column(BigInteger)
-    submission_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
+    requirement_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("assignment_requirement.requirement_id", name="fk_verification_result_requirement", ondelete="CASCADE"),
+    )
+    submission_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("submission.submission_id", name="fk_verification_result_submission", ondelete="CASCADE"),
+    )
     is_met: Mapped[bool] = mapped_column(Boolean)
     verified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False))
     feedback: Mapped[str | None] = mapped_column(Text)
+
+
+class AssignmentStats(Base):
+    """과제별 제출 통계. migrations/0008의 트리거가 submission/student/assignment 쓰기마다 갱신"""
+    __tablename__ = "assignment_stats"
+    __table_args__ = (
+        Index("ix_assignment_stats_class_id", "class_id"),
+    )
+
+    assignment_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("assignment.assignment_id", ondelete="CASCADE"), primary_key=True
+    )
+    class_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    roster_size: Mapped[int] = mapped_column(Integer, server_default=text("0"), default=0)
+    submitted: Mapped[int] = mapped_column(Integer, server_default=text("0"), default=0)
+    late: Mapped[int] = mapped_column(Integer, server_default=text("0"), default=0)
+    verified: Mapped[int] = mapped_column(Integer, server_default=text("0"), default=0)
+    met: Mapped[int] = mapped_column(Integer, server_default=text("0"), default=0)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False))
+
+
+class LLMParseCache(Base):
+    __tablename__ = "llm_parse_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100))
+    result: Mapped[dict] = mapped_column(JSONB)
+    created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), default=datetime.utcnow)
+
+
+class SlackEventReceipt(Base):
+    __tablename__ = "slack_event_receipt"
+    __table_args__ = (
+        Index("ix_slack_event_receipt_received_at", "received_at"),
+    )
+
+    event_id: Mapped[str] = mapped_column(String(50), primary_key=True)
+    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=datetime.utcnow)
+
+
+class KVEntry(Base):
+    __tablename__ = "kv_store"
+    __table_args__ = (
+        Index("ix_kv_store_expires_at", "expires_at", postgresql_where=text("expires_at IS NOT NULL")),
+    )
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    value: Mapped[dict] = mapped_column(JSONB)
+    # NULL이면 만료 없음
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False))
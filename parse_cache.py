@@ -0,0 +1,96 @@
+import os
+import copy
+import hashlib
+import unicodedata
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from cache import TTLCache
+from db import get_session, get_read_session
+from models import LLMParseCache
+from log import get_logger
+
+load_dotenv()
+
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "2000"))
+PARSE_CACHE_TTL = float(os.getenv("PARSE_CACHE_TTL", str(7 * 24 * 3600)))
+
+log = get_logger("parse_cache")
+
+_memory = TTLCache("llm_parse", PARSE_CACHE_SIZE, PARSE_CACHE_TTL)
+
+memory_hits = 0
+db_hits = 0
+misses = 0
+db_errors = 0
+
+
+def normalize_text(text: str) -> str:
+    """공백/유니코드 정규화: 재게시·복붙 시 생기는 사소한 차이는 같은 공지로 취급"""
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+
+def make_key(text: str, prompt_template: str, model: str) -> str:
+    prompt_hash = hashlib.sha256(prompt_template.encode()).hexdigest()
+    payload = "\0".join([model, prompt_hash, normalize_text(text)])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def get(key: str) -> dict | None:
+    """메모리 → Postgres 순서로 조회. 결과는 복사본 (호출측에서 수정해도 캐시 오염 없음)"""
+    global memory_hits, db_hits, misses, db_errors
+
+    result = _memory.get(key, None)
+    if result is not None:
+        memory_hits += 1
+        return copy.deepcopy(result)
+
+    try:
+        async with get_read_session() as session:
+            result = await session.scalar(
+                select(LLMParseCache.result).where(LLMParseCache.cache_key == key)
+            )
+    except Exception as e:
+        # 캐시 테이블 문제로 파싱 자체가 막히면 안 됨 → 미스로 처리
+        db_errors += 1
+        log.error("parse cache lookup failed", error=str(e))
+        result = None
+
+    if result is None:
+        misses += 1
+        return None
+
+    db_hits += 1
+    _memory.set(key, result)
+    return copy.deepcopy(result)
+
+
+async def put(key: str, model: str, result: dict):
+    global db_errors
+
+    _memory.set(key, copy.deepcopy(result))
+    try:
+        async with get_session() as session:
+            # 검증을 통과한 결과만 들어오므로 같은 키의 (예전에 검증 없이 저장된) 결과는 덮어씀
+            statement = insert(LLMParseCache).values(cache_key=key, model=model, result=result)
+            await session.execute(statement.on_conflict_do_update(
+                index_elements=[LLMParseCache.cache_key],
+                set_={"model": statement.excluded.model, "result": statement.excluded.result},
+            ))
+            await session.commit()
+    except Exception as e:
+        db_errors += 1
+        log.error("parse cache store failed", error=str(e))
+
+
+def stats() -> dict:
+    total = memory_hits + db_hits + misses
+    return {
+        "memory_hits": memory_hits,
+        "db_hits": db_hits,
+        "misses": misses,
+        "db_errors": db_errors,
+        "hit_ratio": round((memory_hits + db_hits) / total, 4) if total else None,
+        "memory": _memory.stats(),
+    }
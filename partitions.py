@@ -0,0 +1,153 @@
+"""
+slack_events / slack_event_files 월별 파티션 관리 (migrations/0005).
+
+- 앞으로 쓸 월 파티션을 미리 생성 (없으면 default 파티션으로 들어감)
+- default 파티션에 들어간 이벤트(가장 오래된 월보다 이전의 백필 등)는 그 달 파티션을 만들어 옮김 (migrations/0011)
+- 보관 기간이 지난 월 파티션을 분리(DETACH)한 뒤 보관 스키마로 옮기거나 삭제
+  미처리 이벤트가 남은 파티션은 건드리지 않음
+
+processor 데몬이 PARTITION_MAINTENANCE_INTERVAL마다 실행. 수동 실행:
+
+    python partitions.py            # 생성 + 보관
+    python partitions.py --dry-run  # 보관 대상만 출력
+"""
+import os
+import re
+import asyncio
+import argparse
+from datetime import date, datetime
+from dotenv import load_dotenv
+from sqlalchemy import text
+from db import engine
+from log import get_logger
+
+load_dotenv()
+
+# 이 개월 수보다 오래된 월 파티션은 보관 (이번 달 포함 N개월 유지)
+SLACK_EVENTS_RETENTION_MONTHS = int(os.getenv("SLACK_EVENTS_RETENTION_MONTHS", "6"))
+SLACK_EVENTS_PARTITIONS_AHEAD = int(os.getenv("SLACK_EVENTS_PARTITIONS_AHEAD", "2"))
+# schema: 분리한 파티션을 보관 스키마로 이동 (pg_dump 후 직접 삭제) / drop: 바로 삭제
+SLACK_EVENTS_ARCHIVE_MODE = os.getenv("SLACK_EVENTS_ARCHIVE_MODE", "schema")
+SLACK_EVENTS_ARCHIVE_SCHEMA = os.getenv("SLACK_EVENTS_ARCHIVE_SCHEMA", "slack_events_archive")
+PARTITION_MAINTENANCE_INTERVAL = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "21600"))
+# DETACH는 부모 테이블을 잠시 배타 잠금 → 수집이 오래 막히지 않도록 잠금 대기 상한
+PARTITION_LOCK_TIMEOUT = os.getenv("PARTITION_LOCK_TIMEOUT", "5s")
+
+# 데몬 여러 개가 동시에 돌 때 한 곳만 실행
+_LOCK_KEY = 74_201_018
+_PARTITION_NAME = re.compile(r"^slack_events_p(\d{4})(\d{2})$")
+
+log = get_logger("partitions")
+
+_LIST_PARTITIONS_SQL = text("""
+    SELECT c.relname FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'slack_events'::regclass
+""")
+
+
+def _months_before(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def ensure_partitions(months_ahead: int = SLACK_EVENTS_PARTITIONS_AHEAD, from_month: date | None = None) -> int:
+    """
+    from_month(기본 이번 달) ~ months_ahead개월 뒤 파티션 생성 + default 파티션의 행을 월 파티션으로 옮김.
+    새로 만든 개수 반환
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+        created = await conn.scalar(
+            text("SELECT ensure_slack_event_partitions(CAST(:from_month AS date), :ahead)"),
+            {"from_month": from_month or datetime.utcnow().date(), "ahead": months_ahead},
+        )
+        rehomed = await conn.scalar(text("SELECT rehome_slack_event_defaults(:ahead)"), {"ahead": months_ahead})
+    if created or rehomed:
+        log.info("partitions created", count=created + rehomed, from_default=rehomed)
+    return created + rehomed
+
+
+async def expired_partitions(retention_months: int = SLACK_EVENTS_RETENTION_MONTHS) -> list[tuple[str, date]]:
+    """보관 기간이 지난 월 파티션 (이름, 월) 목록, 오래된 순"""
+    cutoff = _months_before(datetime.utcnow().date().replace(day=1), retention_months - 1)
+    async with engine.connect() as conn:
+        names = (await conn.scalars(_LIST_PARTITIONS_SQL)).all()
+    expired = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if month < cutoff:
+                expired.append((name, month))
+    return sorted(expired, key=lambda item: item[1])
+
+
+async def archive_partition(name: str, month: date) -> bool:
+    """월 파티션 하나(이벤트 + 파일)를 분리해서 보관/삭제. 미처리 이벤트가 있으면 False"""
+    files_name = f"slack_event_files_p{month:%Y%m}"
+    async with engine.begin() as conn:
+        await conn.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+        pending = await conn.scalar(text(f'SELECT count(*) FROM "{name}" WHERE processed = FALSE'))
+        if pending:
+            log.warning("partition has unprocessed events, not archived", partition=name, pending=pending)
+            return False
+
+        for table, parent in ((name, "slack_events"), (files_name, "slack_event_files")):
+            if await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": table}):
+                await conn.execute(text(f'ALTER TABLE {parent} DETACH PARTITION "{table}"'))
+                if SLACK_EVENTS_ARCHIVE_MODE == "drop":
+                    await conn.execute(text(f'DROP TABLE "{table}"'))
+                else:
+                    await conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{SLACK_EVENTS_ARCHIVE_SCHEMA}"'))
+                    await conn.execute(text(f'ALTER TABLE "{table}" SET SCHEMA "{SLACK_EVENTS_ARCHIVE_SCHEMA}"'))
+
+    log.info("partition archived", partition=name, mode=SLACK_EVENTS_ARCHIVE_MODE)
+    return True
+
+
+async def run_maintenance() -> list[str]:
+    """파티션 생성 + 보관. 다른 프로세스가 실행 중이면 건너뜀. 보관한 파티션 이름 반환"""
+    async with engine.connect() as lock_conn:
+        if not await lock_conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": _LOCK_KEY}):
+            return []
+        try:
+            await ensure_partitions()
+            archived = []
+            for name, month in await expired_partitions():
+                if await archive_partition(name, month):
+                    archived.append(name)
+            return archived
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+            await lock_conn.commit()
+
+
+async def run_scheduler(stop: asyncio.Event):
+    """processor 데몬에서 백그라운드 태스크로 실행"""
+    while not stop.is_set():
+        try:
+            await run_maintenance()
+        except Exception as e:
+            log.error("partition maintenance failed", error=str(e))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=PARTITION_MAINTENANCE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main(dry_run: bool = False):
+    if dry_run:
+        for name, month in await expired_partitions():
+            print(f"{name} ({month:%Y-%m})")
+    else:
+        archived = await run_maintenance()
+        log.info("partition maintenance finished", archived=archived)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="slack_events 파티션 생성/보관")
+    parser.add_argument("--dry-run", action="store_true", help="보관 대상만 출력")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
@@ -0,0 +1,63 @@
+import os
+import time
+import asyncio
+import bcrypt
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# bcrypt cost factor (2^rounds). 12 기준 한 번에 수백 ms
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# 해싱 전용 스레드 수. bcrypt는 해싱 중 GIL을 놓으므로 코어 수 이하로
+BCRYPT_MAX_WORKERS = int(os.getenv("BCRYPT_MAX_WORKERS", "2"))
+# 실행 중 + 대기 중인 해싱 요청 상한. 넘으면 바로 거절 (가입 폭주 시 메모리/지연 폭증 방지)
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+
+_executor = ThreadPoolExecutor(max_workers=BCRYPT_MAX_WORKERS, thread_name_prefix="bcrypt")
+
+pending = 0
+hashed = 0
+rejected = 0
+_total_seconds = 0.0
+
+
+class HasherBusyError(Exception):
+    """대기 중인 해싱 요청이 BCRYPT_MAX_PENDING을 넘음"""
+
+
+def _hash(password: bytes) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+
+async def hash_password(password: str) -> str:
+    """이벤트 루프를 막지 않도록 전용 스레드 풀에서 bcrypt 해싱"""
+    global pending, hashed, rejected, _total_seconds
+    if pending >= BCRYPT_MAX_PENDING:
+        rejected += 1
+        raise HasherBusyError(f"비밀번호 해싱 대기 {pending}건")
+
+    pending += 1
+    started = time.perf_counter()
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(_executor, _hash, password.encode())
+    finally:
+        pending -= 1
+    hashed += 1
+    _total_seconds += time.perf_counter() - started
+    return result
+
+
+def shutdown():
+    _executor.shutdown(wait=True, cancel_futures=True)
+
+
+def stats() -> dict:
+    return {
+        "rounds": BCRYPT_ROUNDS,
+        "workers": BCRYPT_MAX_WORKERS,
+        "pending": pending,
+        "hashed": hashed,
+        "rejected": rejected,
+        "avg_seconds": round(_total_seconds / hashed, 4) if hashed else None,
+    }
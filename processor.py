@@ -1,138 +1,478 @@
 import os
+import signal
+import argparse
 import asyncio
 from datetime import datetime
 from dotenv import load_dotenv
-from db import get_session
+from sqlalchemy import text
+from db import engine, get_session, dispose
+from identity import student_cache
+from announcement_rules import posted_at_from_ts
+from ingest import NOTIFY_CHANNEL
+from partitions import run_scheduler as run_partition_maintenance
+from file_store import run_fetcher as run_file_fetcher
+from verifier import run_verifier
+from metrics import stage_seconds
+from log import get_logger
 
 load_dotenv()
 
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_CHANNEL_ID = os.getenv("SLACK_CHANNEL_ID")
 
-async def process_pending_events():
-    pool = await get_session()
-    async with pool.acquire() as conn:
+PROCESSOR_BATCH_SIZE = int(os.getenv("PROCESSOR_BATCH_SIZE", "200"))
+PROCESSOR_WORKERS = int(os.getenv("PROCESSOR_WORKERS", "1"))
+# NOTIFY를 놓쳤을 때를 대비한 느린 폴링 주기 (초)
+PROCESSOR_POLL_INTERVAL = float(os.getenv("PROCESSOR_POLL_INTERVAL", "60"))
+# 공지를 못 찾은 제출 재시도: ORPHAN_RETRY_BASE초부터 두 배씩, ORPHAN_MAX_RETRIES번 뒤 포기
+# (기본 30초 → 약 15분. 실시간 공지는 LLM 파싱이 끝나야 assignment에 저장됨)
+ORPHAN_RETRY_BASE = float(os.getenv("ORPHAN_RETRY_BASE", "30"))
+ORPHAN_MAX_RETRIES = int(os.getenv("ORPHAN_MAX_RETRIES", "5"))
 
-        # 아직 처리 안 된 이벤트만 가져옴
-        rows = await conn.fetch("""
-            SELECT * FROM slack_events
-            WHERE processed = FALSE
-            ORDER BY event_time ASC
-        """)
+log = get_logger("processor")
+
+# 다른 워커(프로세스)가 잡은 행은 건너뛰고 batch_size만큼만 가져옴
+# 첨부 파일은 slack_event_files에서 순서대로 [{url, name}, ...]
+_CLAIM_SQL = text("""
+    SELECT e.id, e.event_id, e.user_id, e.text, e.ts, e.thread_ts, e.event_time, e.retry_count,
+        (
+            SELECT jsonb_agg(jsonb_build_object('url', f.url, 'name', f.name) ORDER BY f.position)
+            FROM slack_event_files f
+            WHERE f.event_row_id = e.id AND f.event_time = e.event_time
+        ) AS files
+    FROM slack_events e
+    WHERE e.processed = FALSE AND e.id <> ALL(CAST(:skip_ids AS bigint[]))
+      AND (e.retry_at IS NULL OR e.retry_at <= now() AT TIME ZONE 'utc')
+    ORDER BY e.event_time ASC
+    LIMIT :limit
+    FOR UPDATE OF e SKIP LOCKED
+""")
+
+# backfill.py replay: processed 여부와 관계없이 id 순서로 다시 처리.
+# 데몬이 처리 중인 행은 건너뜀 (어차피 처리됨)
+_REPLAY_SQL = text("""
+    SELECT e.id, e.event_id, e.user_id, e.text, e.ts, e.thread_ts, e.event_time, e.retry_count,
+        (
+            SELECT jsonb_agg(jsonb_build_object('url', f.url, 'name', f.name) ORDER BY f.position)
+            FROM slack_event_files f
+            WHERE f.event_row_id = e.id AND f.event_time = e.event_time
+        ) AS files
+    FROM slack_events e
+    WHERE e.id > :after_id
+      AND e.event_time >= :min_time AND e.event_time < :max_time
+      AND (CAST(:channel_id AS text) IS NULL OR e.channel_id = :channel_id)
+    ORDER BY e.id
+    LIMIT :limit
+    FOR UPDATE OF e SKIP LOCKED
+""")
+
+# event_time 범위를 같이 줘서 배치가 걸친 월 파티션만 확인
+_MARK_PROCESSED_SQL = text("""
+    UPDATE slack_events SET processed = TRUE
+    WHERE id = ANY(CAST(:ids AS bigint[])) AND event_time BETWEEN :min_time AND :max_time
+""")
+
+_INSERT_ANNOUNCEMENTS_SQL = text("""
+    INSERT INTO assignment (
+        class_id, professor_id,
+        title, content,
+        deadline, slack_post_ts
+    )
+    SELECT NULL, NULL, t.title, t.content, NOW() + INTERVAL '7 days', t.ts
+    FROM unnest(CAST(:titles AS text[]), CAST(:contents AS text[]), CAST(:ts AS text[]))
+        AS t(title, content, ts)
+    WHERE NOT EXISTS (SELECT 1 FROM assignment a WHERE a.slack_post_ts = t.ts)
+    ON CONFLICT DO NOTHING
+""")
+
+_SELECT_ASSIGNMENTS_SQL = text("""
+    SELECT slack_post_ts, assignment_id FROM assignment
+    WHERE slack_post_ts = ANY(CAST(:ts AS text[]))
+""")
+
+# 다른 워커가 아직 처리 중인(커밋 전) 공지 → 그 공지에 달린 제출은 다음 claim으로 미룸
+# 미처리 공지 전체에서 잠기지 않은 공지(실패했거나 아무도 안 잡은 공지)를 빼면 "처리 중"인 공지
+_SELECT_PENDING_ANNOUNCEMENTS_SQL = text("""
+    SELECT DISTINCT ts FROM slack_events
+    WHERE ts = ANY(CAST(:ts AS text[])) AND thread_ts IS NULL AND processed = FALSE
+""")
+
+_SELECT_UNLOCKED_ANNOUNCEMENTS_SQL = text("""
+    SELECT ts FROM slack_events
+    WHERE ts = ANY(CAST(:ts AS text[])) AND thread_ts IS NULL AND processed = FALSE
+    FOR SHARE SKIP LOCKED
+""")
+
+# 공지를 못 찾은 제출: 다음 시도 시각을 늦추고 processed는 그대로
+_SCHEDULE_ORPHAN_RETRY_SQL = text("""
+    UPDATE slack_events
+    SET retry_count = retry_count + 1,
+        retry_at = now() AT TIME ZONE 'utc' + make_interval(secs => :base * power(2, retry_count))
+    WHERE id = ANY(CAST(:ids AS bigint[])) AND event_time BETWEEN :min_time AND :max_time
+""")
+
+# 배치 전체가 보류됐을 때 다시 claim하기 전 대기 시간 (다른 워커의 커밋 대기)
+_DEFER_BACKOFF = 0.2
+
+_SELECT_STUDENTS_SQL = text("""
+    SELECT slack_user_id, student_id FROM student
+    WHERE slack_user_id = ANY(CAST(:user_ids AS text[]))
+""")
+
+_INSERT_STUDENTS_SQL = text("""
+    INSERT INTO student (name, slack_user_id, password, class_id)
+    SELECT '미등록_' || u, u, 'TEMP', NULL
+    FROM unnest(CAST(:user_ids AS text[])) AS u
+    ON CONFLICT (slack_user_id) DO NOTHING
+    RETURNING slack_user_id, student_id
+""")
+
+_INSERT_SUBMISSIONS_SQL = text("""
+    INSERT INTO submission (
+        student_id, assignment_id,
+        content_text, file_url, file_name,
+        status, slack_thread_ts, submitted_at
+    )
+    SELECT t.student_id, t.assignment_id, t.content_text, t.file_url, t.file_name, 'COMPLETED', t.thread_ts, t.submitted_at
+    FROM unnest(
+        CAST(:student_ids AS uuid[]), CAST(:assignment_ids AS uuid[]),
+        CAST(:texts AS text[]), CAST(:file_urls AS text[]), CAST(:file_names AS text[]),
+        CAST(:thread_ts AS text[]), CAST(:submitted_at AS timestamp[])
+    ) AS t(student_id, assignment_id, content_text, file_url, file_name, thread_ts, submitted_at)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM submission s
+        WHERE s.student_id = t.student_id AND s.assignment_id = t.assignment_id
+    )
+    ON CONFLICT DO NOTHING
+""")
+
+
+async def process_pending_events(batch_size: int = PROCESSOR_BATCH_SIZE) -> int:
+    """
+    미처리 이벤트가 없을 때까지 batch_size씩 claim해서 처리. 처리 완료한 이벤트 수 반환.
+    여러 워커/프로세스가 동시에 돌려도 SKIP LOCKED 때문에 같은 행을 두 번 처리하지 않음.
+    """
+    total = 0
+    failed_ids: set[int] = set()
+    while True:
+        claimed, done, failed = await process_batch(batch_size, skip_ids=failed_ids)
+        total += done
+        failed_ids.update(failed)
+        if claimed < batch_size:
+            return total
+        if not done and not failed:
+            await asyncio.sleep(_DEFER_BACKOFF)
 
-        for row in rows:
-            try:
-                if row["thread_ts"] is None:
-                    await _handle_announcement(conn, row)
-                else:
-                    await _handle_submission(conn, row)
 
-                # 처리 완료 표시
-                await conn.execute("""
-                    UPDATE slack_events SET processed = TRUE WHERE id = $1
-                """, row["id"])
+async def process_batch(batch_size: int = PROCESSOR_BATCH_SIZE, skip_ids: set[int] | None = None) -> tuple[int, int, list[int]]:
+    """
+    한 트랜잭션 안에서 배치 하나를 claim → 처리 → processed 표시.
+    반환: (claim한 행 수, 처리 완료 수, 실패한 event id 목록)
+    """
+    async with get_session() as session:
+        async with session.begin():
+            rows = (await session.execute(
+                _CLAIM_SQL, {"limit": batch_size, "skip_ids": list(skip_ids or ())}
+            )).mappings().all()
+            if not rows:
+                return 0, 0, []
 
+            deferred_ids: set[int] = set()
+            try:
+                async with session.begin_nested():
+                    deferred_ids = await _process_rows(session, rows)
+                done_ids = [row["id"] for row in rows if row["id"] not in deferred_ids]
+                failed_ids = []
             except Exception as e:
-                print(f"[처리 실패] event_id={row['event_id']} / 이유: {e}")
+                # 배치 중 한 행 때문에 전체가 막히지 않도록 행 단위 savepoint로 재시도
+                log.warning("batch failed, retrying per row", rows=len(rows), error=str(e))
+                done_ids, failed_ids = [], []
+                for row in rows:
+                    try:
+                        async with session.begin_nested():
+                            deferred = await _process_rows(session, [row])
+                        if row["id"] in deferred:
+                            deferred_ids.add(row["id"])
+                        else:
+                            done_ids.append(row["id"])
+                    except Exception as row_error:
+                        failed_ids.append(row["id"])
+                        log.error("event failed", event_id=row["event_id"], error=str(row_error))
+
+            if done_ids:
+                done = set(done_ids)
+                done_times = [row["event_time"] for row in rows if row["id"] in done]
+                await session.execute(_MARK_PROCESSED_SQL, {
+                    "ids": done_ids, "min_time": min(done_times), "max_time": max(done_times),
+                })
 
+    log.info("batch processed", claimed=len(rows), done=len(done_ids), deferred=len(deferred_ids), failed=len(failed_ids))
+    return len(rows), len(done_ids), failed_ids
 
-async def _handle_announcement(conn, row):
+
+async def replay_batch(after_id: int, min_time: int, max_time: int, channel_id: str | None, limit: int) -> tuple[int | None, int, int]:
     """
-    thread_ts 없음 → 교수님 공지
-    assignment 테이블에 삽입. title/deadline은 LLM 붙이기 전까지 임시값.
+    저장된 이벤트를 id 순서로 limit개 다시 처리 (공지/제출 저장은 중복 없이 멱등).
+    반환: (마지막 id, 처리한 행 수, 보류한 행 수). 더 없으면 마지막 id는 None
     """
-    # 이미 등록된 공지인지 확인 (ts 기준)
-    existing = await conn.fetchrow("""
-        SELECT assignment_id FROM assignment WHERE slack_post_ts = $1
-    """, row["ts"])
+    async with get_session() as session:
+        async with session.begin():
+            rows = (await session.execute(_REPLAY_SQL, {
+                "after_id": after_id, "min_time": min_time, "max_time": max_time,
+                "channel_id": channel_id, "limit": limit,
+            })).mappings().all()
+            if not rows:
+                return None, 0, 0
+            deferred_ids = await _process_rows(session, rows)
+            done = [row for row in rows if row["id"] not in deferred_ids]
+            if done:
+                await session.execute(_MARK_PROCESSED_SQL, {
+                    "ids": [row["id"] for row in done],
+                    "min_time": min(row["event_time"] for row in done),
+                    "max_time": max(row["event_time"] for row in done),
+                })
+    return rows[-1]["id"], len(done), len(deferred_ids)
+
+
+async def _process_rows(session, rows) -> set[int]:
+    """반환: 이번에 처리하지 않고 미룬 event id (processed 표시 안 함)"""
+    # 같은 배치 안의 공지를 먼저 넣어야 그 공지에 달린 제출이 과제를 찾을 수 있음
+    await _handle_announcements(session, [row for row in rows if row["thread_ts"] is None])
+    return await _handle_submissions(session, [row for row in rows if row["thread_ts"] is not None])
 
-    if existing:
-        print(f"[공지 중복 스킵] ts={row['ts']}")
+
+async def _handle_announcements(session, rows):
+    """
+    thread_ts 없음 → 교수님 공지
+    assignment 테이블에 일괄 삽입. title/deadline은 LLM 붙이기 전까지 임시값.
+    이미 등록된 공지(ts 기준)는 건너뜀.
+    """
+    by_ts = {}
+    for row in rows:
+        by_ts.setdefault(row["ts"], row)
+    if not by_ts:
         return
 
-    await conn.execute("""
-        INSERT INTO assignment (
-            class_id, professor_id,
-            title, content,
-            deadline, slack_post_ts
-        ) VALUES (
-            NULL, NULL,
-            $1, $2,
-            NOW() + INTERVAL '7 days',
-            $3
-        )
-    """,
-        f"[미분류] {row['text'][:50] if row['text'] else '제목없음'}",
-        row["text"],
-        row["ts"]
-    )
-    print(f"[공지 저장] ts={row['ts']}")
+    await session.execute(_INSERT_ANNOUNCEMENTS_SQL, {
+        "titles": [f"[미분류] {row['text'][:50] if row['text'] else '제목없음'}" for row in by_ts.values()],
+        "contents": [row["text"] for row in by_ts.values()],
+        "ts": list(by_ts),
+    })
 
 
-async def _handle_submission(conn, row):
+async def _handle_submissions(session, rows) -> set[int]:
     """
     thread_ts 있음 → 학생 제출
-    1. thread_ts로 assignment 조회
-    2. user_id로 student 조회 (없으면 자동 등록)
-    3. submission 삽입
+    1. thread_ts 목록으로 assignment 일괄 조회
+    2. user_id 목록으로 student 일괄 조회 (없으면 일괄 자동 등록)
+    3. submission 일괄 삽입 (학생·과제당 첫 제출만)
+    공지가 다른 워커에서 아직 처리 중이면 해당 제출은 미룸 (반환값)
+    공지를 아예 못 찾은 제출도 ORPHAN_MAX_RETRIES번까지는 백오프 후 다시 시도 (반환값에 포함)
     """
-    # 어떤 과제에 대한 제출인지 찾기
-    assignment = await conn.fetchrow("""
-        SELECT assignment_id FROM assignment WHERE slack_post_ts = $1
-    """, row["thread_ts"])
+    if not rows:
+        return set()
 
-    if not assignment:
-        print(f"[과제 없음 스킵] thread_ts={row['thread_ts']} - 공지가 아직 처리 안 됐거나 없는 공지")
-        return
+    # 어떤 과제에 대한 제출인지 한 번에 찾기
+    thread_ts = list({row["thread_ts"] for row in rows})
+    assignments = {
+        r.slack_post_ts: r.assignment_id
+        for r in await session.execute(_SELECT_ASSIGNMENTS_SQL, {"ts": thread_ts})
+    }
 
-    # 학생 조회 또는 자동 등록
-    student = await conn.fetchrow("""
-        SELECT student_id FROM student WHERE slack_user_id = $1
-    """, row["user_id"])
-
-    if not student:
-        student = await conn.fetchrow("""
-            INSERT INTO student (name, slack_user_id, password, class_id)
-            VALUES ($1, $2, 'TEMP', NULL)
-            RETURNING student_id
-        """, f"미등록_{row['user_id']}", row["user_id"])
-        print(f"[학생 자동 등록] slack_user_id={row['user_id']}")
-
-    # 중복 제출 확인
-    existing = await conn.fetchrow("""
-        SELECT submission_id FROM submission
-        WHERE student_id = $1 AND assignment_id = $2
-    """, student["student_id"], assignment["assignment_id"])
-
-    if existing:
-        print(f"[제출 중복 스킵] student={row['user_id']}")
-        return
+    deferred = set()
+    unknown_ts = [ts for ts in thread_ts if ts not in assignments]
+    if unknown_ts:
+        pending_ts = set((await session.scalars(_SELECT_PENDING_ANNOUNCEMENTS_SQL, {"ts": unknown_ts})).all())
+        if pending_ts:
+            pending_ts -= set((await session.scalars(_SELECT_UNLOCKED_ANNOUNCEMENTS_SQL, {"ts": list(pending_ts)})).all())
+        deferred = {row["id"] for row in rows if row["thread_ts"] in pending_ts}
+
+    orphans = [row for row in rows if row["thread_ts"] not in assignments and row["id"] not in deferred]
+    if orphans:
+        # 실시간 공지는 slack_events 없이 저장되므로 아직 저장 중(LLM 파싱)이거나 실패했을 수 있음
+        # → 백오프로 몇 번 더 기다려 보고, 그래도 없으면 과제 공지가 아닌 스레드로 보고 포기
+        await _schedule_orphan_retries(session, orphans, deferred)
+
+    rows = [row for row in rows if row["thread_ts"] in assignments]
+    if not rows:
+        return deferred
+
+    students = await _resolve_students(session, {row["user_id"] for row in rows})
+
+    # 첨부 파일 중 첫 번째 파일 사용 (여러 파일이면 나중에 확장)
+    submissions = {}
+    for row in rows:
+        key = (students[row["user_id"]], assignments[row["thread_ts"]])
+        submissions.setdefault(key, row)
+
+    await session.execute(_INSERT_SUBMISSIONS_SQL, {
+        "student_ids": [student_id for student_id, _ in submissions],
+        "assignment_ids": [assignment_id for _, assignment_id in submissions],
+        "texts": [row["text"] for row in submissions.values()],
+        "file_urls": [_first_file(row).get("url") for row in submissions.values()],
+        "file_names": [_first_file(row).get("name") for row in submissions.values()],
+        "thread_ts": [row["thread_ts"] for row in submissions.values()],
+        # 댓글 작성 시각 (마감일과 같은 시간대) → assignment_stats 지각 집계
+        "submitted_at": [posted_at_from_ts(row["ts"]) for row in submissions.values()],
+    })
+    return deferred
+
+
+async def _schedule_orphan_retries(session, rows, deferred: set[int]):
+    """공지를 못 찾은 제출: 재시도 횟수가 남았으면 retry_at을 늦추고 deferred에 추가"""
+    retry = [row for row in rows if row["retry_count"] < ORPHAN_MAX_RETRIES]
+    if retry:
+        await session.execute(_SCHEDULE_ORPHAN_RETRY_SQL, {
+            "ids": [row["id"] for row in retry], "base": ORPHAN_RETRY_BASE,
+            "min_time": min(row["event_time"] for row in retry),
+            "max_time": max(row["event_time"] for row in retry),
+        })
+        deferred.update(row["id"] for row in retry)
+        log.info("submissions waiting for assignment", count=len(retry))
+    given_up = len(rows) - len(retry)
+    if given_up:
+        log.warning("submissions without assignment skipped", count=given_up, retries=ORPHAN_MAX_RETRIES)
+
+
+def _first_file(row) -> dict:
+    return row["files"][0] if row["files"] else {}
+
+
+async def _resolve_students(session, user_ids: set[str]) -> dict:
+    """slack_user_id → student_id. 캐시 → 일괄 조회 → 없으면 일괄 자동 등록"""
+    resolved = {}
+    for user_id in user_ids:
+        student_id = student_cache.get(user_id, None)
+        if student_id:
+            resolved[user_id] = student_id
+
+    missing = list(user_ids - resolved.keys())
+    if missing:
+        for r in await session.execute(_SELECT_STUDENTS_SQL, {"user_ids": missing}):
+            resolved[r.slack_user_id] = r.student_id
+            # 이미 커밋된 행이므로 바로 캐싱해도 안전
+            student_cache.set(r.slack_user_id, r.student_id)
+
+    missing = list(user_ids - resolved.keys())
+    if missing:
+        for r in await session.execute(_INSERT_STUDENTS_SQL, {"user_ids": missing}):
+            resolved[r.slack_user_id] = r.student_id
+        log.info("students auto-registered", count=len(missing))
+
+        # 다른 워커가 동시에 등록해서 ON CONFLICT로 빠진 학생은 다시 조회
+        missing = list(user_ids - resolved.keys())
+        if missing:
+            for r in await session.execute(_SELECT_STUDENTS_SQL, {"user_ids": missing}):
+                resolved[r.slack_user_id] = r.student_id
+
+    return resolved
 
-    # 파일 URL 중 첫 번째 파일 사용 (여러 파일이면 나중에 확장)
-    file_url = row["file_1_url"]
-    file_name = row["file_1_name"]
-
-    await conn.execute("""
-        INSERT INTO submission (
-            student_id, assignment_id,
-            content_text, file_url, file_name,
-            status, slack_thread_ts
-        ) VALUES ($1, $2, $3, $4, $5, 'COMPLETED', $6)
-    """,
-        student["student_id"],
-        assignment["assignment_id"],
-        row["text"],
-        file_url,
-        file_name,
-        row["thread_ts"]
-    )
-    print(f"[제출 저장] student={row['user_id']} / assignment={assignment['assignment_id']}")
+
+async def run_workers(workers: int = PROCESSOR_WORKERS, batch_size: int = PROCESSOR_BATCH_SIZE) -> int:
+    """한 프로세스 안에서 여러 워커로 병렬 처리"""
+    results = await asyncio.gather(*[process_pending_events(batch_size) for _ in range(workers)])
+    return sum(results)
+
+
+async def check_notify_trigger() -> bool:
+    """NOTIFY 트리거는 migrations/0001에서 설치. 없으면 폴링으로만 동작"""
+    async with engine.connect() as conn:
+        installed = await conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'slack_events_notify' AND tgrelid = 'slack_events'::regclass)"
+        ))
+    if not installed:
+        log.warning("notify trigger missing, falling back to polling; run migrate.py", poll_interval=PROCESSOR_POLL_INTERVAL)
+    return installed
+
+
+async def _listen_loop(
+    listener, wake: asyncio.Event, stop: asyncio.Event, background_wake: list[asyncio.Event],
+    workers: int, batch_size: int, poll_interval: float,
+):
+    # 연결 직후 한 번 처리: 리스너가 없던 동안 쌓인 이벤트
+    wake.set()
+    while not stop.is_set():
+        if not wake.is_set():
+            stop_wait = asyncio.create_task(stop.wait())
+            wake_wait = asyncio.create_task(wake.wait())
+            done, pending = await asyncio.wait(
+                {stop_wait, wake_wait},
+                timeout=poll_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in pending:
+                task.cancel()
+            if stop.is_set():
+                break
+            if not done:
+                # 폴링 주기 도달: 리스너 연결이 살아있는지 확인 후 처리
+                await listener.execute("SELECT 1")
+
+        wake.clear()
+        processed = await run_workers(workers, batch_size)
+        if processed:
+            log.info("daemon processed", count=processed)
+            # 새 제출 → 파일 받기, 요구사항 검증
+            for event in background_wake:
+                event.set()
+
+
+async def run_daemon(
+    workers: int = PROCESSOR_WORKERS,
+    batch_size: int = PROCESSOR_BATCH_SIZE,
+    poll_interval: float = PROCESSOR_POLL_INTERVAL,
+):
+    """
+    상주 프로세서: slack_events INSERT 트리거의 NOTIFY를 받으면 바로 새 이벤트만 처리.
+    NOTIFY를 놓쳐도 poll_interval마다 한 번은 확인. 리스너 연결이 끊기면 재연결.
+    월별 파티션 생성/보관(partitions.py), 제출 파일 받기(file_store.py), 요구사항 검증(verifier.py)도
+    백그라운드로 같이 실행.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await check_notify_trigger()
+    maintenance = asyncio.create_task(run_partition_maintenance(stop))
+    files_wake = asyncio.Event()
+    fetcher = asyncio.create_task(run_file_fetcher(stop, files_wake))
+    verify_wake = asyncio.Event()
+    verification = asyncio.create_task(run_verifier(stop, verify_wake))
+    log.info("daemon started", channel=NOTIFY_CHANNEL, workers=workers, poll_interval=poll_interval)
+
+    while not stop.is_set():
+        wake = asyncio.Event()
+        try:
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                listener = raw.driver_connection
+                on_notify = lambda *_: wake.set()
+                await listener.add_listener(NOTIFY_CHANNEL, on_notify)
+                try:
+                    await _listen_loop(listener, wake, stop, [files_wake, verify_wake], workers, batch_size, poll_interval)
+                finally:
+                    # 커넥션이 풀로 돌아가므로 리스너 해제
+                    if not listener.is_closed():
+                        await listener.remove_listener(NOTIFY_CHANNEL, on_notify)
+        except Exception as e:
+            log.error("listener failed, reconnecting in 5s", error=str(e))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+
+    await asyncio.gather(maintenance, fetcher, verification)
+    await dispose()
+    log.info("daemon stopped")
 
 
 async def save_announcement(event: dict, parsed: dict):
     from db import get_session
-    from models import Professor, Class, Assignment, AssignmentRequirement
+    from models import Assignment, AssignmentRequirement
+    from identity import get_professor_id, get_class_id
     from sqlalchemy import select
+    from sqlalchemy.exc import IntegrityError
 
     async with get_session() as session:
 
@@ -141,28 +481,23 @@ async def save_announcement(event: dict, parsed: dict):
             select(Assignment).where(Assignment.slack_post_ts == event.get("ts"))
         )
         if existing:
-            print(f"[공지 중복 스킵] ts={event.get('ts')}")
+            log.info("duplicate announcement skipped", ts=event.get("ts"))
             return
 
-        # professor 조회
-        professor = await session.scalar(
-            select(Professor).where(Professor.slack_user_id == event.get("user"))
-        )
-        if not professor:
-            print(f"[경고] professor 없음: slack_user_id={event.get('user')}")
+        # professor / class 조회 (identity 캐시)
+        professor_id = await get_professor_id(event.get("user"))
+        if not professor_id:
+            log.warning("professor not found", slack_user_id=event.get("user"))
 
-        # class 조회
-        class_row = await session.scalar(
-            select(Class).where(Class.slack_channel_id == event.get("channel"))
-        )
+        class_id = await get_class_id(event.get("channel"))
 
         # deadline 문자열 → datetime
         deadline = datetime.fromisoformat(parsed["deadline"])
 
         # assignment INSERT
         assignment = Assignment(
-            class_id=class_row.class_id if class_row else None,
-            professor_id=professor.professor_id if professor else None,
+            class_id=class_id,
+            professor_id=professor_id,
             title=parsed.get("title"),
             content=parsed.get("content"),
             topic=parsed.get("topic"),
@@ -170,8 +505,15 @@ async def save_announcement(event: dict, parsed: dict):
             slack_post_ts=event.get("ts"),
         )
         session.add(assignment)
-        await session.flush()  # assignment_id 확보
-        print(f"[과제 저장] assignment_id={assignment.assignment_id}")
+        try:
+            with stage_seconds.time(stage="save_flush"):
+                await session.flush()  # assignment_id 확보
+        except IntegrityError:
+            # 중복 체크 이후 다른 워커/processor가 같은 공지를 먼저 저장 (ux_assignment_slack_post_ts)
+            await session.rollback()
+            log.info("duplicate announcement skipped", ts=event.get("ts"))
+            return
+        log.debug("assignment flushed", assignment_id=assignment.assignment_id)
 
         # requirements INSERT
         requirements = [
@@ -179,9 +521,21 @@ async def save_announcement(event: dict, parsed: dict):
             for req in parsed.get("requirements", [])
         ]
         session.add_all(requirements)
-        await session.commit()
-        print(f"[요구사항 저장] {len(requirements)}개")
+        with stage_seconds.time(stage="save_commit"):
+            await session.commit()
+        log.info("assignment saved", assignment_id=assignment.assignment_id, requirements=len(requirements))
 
 
 if __name__ == "__main__":
-    asyncio.run(process_pending_events())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="slack_events 미처리 이벤트 처리")
+    parser.add_argument("--workers", type=int, default=PROCESSOR_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=PROCESSOR_BATCH_SIZE)
+    parser.add_argument("--daemon", action="store_true", help="NOTIFY를 기다리며 계속 처리")
+    parser.add_argument("--poll-interval", type=float, default=PROCESSOR_POLL_INTERVAL)
+    args = parser.parse_args()
+
+    if args.daemon:
+        asyncio.run(run_daemon(args.workers, args.batch_size, args.poll_interval))
+    else:
+        processed = asyncio.run(run_workers(args.workers, args.batch_size))
+        log.info("processing finished", count=processed)
\ No newline at end of file
@@ -0,0 +1,39 @@
+import os
+import hmac
+from fastapi import APIRouter, Header, HTTPException
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import identity
+
+load_dotenv()
+
+router = APIRouter()
+
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+
+class InvalidateCacheRequest(BaseModel):
+    slack_user_id: str | None = None
+    channel_id: str | None = None
+    all: bool = False
+
+
+def check_admin_token(token: str | None):
+    # str끼리 비교하면 ASCII가 아닌 헤더 값에서 TypeError(500) → bytes로 비교
+    if not ADMIN_API_TOKEN or not token or not hmac.compare_digest(token.encode(), ADMIN_API_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="관리자 권한이 없습니다.")
+
+
+@router.post("/admin/cache/invalidate")
+async def invalidate_cache(req: InvalidateCacheRequest, x_admin_token: str | None = Header(default=None)):
+    """교수님/수업/학생 정보를 DB에서 직접 수정한 뒤 호출"""
+    check_admin_token(x_admin_token)
+
+    if req.all:
+        identity.invalidate_all()
+    if req.slack_user_id:
+        identity.invalidate_user(req.slack_user_id)
+    if req.channel_id:
+        identity.invalidate_channel(req.channel_id)
+
+    return {"ok": True}
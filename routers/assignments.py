@@ -0,0 +1,261 @@
+"""
+대시보드용 과제/제출 조회 API (읽기 전용, DATABASE_READ_URL 레플리카 사용).
+
+- 키셋(cursor) 페이지네이션: 응답의 next_cursor를 다음 요청의 cursor로 (OFFSET 없이 인덱스로 바로 이동)
+- 요구사항/검증 결과는 페이지 단위로 IN 조회 한 번씩 → 페이지 크기와 관계없이 쿼리 수 고정
+- 제출 수 등 집계는 assignment_stats(트리거로 갱신)에서 읽음 → 제출이 많아도 집계 비용 없음
+- ETag: 같은 응답이면 If-None-Match에 304로 응답 (폴링 시 본문 전송·파싱 생략)
+"""
+import os
+import json
+import uuid
+import base64
+import hashlib
+from datetime import datetime
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from pydantic import BaseModel
+from sqlalchemy import select, func, tuple_
+from dotenv import load_dotenv
+from db import get_read_session
+from models import Assignment, AssignmentRequirement, AssignmentStats, Class, Student, Submission, VerificationResult
+from routers.admin import check_admin_token
+
+load_dotenv()
+
+router = APIRouter()
+
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "50"))
+DASHBOARD_PAGE_SIZE_MAX = int(os.getenv("DASHBOARD_PAGE_SIZE_MAX", "200"))
+
+
+class RequirementOut(BaseModel):
+    requirement_id: int
+    content: str
+
+
+class AssignmentOut(BaseModel):
+    assignment_id: uuid.UUID
+    class_id: uuid.UUID | None
+    title: str
+    topic: str | None
+    deadline: datetime
+    slack_post_ts: str | None
+    created_at: datetime | None
+    requirements: list[RequirementOut]
+    roster_size: int
+    submission_count: int
+    late_count: int
+    # 검증이 끝난 제출 / 그중 요구사항을 모두 충족한 제출
+    verified_count: int
+    met_count: int
+
+
+class AssignmentDetailOut(AssignmentOut):
+    content: str | None
+
+
+class AssignmentStatsOut(BaseModel):
+    assignment_id: uuid.UUID
+    roster_size: int
+    submitted: int
+    late: int
+    verified: int
+    met: int
+    updated_at: datetime | None
+
+
+class AssignmentPage(BaseModel):
+    items: list[AssignmentOut]
+    next_cursor: str | None
+
+
+class VerificationOut(BaseModel):
+    requirement_id: int
+    is_met: bool
+    feedback: str | None
+
+
+class SubmissionOut(BaseModel):
+    submission_id: int
+    student_id: uuid.UUID | None
+    student_name: str | None
+    slack_user_id: str | None
+    content_text: str | None
+    file_name: str | None
+    file_size: int | None
+    status: str | None
+    is_met_requirements: bool | None
+    submitted_at: datetime | None
+    verification: list[VerificationOut]
+
+
+class SubmissionPage(BaseModel):
+    items: list[SubmissionOut]
+    next_cursor: str | None
+
+
+def _encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, *types) -> list:
+    """cursor → 값 목록 (types 순서대로 변환)"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return [convert(value) for convert, value in zip(types, values, strict=True)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor입니다.")
+
+
+def _etag_response(request: Request, body: BaseModel) -> Response:
+    """본문 해시를 ETag로. If-None-Match가 같으면 본문 없이 304"""
+    content = body.model_dump_json().encode()
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    # 브라우저가 캐시하더라도 매번 ETag로 재검증
+    return Response(content, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+async def _load_assignments(session, rows, model: type[AssignmentOut] = AssignmentOut) -> list[AssignmentOut]:
+    """과제 행 목록 → 요구사항을 붙인 응답 (쿼리 1번)"""
+    requirements: dict[uuid.UUID, list[RequirementOut]] = {}
+    ids = [row.assignment_id for row in rows]
+    if ids:
+        for req in await session.execute(
+            select(AssignmentRequirement.assignment_id, AssignmentRequirement.requirement_id, AssignmentRequirement.content)
+            .where(AssignmentRequirement.assignment_id.in_(ids))
+            .order_by(AssignmentRequirement.requirement_id)
+        ):
+            requirements.setdefault(req.assignment_id, []).append(
+                RequirementOut(requirement_id=req.requirement_id, content=req.content)
+            )
+    return [model(**row._mapping, requirements=requirements.get(row.assignment_id, [])) for row in rows]
+
+
+def _select_assignments(*extra):
+    """과제 컬럼 + assignment_stats 집계 (통계 행이 아직 없으면 0)"""
+    return select(
+        Assignment.assignment_id, Assignment.class_id, Assignment.title, Assignment.topic,
+        Assignment.deadline, Assignment.slack_post_ts, Assignment.created_at, *extra,
+        func.coalesce(AssignmentStats.roster_size, 0).label("roster_size"),
+        func.coalesce(AssignmentStats.submitted, 0).label("submission_count"),
+        func.coalesce(AssignmentStats.late, 0).label("late_count"),
+        func.coalesce(AssignmentStats.verified, 0).label("verified_count"),
+        func.coalesce(AssignmentStats.met, 0).label("met_count"),
+    ).outerjoin(AssignmentStats, AssignmentStats.assignment_id == Assignment.assignment_id)
+
+
+@router.get("/classes/{class_id}/assignments", response_model=AssignmentPage)
+async def list_assignments(
+    class_id: uuid.UUID,
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(default=DASHBOARD_PAGE_SIZE, ge=1, le=DASHBOARD_PAGE_SIZE_MAX),
+    x_admin_token: str | None = Header(default=None),
+):
+    """수업의 과제 목록, 마감일 최신순"""
+    check_admin_token(x_admin_token)
+
+    stmt = (
+        _select_assignments()
+        .where(Assignment.class_id == class_id)
+        .order_by(Assignment.deadline.desc(), Assignment.assignment_id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        deadline, after_id = _decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+        stmt = stmt.where(tuple_(Assignment.deadline, Assignment.assignment_id) < tuple_(deadline, after_id))
+
+    async with get_read_session() as session:
+        rows = (await session.execute(stmt)).all()
+        if not rows and not cursor and await session.get(Class, class_id) is None:
+            raise HTTPException(status_code=404, detail="수업을 찾을 수 없습니다.")
+        items = await _load_assignments(session, rows[:limit])
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_cursor([last.deadline.isoformat(), str(last.assignment_id)])
+    return _etag_response(request, AssignmentPage(items=items, next_cursor=next_cursor))
+
+
+@router.get("/assignments/{assignment_id}", response_model=AssignmentDetailOut)
+async def get_assignment(assignment_id: uuid.UUID, request: Request, x_admin_token: str | None = Header(default=None)):
+    check_admin_token(x_admin_token)
+
+    async with get_read_session() as session:
+        rows = (await session.execute(
+            _select_assignments(Assignment.content).where(Assignment.assignment_id == assignment_id)
+        )).all()
+        if not rows:
+            raise HTTPException(status_code=404, detail="과제를 찾을 수 없습니다.")
+        items = await _load_assignments(session, rows, AssignmentDetailOut)
+    return _etag_response(request, items[0])
+
+
+@router.get("/assignments/{assignment_id}/stats", response_model=AssignmentStatsOut)
+async def get_assignment_stats(assignment_id: uuid.UUID, request: Request, x_admin_token: str | None = Header(default=None)):
+    """제출/지각/충족 수 + 수강생 수. 통계 테이블 PK 조회 한 번 (대시보드 폴링용)"""
+    check_admin_token(x_admin_token)
+
+    async with get_read_session() as session:
+        stats = await session.get(AssignmentStats, assignment_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="과제를 찾을 수 없습니다.")
+    return _etag_response(request, AssignmentStatsOut.model_validate(stats, from_attributes=True))
+
+
+@router.get("/assignments/{assignment_id}/submissions", response_model=SubmissionPage)
+async def list_submissions(
+    assignment_id: uuid.UUID,
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(default=DASHBOARD_PAGE_SIZE, ge=1, le=DASHBOARD_PAGE_SIZE_MAX),
+    x_admin_token: str | None = Header(default=None),
+):
+    """과제의 제출 목록 (제출 순서), 학생 정보 + 요구사항별 검증 결과 포함"""
+    check_admin_token(x_admin_token)
+
+    stmt = (
+        select(
+            Submission.submission_id, Submission.student_id, Student.name.label("student_name"), Student.slack_user_id,
+            Submission.content_text, Submission.file_name, Submission.file_size, Submission.status,
+            Submission.is_met_requirements, Submission.submitted_at,
+        )
+        .outerjoin(Student, Student.student_id == Submission.student_id)
+        .where(Submission.assignment_id == assignment_id)
+        .order_by(Submission.submission_id)
+        .limit(limit + 1)
+    )
+    if cursor:
+        (after_id,) = _decode_cursor(cursor, int)
+        stmt = stmt.where(Submission.submission_id > after_id)
+
+    async with get_read_session() as session:
+        rows = (await session.execute(stmt)).all()
+        if not rows and not cursor and await session.get(Assignment, assignment_id) is None:
+            raise HTTPException(status_code=404, detail="과제를 찾을 수 없습니다.")
+
+        verification: dict[int, list[VerificationOut]] = {}
+        ids = [row.submission_id for row in rows[:limit]]
+        if ids:
+            for result in await session.execute(
+                select(
+                    VerificationResult.submission_id, VerificationResult.requirement_id,
+                    VerificationResult.is_met, VerificationResult.feedback,
+                )
+                .where(VerificationResult.submission_id.in_(ids))
+                .order_by(VerificationResult.submission_id, VerificationResult.requirement_id)
+            ):
+                verification.setdefault(result.submission_id, []).append(VerificationOut(
+                    requirement_id=result.requirement_id, is_met=result.is_met, feedback=result.feedback,
+                ))
+
+    items = [
+        SubmissionOut(**row._mapping, verification=verification.get(row.submission_id, []))
+        for row in rows[:limit]
+    ]
+    next_cursor = _encode_cursor([rows[limit - 1].submission_id]) if len(rows) > limit else None
+    return _etag_response(request, SubmissionPage(items=items, next_cursor=next_cursor))
@@ -1,30 +1,41 @@
 import os
-import ssl
+import hmac
 import random
 import string
 import uuid
-import bcrypt
-import certifi
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
 from sqlalchemy.exc import IntegrityError
 from dotenv import load_dotenv
 from db import get_session
 from models import Student
+import identity
+import passwords
+from kvstore import kv_store
+from slack_api import slack, SlackApiError
+from log import get_logger
 
 load_dotenv()
 
 router = APIRouter()
+log = get_logger("auth")
 
-_ssl_context = ssl.create_default_context(cafile=certifi.where())
-slack_client = WebClient(token=os.getenv("SLACK_BOT_TOKEN"), ssl=_ssl_context)
+VERIFICATION_CODE_TTL = int(os.getenv("VERIFICATION_CODE_TTL", "300"))
+# 인증 후 가입까지 허용 시간
+VERIFIED_TOKEN_TTL = int(os.getenv("VERIFIED_TOKEN_TTL", "1800"))
 
-# 인메모리 임시 저장소
-pending_verifications: dict = {}  # {slack_user_id: {"code": str, "expires_at": datetime}}
-verified_tokens: dict = {}        # {temp_token: slack_user_id}
+# kv_store 키 (KV_STORE_BACKEND=postgres면 워커/인스턴스 간 공유)
+# verify:{slack_user_id} → {"code": str, "expires_at": iso datetime}
+# token:{temp_token}     → slack_user_id
+
+
+def _code_key(slack_user_id: str) -> str:
+    return f"verify:{slack_user_id}"
+
+
+def _token_key(temp_token: str) -> str:
+    return f"token:{temp_token}"
 
 
 class SendCodeRequest(BaseModel):
@@ -47,25 +58,31 @@ class SignupRequest(BaseModel):
 @router.post("/auth/slack/send-code")
 async def send_verification_code(req: SendCodeRequest):
     try:
-        result = slack_client.users_lookupByEmail(email=req.email)
+        result = await slack.get("users.lookupByEmail", email=req.email)
         user = result["user"]
         slack_user_id = user["id"]
-    except SlackApiError:
+    except SlackApiError as e:
+        log.info("slack lookup failed", email=req.email, error=e.error)
         raise HTTPException(status_code=404, detail="해당 이메일로 가입된 Slack 계정을 찾을 수 없습니다.")
 
     if user.get("deleted"):
         raise HTTPException(status_code=400, detail="비활성화된 Slack 계정입니다.")
 
     code = "".join(random.choices(string.digits, k=6))
-    expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=5)
-    pending_verifications[slack_user_id] = {"code": code, "expires_at": expires_at}
+    expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=VERIFICATION_CODE_TTL)
+    # "만료됨" 응답을 줄 수 있도록 저장소에는 두 배 동안 보관
+    await kv_store.set(
+        _code_key(slack_user_id), {"code": code, "expires_at": expires_at.isoformat()}, ttl=VERIFICATION_CODE_TTL * 2
+    )
 
     try:
-        slack_client.chat_postMessage(
+        await slack.post(
+            "chat.postMessage",
             channel=slack_user_id,
-            text=f"🔐 인증코드: *{code}*\n5분 내에 입력해주세요."
+            text=f"🔐 인증코드: *{code}*\n{VERIFICATION_CODE_TTL // 60}분 내에 입력해주세요."
         )
-    except SlackApiError:
+    except SlackApiError as e:
+        log.error("verification dm failed", slack_user_id=slack_user_id, error=e.error)
         raise HTTPException(status_code=500, detail="DM 전송에 실패했습니다.")
 
     return {"message": "인증코드가 DM으로 전송되었습니다.", "slack_user_id": slack_user_id}
@@ -73,32 +90,37 @@ async def send_verification_code(req: SendCodeRequest):
 
 @router.post("/auth/slack/verify-code")
 async def verify_code(req: VerifyCodeRequest):
-    entry = pending_verifications.get(req.slack_user_id)
+    entry = await kv_store.get(_code_key(req.slack_user_id))
     if not entry:
         raise HTTPException(status_code=400, detail="인증코드를 먼저 요청해주세요.")
 
-    if datetime.now(timezone.utc).replace(tzinfo=None) > entry["expires_at"]:
-        del pending_verifications[req.slack_user_id]
+    if datetime.now(timezone.utc).replace(tzinfo=None) > datetime.fromisoformat(entry["expires_at"]):
+        await kv_store.delete(_code_key(req.slack_user_id))
         raise HTTPException(status_code=400, detail="인증코드가 만료되었습니다.")
 
-    if entry["code"] != req.code:
+    if not hmac.compare_digest(entry["code"].encode(), req.code.encode()):
         raise HTTPException(status_code=400, detail="인증코드가 일치하지 않습니다.")
 
-    del pending_verifications[req.slack_user_id]
+    # 같은 코드로 동시에 들어온 요청 중 하나만 통과
+    if await kv_store.pop(_code_key(req.slack_user_id)) is None:
+        raise HTTPException(status_code=400, detail="인증코드를 먼저 요청해주세요.")
 
     temp_token = str(uuid.uuid4())
-    verified_tokens[temp_token] = req.slack_user_id
+    await kv_store.set(_token_key(temp_token), req.slack_user_id, ttl=VERIFIED_TOKEN_TTL)
 
     return {"message": "인증 성공", "temp_token": temp_token}
 
 
 @router.post("/auth/signup")
 async def signup(req: SignupRequest):
-    slack_user_id = verified_tokens.get(req.temp_token)
+    slack_user_id = await kv_store.get(_token_key(req.temp_token))
     if not slack_user_id:
         raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다. 인증을 다시 진행해주세요.")
 
-    hashed_pw = bcrypt.hashpw(req.password.encode(), bcrypt.gensalt()).decode()
+    try:
+        hashed_pw = await passwords.hash_password(req.password)
+    except passwords.HasherBusyError:
+        raise HTTPException(status_code=503, detail="가입 요청이 많습니다. 잠시 후 다시 시도해주세요.")
     now = datetime.now(timezone.utc).replace(tzinfo=None)
 
     student = Student(
@@ -118,8 +140,11 @@ async def signup(req: SignupRequest):
             await session.refresh(student)
         except IntegrityError:
             await session.rollback()
+            log.info("signup conflict", slack_user_id=slack_user_id)
             raise HTTPException(status_code=409, detail="이미 가입된 Slack 계정입니다.")
 
-    del verified_tokens[req.temp_token]
+    await kv_store.delete(_token_key(req.temp_token))
+    identity.invalidate_user(slack_user_id)
+    log.info("signup completed", slack_user_id=slack_user_id, student_id=str(student.student_id))
 
     return {"student_id": str(student.student_id)}
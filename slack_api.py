@@ -0,0 +1,249 @@
+import os
+import json
+import time
+import random
+import asyncio
+from typing import AsyncIterator
+import httpx
+from dotenv import load_dotenv
+from cache import single_flight
+from log import get_logger
+
+load_dotenv()
+
+SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
+SLACK_API_BASE_URL = os.getenv("SLACK_API_BASE_URL", "https://slack.com/api")
+SLACK_API_TIMEOUT = float(os.getenv("SLACK_API_TIMEOUT", "10"))
+SLACK_API_MAX_CONNECTIONS = int(os.getenv("SLACK_API_MAX_CONNECTIONS", "20"))
+# 429 / 5xx / 네트워크 오류 재시도 횟수
+SLACK_API_MAX_RETRIES = int(os.getenv("SLACK_API_MAX_RETRIES", "3"))
+# 메서드별 토큰 버킷 최대 버스트
+SLACK_RATE_BURST = int(os.getenv("SLACK_RATE_BURST", "5"))
+# 메서드별 분당 호출 한도 덮어쓰기, 예: "users.info:200,chat.postMessage:30"
+SLACK_RATE_LIMITS = {
+    method.strip(): float(limit)
+    for method, limit in (item.split(":", 1) for item in os.getenv("SLACK_RATE_LIMITS", "").split(",") if ":" in item)
+}
+
+# Slack Web API 티어별 분당 한도 (https://api.slack.com/apis/rate-limits)
+_TIER_2, _TIER_3, _TIER_4 = 20, 50, 100
+_DEFAULT_RATE_LIMITS = {
+    "users.list": _TIER_2,
+    "users.lookupByEmail": _TIER_3,
+    "conversations.history": _TIER_3,
+    "conversations.replies": _TIER_3,
+    "users.info": _TIER_4,
+    "conversations.members": _TIER_4,
+    # chat.postMessage는 채널당 초당 1건 정도 (특수 티어)
+    "chat.postMessage": 60,
+}
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+log = get_logger("slack_api")
+
+
+class SlackApiError(Exception):
+    def __init__(self, method: str, error: str | None):
+        super().__init__(f"{method}: {error}")
+        self.method = method
+        self.error = error
+
+
+class TokenBucket:
+    """분당 rate건, 최대 burst건까지 몰아서 허용. 429를 받으면 pause로 버킷 전체를 멈춤"""
+
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, min(burst, int(per_minute)))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        # Retry-After가 지나면 한 건만 바로 보내고 이후는 원래 속도로
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = min(self._tokens, 1.0)
+        self._updated = self._paused_until
+
+    async def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 대기, 기다린 시간(초) 반환"""
+        started = time.monotonic()
+        # 순서대로 한 명씩 토큰을 기다림 (먼저 온 요청이 먼저)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SlackClient:
+    """
+    앱 전체가 공유하는 Slack Web API 클라이언트.
+    - keep-alive 커넥션 풀 (h2가 설치돼 있으면 HTTP/2)
+    - 메서드별 토큰 버킷으로 티어 한도 안에서 호출
+    - 429는 Retry-After만큼 해당 메서드 전체를 멈춘 뒤 재시도
+    - 같은 인자의 조회(get)가 동시에 들어오면 한 번만 호출하고 결과 공유
+    """
+
+    def __init__(self, token: str | None, base_url: str = SLACK_API_BASE_URL):
+        self.token = token
+        self.base_url = base_url
+        self._client: httpx.AsyncClient | None = None
+        self._buckets: dict[str, TokenBucket] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.errors = 0
+        self.throttled_seconds = 0.0
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=SLACK_API_TIMEOUT,
+                http2=_HTTP2,
+                limits=httpx.Limits(
+                    max_connections=SLACK_API_MAX_CONNECTIONS,
+                    max_keepalive_connections=SLACK_API_MAX_CONNECTIONS,
+                ),
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _bucket(self, method: str) -> TokenBucket:
+        bucket = self._buckets.get(method)
+        if bucket is None:
+            per_minute = SLACK_RATE_LIMITS.get(method, _DEFAULT_RATE_LIMITS.get(method, _TIER_3))
+            bucket = self._buckets[method] = TokenBucket(per_minute, SLACK_RATE_BURST)
+        return bucket
+
+    async def _request(self, method: str, params: dict | None = None, payload: dict | None = None) -> dict:
+        await self.start()
+        bucket = self._bucket(method)
+        for attempt in range(SLACK_API_MAX_RETRIES + 1):
+            self.throttled_seconds += await bucket.acquire()
+            self.calls += 1
+            try:
+                if payload is None:
+                    response = await self._client.get(f"/{method}", params=params)
+                else:
+                    response = await self._client.post(f"/{method}", json=payload)
+            except httpx.TransportError as e:
+                if attempt == SLACK_API_MAX_RETRIES:
+                    self.errors += 1
+                    raise SlackApiError(method, f"transport_error: {e}") from e
+                self.retries += 1
+                await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+                continue
+
+            if response.status_code == 429:
+                self.rate_limited += 1
+                retry_after = float(response.headers.get("Retry-After", "1"))
+                bucket.pause(retry_after)
+                log.warning("rate limited", method=method, retry_after=retry_after, attempt=attempt)
+                if attempt == SLACK_API_MAX_RETRIES:
+                    self.errors += 1
+                    raise SlackApiError(method, "ratelimited")
+                self.retries += 1
+                continue
+
+            if response.status_code >= 500:
+                if attempt == SLACK_API_MAX_RETRIES:
+                    self.errors += 1
+                    raise SlackApiError(method, f"http_{response.status_code}")
+                self.retries += 1
+                await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+                continue
+
+            try:
+                data = response.json()
+            except ValueError:
+                # 프록시/게이트웨이의 HTML 오류 페이지 등 → 5xx처럼 일시 오류로 보고 재시도
+                log.warning("non-json response", method=method, status=response.status_code, attempt=attempt)
+                if attempt == SLACK_API_MAX_RETRIES:
+                    self.errors += 1
+                    raise SlackApiError(method, f"invalid_response: http_{response.status_code}")
+                self.retries += 1
+                await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+                continue
+            if not isinstance(data, dict) or not data.get("ok"):
+                self.errors += 1
+                raise SlackApiError(method, data.get("error") if isinstance(data, dict) else "invalid_response")
+            return data
+
+    async def get(self, method: str, **params) -> dict:
+        """조회용 호출. 같은 method+인자로 진행 중인 호출이 있으면 그 결과를 같이 받음"""
+        key = (method, json.dumps(params, sort_keys=True, default=str))
+
+        def on_wait():
+            self.coalesced += 1
+
+        return await single_flight(self._inflight, key, lambda: self._request(method, params=params), on_wait)
+
+    async def post(self, method: str, **payload) -> dict:
+        """쓰기 호출 (chat.postMessage 등). 합치지 않음"""
+        return await self._request(method, payload=payload)
+
+    async def paginate(self, method: str, key: str, **params) -> list:
+        """cursor 페이지네이션으로 key 목록을 끝까지 모음"""
+        items = []
+        cursor = None
+        while True:
+            page_params = {**params, "cursor": cursor} if cursor else params
+            data = await self.get(method, **page_params)
+            items.extend(data.get(key, []))
+            cursor = data.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                return items
+
+    async def download(self, url: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """url_private 파일을 chunk 단위로 스트리밍 (전체를 메모리에 올리지 않음). 레이트 리밋 대상 아님"""
+        await self.start()
+        try:
+            async with self._client.stream("GET", url, follow_redirects=True) as response:
+                if response.status_code != 200:
+                    self.errors += 1
+                    raise SlackApiError("files.download", f"http_{response.status_code}")
+                # 토큰에 files:read 권한이 없으면 200 + 로그인 HTML 페이지가 옴
+                if response.headers.get("content-type", "").startswith("text/html"):
+                    self.errors += 1
+                    raise SlackApiError("files.download", "not_authed")
+                async for chunk in response.aiter_bytes(chunk_size):
+                    yield chunk
+        except httpx.TransportError as e:
+            self.errors += 1
+            raise SlackApiError("files.download", f"transport_error: {e}") from e
+
+    def stats(self) -> dict:
+        return {
+            "http2": _HTTP2,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "errors": self.errors,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+slack = SlackClient(SLACK_BOT_TOKEN)
@@ -0,0 +1,48 @@
+import json
+import logging
+
+from log import JsonFormatter, StructLogger
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _logger(category: str) -> tuple[StructLogger, _Capture]:
+    capture = _Capture()
+    logger = logging.getLogger(f"app.{category}")
+    logger.handlers = [capture]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return StructLogger(category), capture
+
+
+def test_slack_ts_field_does_not_replace_record_time():
+    log, capture = _logger("test_ts")
+    log.info("message saved", ts="1710000000.123", channel="C1")
+
+    payload = json.loads(JsonFormatter().format(capture.records[0]))
+    assert payload["ts"] != "1710000000.123"
+    assert payload["ts"].endswith("+00:00")
+    assert payload["field_ts"] == "1710000000.123"
+    assert payload["channel"] == "C1"
+
+
+def test_level_and_msg_fields_are_kept_without_type_error():
+    log, capture = _logger("test_level")
+    log.warning("retry", level="high", msg="upstream", category="x")
+    log.error("failed", level=3)
+
+    payload = json.loads(JsonFormatter().format(capture.records[0]))
+    assert payload["level"] == "warning"
+    assert payload["msg"] == "retry"
+    assert payload["category"] == "test_level"
+    assert payload["field_level"] == "high"
+    assert payload["field_msg"] == "upstream"
+    assert payload["field_category"] == "x"
+    assert json.loads(JsonFormatter().format(capture.records[1]))["field_level"] == 3
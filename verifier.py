@@ -0,0 +1,297 @@
+"""
+제출물 요구사항 검증.
+
+제출 하나당 과제의 요구사항 전체를 한 번의 LLM 호출로 판정하고
+verification_result / submission.is_met_requirements에 일괄 저장한다.
+- 결과는 (요구사항 목록 해시, 제출 내용 해시) 키로 llm_parse_cache에 저장 → 재제출·같은 파일은 다시 부르지 않음
+- 검증은 VERIFIER_WORKERS개 워커가 나눠서 처리, 같은 키를 동시에 만나면 한 번만 호출
+- 제출 파일은 file_store에 받아진 뒤에 검증 (텍스트 파일이면 앞부분을 프롬프트에 포함)
+
+processor 데몬이 백그라운드로 실행. 수동 실행: python verifier.py
+"""
+import os
+import json
+import asyncio
+import hashlib
+import argparse
+from datetime import datetime
+from dotenv import load_dotenv
+from sqlalchemy import select, or_, text
+from sqlalchemy.dialects.postgresql import insert
+import llm
+import parse_cache
+from cache import single_flight
+from db import get_session, dispose
+from models import AssignmentRequirement, Submission, VerificationResult
+from file_store import file_store, FILE_FETCH_MAX_ATTEMPTS
+from log import get_logger
+
+load_dotenv()
+
+VERIFIER_WORKERS = int(os.getenv("VERIFIER_WORKERS", "4"))
+VERIFIER_BATCH_SIZE = int(os.getenv("VERIFIER_BATCH_SIZE", "50"))
+VERIFIER_INTERVAL = float(os.getenv("VERIFIER_INTERVAL", "60"))
+# 프롬프트에 넣을 제출 본문/텍스트 파일 최대 길이 (바이트)
+VERIFIER_MAX_CONTENT_BYTES = int(os.getenv("VERIFIER_MAX_CONTENT_BYTES", "20000"))
+# 응답이 계속 잘못 오는 제출은 이 횟수 후 프로세스가 재시작될 때까지 건너뜀
+VERIFIER_MAX_ATTEMPTS = int(os.getenv("VERIFIER_MAX_ATTEMPTS", "3"))
+
+log = get_logger("verifier")
+
+VERIFY_PROMPT_TEMPLATE = """
+다음은 학생이 제출한 과제와 그 과제의 요구사항 목록이야.
+요구사항마다 제출물이 충족하는지 판정해서 아래 형식의 JSON 배열로만 응답해.
+다른 텍스트는 절대 포함하지 마. "index"는 요구사항 번호를 그대로 돌려줘.
+첨부 파일 내용을 볼 수 없으면 본문과 파일 이름으로만 판단하고, 판단 근거가 없으면 false.
+
+[
+  {{"index": 0, "is_met": true, "feedback": "판정 이유 (한두 문장)"}}
+]
+
+요구사항 목록 (JSON):
+{requirements}
+
+제출 본문:
+{content}
+
+첨부 파일: {file_name}
+{file_text}
+"""
+
+# 프롬프트에 내용을 넣을 수 있는 텍스트 파일
+_TEXT_EXTENSIONS = {".txt", ".md", ".py", ".java", ".js", ".ts", ".sql", ".csv", ".json", ".html", ".css", ".c", ".cpp", ".ipynb"}
+
+verified = 0
+memo_hits = 0
+llm_calls = 0
+failed = 0
+_attempts: dict[int, int] = {}
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def requirements_hash(requirements: list[str]) -> str:
+    return hashlib.sha256("\0".join(parse_cache.normalize_text(r) for r in requirements).encode()).hexdigest()
+
+
+def content_hash(content_text: str | None, file_sha256: str | None) -> str:
+    """본문 + 파일 해시. 같은 글·같은 파일로 다시 내면 같은 값"""
+    return hashlib.sha256(f"{parse_cache.normalize_text(content_text or '')}\0{file_sha256 or ''}".encode()).hexdigest()
+
+
+def _file_text(file_name: str | None, file_sha256: str | None) -> str:
+    if not file_name or not file_sha256 or os.path.splitext(file_name)[1].lower() not in _TEXT_EXTENSIONS:
+        return ""
+    path = file_store.path(file_sha256)
+    if not path.exists():
+        return ""
+    with open(path, "rb") as f:
+        data = f.read(VERIFIER_MAX_CONTENT_BYTES)
+    return "파일 내용:\n" + data.decode("utf-8", errors="replace")
+
+
+def _is_valid(results, count: int) -> bool:
+    if not isinstance(results, list) or len(results) != count:
+        return False
+    indexes = set()
+    for r in results:
+        if not isinstance(r, dict) or not isinstance(r.get("index"), int) or not isinstance(r.get("is_met"), bool):
+            return False
+        indexes.add(r["index"])
+    return indexes == set(range(count))
+
+
+async def _evaluate(requirements: list[str], submission) -> list[dict]:
+    """요구사항 순서대로 [{"is_met", "feedback"}, ...]. 캐시 → 진행 중인 같은 호출 → LLM 순서"""
+    global memo_hits
+
+    key = parse_cache.make_key(
+        f"{requirements_hash(requirements)}:{content_hash(submission.content_text, submission.file_sha256)}",
+        VERIFY_PROMPT_TEMPLATE, llm.MODEL_NAME,
+    )
+    cached = await parse_cache.get(key)
+    if cached is not None:
+        memo_hits += 1
+        return cached["results"]
+
+    async def call() -> list[dict]:
+        global llm_calls
+        content = (submission.content_text or "").encode("utf-8")[:VERIFIER_MAX_CONTENT_BYTES].decode("utf-8", errors="ignore")
+        file_text = await asyncio.to_thread(_file_text, submission.file_name, submission.file_sha256)
+        prompt = VERIFY_PROMPT_TEMPLATE.format(
+            requirements=json.dumps([{"index": i, "requirement": r} for i, r in enumerate(requirements)], ensure_ascii=False),
+            content=content or "(없음)",
+            file_name=submission.file_name or "(없음)",
+            file_text=file_text,
+        )
+        llm_calls += 1
+        raw = await llm.get_client().generate(prompt)
+        results = json.loads(llm._strip_code_fence(raw))
+        if not _is_valid(results, len(requirements)):
+            raise ValueError("검증 응답 형식 오류")
+        results = [
+            {"is_met": r["is_met"], "feedback": str(r.get("feedback") or "")}
+            for r in sorted(results, key=lambda r: r["index"])
+        ]
+        await parse_cache.put(key, llm.MODEL_NAME, {"results": results})
+        return results
+
+    def on_wait():
+        global memo_hits
+        memo_hits += 1
+
+    # 같은 (요구사항, 제출 내용)을 동시에 검증하면 LLM 호출은 한 번
+    return await single_flight(_inflight, key, call, on_wait)
+
+
+async def _load_batch(batch_size: int) -> tuple[list, dict[object, list]]:
+    """검증할 제출 + 과제별 요구사항 (요구사항 없는 과제, 파일을 아직 받는 중인 제출은 제외)"""
+    skip = [submission_id for submission_id, count in _attempts.items() if count >= VERIFIER_MAX_ATTEMPTS]
+    async with get_session() as session:
+        submissions = (await session.execute(
+            select(
+                Submission.submission_id, Submission.assignment_id, Submission.content_text,
+                Submission.file_name, Submission.file_sha256,
+            )
+            .where(
+                Submission.is_met_requirements.is_(None),
+                Submission.submission_id.not_in(skip),
+                Submission.assignment_id.in_(select(AssignmentRequirement.assignment_id)),
+                or_(
+                    Submission.file_url.is_(None),
+                    Submission.file_sha256.is_not(None),
+                    Submission.file_fetch_attempts >= FILE_FETCH_MAX_ATTEMPTS,
+                ),
+            )
+            .order_by(Submission.submission_id)
+            .limit(batch_size)
+        )).all()
+        if not submissions:
+            return [], {}
+
+        requirements: dict[object, list] = {}
+        for row in await session.execute(
+            select(AssignmentRequirement.assignment_id, AssignmentRequirement.requirement_id, AssignmentRequirement.content)
+            .where(AssignmentRequirement.assignment_id.in_({s.assignment_id for s in submissions}))
+            .order_by(AssignmentRequirement.requirement_id)
+        ):
+            requirements.setdefault(row.assignment_id, []).append(row)
+    return submissions, requirements
+
+
+async def _save(results: list[tuple[object, list, list[dict]]]):
+    """verification_result 일괄 upsert + submission.is_met_requirements 일괄 갱신"""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "submission_id": submission.submission_id,
+            "requirement_id": requirement.requirement_id,
+            "is_met": result["is_met"],
+            "feedback": result["feedback"],
+            "verified_at": now,
+        }
+        for submission, requirements, evaluated in results
+        for requirement, result in zip(requirements, evaluated)
+    ]
+    stmt = insert(VerificationResult).values(rows)
+    async with get_session() as session:
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=[VerificationResult.submission_id, VerificationResult.requirement_id],
+            set_={"is_met": stmt.excluded.is_met, "feedback": stmt.excluded.feedback, "verified_at": stmt.excluded.verified_at},
+        ))
+        await session.execute(
+            text("""
+                UPDATE submission s SET is_met_requirements = t.is_met, updated_at = :now
+                FROM unnest(CAST(:ids AS bigint[]), CAST(:is_met AS boolean[])) AS t(submission_id, is_met)
+                WHERE s.submission_id = t.submission_id
+            """),
+            {
+                "ids": [submission.submission_id for submission, _, _ in results],
+                "is_met": [all(r["is_met"] for r in evaluated) for _, _, evaluated in results],
+                "now": now,
+            },
+        )
+        await session.commit()
+
+
+async def verify_batch(batch_size: int = VERIFIER_BATCH_SIZE, workers: int = VERIFIER_WORKERS) -> int:
+    """제출 batch_size개를 workers개 워커로 검증 후 일괄 저장. 저장한 제출 수 반환"""
+    global verified, failed
+
+    submissions, requirements = await _load_batch(batch_size)
+    if not submissions:
+        return 0
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for submission in submissions:
+        queue.put_nowait(submission)
+    results = []
+
+    async def worker():
+        global failed
+        while not queue.empty():
+            submission = queue.get_nowait()
+            reqs = requirements.get(submission.assignment_id, [])
+            if not reqs:
+                continue
+            try:
+                evaluated = await _evaluate([r.content for r in reqs], submission)
+            except llm.LLMUnavailableError as e:
+                # 회로 차단/재시도 소진 → 남은 제출은 다음 주기에 다시
+                log.warning("llm unavailable, verification paused", error=str(e), remaining=queue.qsize())
+                while not queue.empty():
+                    queue.get_nowait()
+                return
+            except Exception as e:
+                failed += 1
+                _attempts[submission.submission_id] = _attempts.get(submission.submission_id, 0) + 1
+                log.warning("verification failed", submission_id=submission.submission_id, error=str(e))
+                continue
+            results.append((submission, reqs, evaluated))
+
+    await asyncio.gather(*[worker() for _ in range(min(workers, len(submissions)))])
+
+    if results:
+        await _save(results)
+        verified += len(results)
+        log.info("submissions verified", count=len(results), memo_hits=memo_hits, llm_calls=llm_calls)
+    return len(results)
+
+
+async def verify_pending() -> int:
+    total = 0
+    while True:
+        done = await verify_batch()
+        total += done
+        if done < VERIFIER_BATCH_SIZE:
+            return total
+
+
+async def run_verifier(stop: asyncio.Event, wake: asyncio.Event):
+    """processor 데몬에서 백그라운드 태스크로 실행. 새 제출이 저장되면 wake, 아니어도 VERIFIER_INTERVAL마다"""
+    while not stop.is_set():
+        wake.clear()
+        try:
+            await verify_pending()
+        except Exception as e:
+            log.error("verifier failed", error=str(e))
+
+        stop_wait = asyncio.create_task(stop.wait())
+        wake_wait = asyncio.create_task(wake.wait())
+        _, pending = await asyncio.wait({stop_wait, wake_wait}, timeout=VERIFIER_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+
+def stats() -> dict:
+    return {"verified": verified, "memo_hits": memo_hits, "llm_calls": llm_calls, "failed": failed}
+
+
+async def main():
+    count = await verify_pending()
+    log.info("verification finished", count=count, **stats())
+    await dispose()
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="미검증 제출물 요구사항 검증").parse_args()
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+import os
+import time
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+from dotenv import load_dotenv
+from log import get_logger
+
+load_dotenv()
+
+EVENT_WORKERS = int(os.getenv("EVENT_WORKERS", "4"))
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "1000"))
+EVENT_ENQUEUE_TIMEOUT = float(os.getenv("EVENT_ENQUEUE_TIMEOUT", "0.5"))
+EVENT_DRAIN_TIMEOUT = float(os.getenv("EVENT_DRAIN_TIMEOUT", "30"))
+
+log = get_logger("worker")
+
+# 최근 N개 작업의 지연시간만 보관 (p50/p99 계산용)
+_LATENCY_WINDOW = 1000
+
+
+class QueueFullError(Exception):
+    """큐가 가득 차서 작업을 받을 수 없음 (backpressure)"""
+
+
+@dataclass
+class _Job:
+    func: Callable[..., Awaitable[Any]]
+    args: tuple
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(len(ordered) * q))
+    return ordered[idx]
+
+
+class JobQueue:
+    """
+    인프로세스 비동기 작업 큐.
+    웹훅은 enqueue 후 바로 응답하고, 무거운 처리(DB 조회, LLM 호출)는 워커가 담당.
+    """
+
+    def __init__(self, name: str, workers: int, maxsize: int):
+        self.name = name
+        self.workers = workers
+        self.maxsize = maxsize
+        self._queue: asyncio.Queue[_Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._accepting = False
+
+        self.enqueued = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_times: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._run_times: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"{self.name}-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._accepting = True
+        log.info("queue started", queue=self.name, workers=self.workers, maxsize=self.maxsize)
+
+    async def enqueue(self, func: Callable[..., Awaitable[Any]], *args, timeout: float | None = None):
+        """
+        작업 추가. 큐가 가득 차면 timeout 동안만 기다리고 QueueFullError.
+        """
+        if not self._accepting or self._queue is None:
+            self.rejected += 1
+            raise QueueFullError(f"{self.name} 큐가 작업을 받지 않는 상태")
+
+        job = _Job(func=func, args=args)
+        wait = EVENT_ENQUEUE_TIMEOUT if timeout is None else timeout
+        try:
+            if wait <= 0:
+                self._queue.put_nowait(job)
+            else:
+                await asyncio.wait_for(self._queue.put(job), timeout=wait)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self.rejected += 1
+            raise QueueFullError(f"{self.name} 큐 가득 참 ({self.maxsize}건)")
+        self.enqueued += 1
+
+    async def drain(self, timeout: float = EVENT_DRAIN_TIMEOUT):
+        """
+        새 작업 수신을 멈추고 남은 작업을 timeout 내에서 처리한 뒤 워커 종료.
+        """
+        self._accepting = False
+        if self._queue is None:
+            return
+
+        remaining = self._queue.qsize()
+        log.info("queue draining", queue=self.name, remaining=remaining)
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            log.warning("queue drain timed out, dropping jobs", queue=self.name, dropped=self._queue.qsize())
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        log.info("queue stopped", queue=self.name)
+
+    async def _worker(self, idx: int):
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            started = time.perf_counter()
+            self._wait_times.append(started - job.enqueued_at)
+            try:
+                await job.func(*job.args)
+                self.completed += 1
+            except asyncio.CancelledError:
+                # 워커 자신이 취소된 경우(stop)만 종료. 작업 안에서 새어 나온 취소는 실패로 세고 계속 일함
+                if asyncio.current_task().cancelling():
+                    raise
+                self.failed += 1
+                log.error("job cancelled", queue=self.name, worker=idx)
+            except Exception as e:
+                self.failed += 1
+                log.error("job failed", queue=self.name, worker=idx, error=str(e))
+            finally:
+                self._run_times.append(time.perf_counter() - started)
+                self._queue.task_done()
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        wait_times = list(self._wait_times)
+        run_times = list(self._run_times)
+        return {
+            "workers": self.workers,
+            "depth": self.depth(),
+            "maxsize": self.maxsize,
+            "accepting": self._accepting,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_p50_ms": _ms(_percentile(wait_times, 0.50)),
+            "wait_p99_ms": _ms(_percentile(wait_times, 0.99)),
+            "run_p50_ms": _ms(_percentile(run_times, 0.50)),
+            "run_p99_ms": _ms(_percentile(run_times, 0.99)),
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+event_queue = JobQueue("events", workers=EVENT_WORKERS, maxsize=EVENT_QUEUE_SIZE)